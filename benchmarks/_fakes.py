@@ -0,0 +1,193 @@
+"""Synthetic bots, commands and interactions, so the benchmarks can run without connecting to Discord."""
+
+import itertools
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import discord
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+
+_ids = itertools.count(1000)
+
+
+class Flags(commands.FlagConverter):
+    count: int = 1
+    label: str
+
+
+def make_bot(**kwargs: Any) -> lazy_slash.SlashBot:
+    """A SlashBot with a few representative commands, which is never logged in."""
+
+    kwargs.setdefault("auto_upload", False)
+    bot = lazy_slash.SlashBot(command_prefix="!", intents=discord.Intents.none(), **kwargs)
+    bot._connection.user = SimpleNamespace(id=1)  # type: ignore
+
+    @bot.command()
+    async def echo(ctx, amount: int, text: str, ratio: float = 1.0, *, rest: str = ""):
+        pass
+
+    @bot.command()
+    async def flagged(ctx, *, flags: Flags):
+        pass
+
+    @bot.command()
+    async def greet(ctx, user: discord.User):
+        pass
+
+    @bot.group()
+    async def config(ctx):
+        pass
+
+    @config.group(name="set")
+    async def config_set(ctx):
+        pass
+
+    @config_set.command()
+    async def prefix(ctx, new_prefix: str, enabled: bool = True):
+        pass
+
+    return bot
+
+
+class FakeResponse:
+    def __init__(self, requests: Counter) -> None:
+        self.done = False
+        self.requests = requests
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def send_message(self, *args: Any, **kwargs: Any) -> None:
+        self.requests["POST callback"] += 1
+        self.done = True
+
+    async def defer(self, *args: Any, **kwargs: Any) -> None:
+        self.requests["POST callback"] += 1
+        self.done = True
+
+    async def autocomplete(self, *args: Any, **kwargs: Any) -> None:
+        self.requests["POST callback"] += 1
+        self.done = True
+
+
+class FakeFollowup:
+    def __init__(self, requests: Counter) -> None:
+        self.requests = requests
+
+    async def send(self, *args: Any, **kwargs: Any) -> Any:
+        self.requests["POST followup"] += 1
+        return SimpleNamespace(id=next(_ids))
+
+
+def make_interaction(
+    state: Any,
+    name: str,
+    options: List[Dict[str, Any]],
+    *,
+    resolved: Optional[Dict[str, Any]] = None,
+    type: discord.InteractionType = discord.InteractionType.application_command,
+) -> Any:
+    """A stand-in for discord.Interaction with only what lazy_slash uses, in a cached DM channel.
+
+    Every request it would make to Discord is counted by route in its ``requests`` counter.
+    """
+
+    user = SimpleNamespace(id=2, bot=False, name="user", mention="<@2>")
+    channel = SimpleNamespace(id=3, type=discord.ChannelType.text, guild=None, _state=state)
+    data: Dict[str, Any] = {"id": "5", "name": name, "type": 1, "options": options}
+    if resolved is not None:
+        data["resolved"] = resolved
+
+    requests: Counter = Counter()
+
+    async def original_response() -> Any:
+        requests["GET original"] += 1
+        return SimpleNamespace(id=next(_ids))
+
+    return SimpleNamespace(
+        id=discord.utils.time_snowflake(discord.utils.utcnow()),
+        type=type,
+        data=data,
+        channel=channel,
+        channel_id=channel.id,
+        guild=None,
+        guild_id=None,
+        user=user,
+        permissions=discord.Permissions.all(),
+        response=FakeResponse(requests),
+        followup=FakeFollowup(requests),
+        original_response=original_response,
+        requests=requests,
+        _state=state,
+    )
+
+
+def interactions(state: Any) -> Dict[str, Any]:
+    """One interaction per command of :func:`make_bot`."""
+
+    user_payload = {"id": "77", "username": "someone", "discriminator": "0001", "avatar": None}
+    return {
+        "echo": make_interaction(
+            state,
+            "echo",
+            [
+                {"name": "amount", "type": 4, "value": 10},
+                {"name": "text", "type": 3, "value": "\"quoted\" 'text' with «every» quote"},
+                {"name": "rest", "type": 3, "value": "the rest of the message"},
+            ],
+        ),
+        "flagged": make_interaction(
+            state,
+            "flagged",
+            [{"name": "count", "type": 4, "value": 5}, {"name": "label", "type": 3, "value": "hello"}],
+        ),
+        "greet": make_interaction(
+            state,
+            "greet",
+            [{"name": "user", "type": 6, "value": "77"}],
+            resolved={"users": {"77": user_payload}},
+        ),
+        "config set prefix": make_interaction(
+            state,
+            "config",
+            [
+                {
+                    "name": "set",
+                    "type": 2,
+                    "options": [
+                        {
+                            "name": "prefix",
+                            "type": 1,
+                            "options": [{"name": "new_prefix", "type": 3, "value": "?"}],
+                        }
+                    ],
+                }
+            ],
+        ),
+    }
+
+
+def make_command_tree(count: int = 500, params: int = 8) -> List[commands.Command]:
+    """``count`` commands with ``params`` parameters each, cycling through the supported annotations."""
+
+    annotations = [
+        "int",
+        "str",
+        "float",
+        "bool",
+        "discord.Member",
+        "discord.Role",
+        "discord.TextChannel",
+        "Optional[int]",
+    ]
+    arguments = ", ".join(
+        f"option{index}: {annotations[index % len(annotations)]}" + (" = None" if index >= params // 2 else "")
+        for index in range(params)
+    )
+
+    namespace: Dict[str, Any] = {"discord": discord, "Optional": Optional}
+    exec(f'async def callback(ctx, {arguments}):\n    """A synthetic command."""', namespace)
+    return [commands.Command(namespace["callback"], name=f"command{index}") for index in range(count)]
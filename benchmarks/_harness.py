@@ -0,0 +1,75 @@
+"""Timing helpers shared by the benchmarks."""
+
+import gc
+import inspect
+import statistics
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, List, NamedTuple, Union
+
+Benchmarked = Callable[[], Union[Any, Awaitable[Any]]]
+
+
+class Result(NamedTuple):
+    name: str
+    calls: int
+    throughput: float  # calls per second
+    p50: float  # microseconds
+    p99: float  # microseconds
+    peak_bytes: float  # peak traced memory per call
+    gc_per_1000: float  # generation 0 collections per 1000 calls
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<40} {self.throughput:>10.0f}/s  p50 {self.p50:>8.1f}us  p99 {self.p99:>8.1f}us  "
+            f"{self.peak_bytes / 1024:>7.1f}KiB peak  {self.gc_per_1000:>5.1f} gc/1000"
+        )
+
+
+async def _call(func: Benchmarked) -> None:
+    result = func()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def measure(name: str, func: Benchmarked, iterations: int = 5_000, warmup: int = 100) -> Result:
+    """Runs ``func`` ``iterations`` times, awaiting it if it returns an awaitable."""
+
+    for _ in range(warmup):
+        await _call(func)
+
+    latencies: List[int] = []
+    collections = gc.get_stats()[0]["collections"]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call_start = time.perf_counter_ns()
+        await _call(func)
+        latencies.append(time.perf_counter_ns() - call_start)
+
+    elapsed = time.perf_counter() - start
+    collections = gc.get_stats()[0]["collections"] - collections
+
+    # Memory is traced in a separate, shorter pass, as tracing slows everything down
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, 500)):
+            current, _ = tracemalloc.get_traced_memory()
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+
+            await _call(func)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return Result(
+        name=name,
+        calls=iterations,
+        throughput=iterations / elapsed,
+        p50=quantiles[49] / 1000,
+        p99=quantiles[98] / 1000,
+        peak_bytes=statistics.mean(peaks),
+        gc_per_1000=collections / iterations * 1000,
+    )
@@ -0,0 +1,327 @@
+"""A stand-in for Discord's HTTP API and gateway interactions, so a SlashBot can be load tested offline.
+
+:class:`MockDiscord` answers every request the bot and its interactions make after a configurable latency,
+rate limiting a share of them, and :class:`PayloadFactory` builds INTERACTION_CREATE payloads like the
+gateway sends for the commands of :func:`make_load_bot`.
+"""
+
+import asyncio
+import itertools
+import random
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+from discord.http import Route
+from discord.webhook.async_ import AsyncWebhookAdapter, async_context
+
+from discord.ext import lazy_slash
+
+APPLICATION_ID = 100
+# Snowflake sized, as converters only treat 15 to 20 digit numbers as IDs
+GUILD_ID = 800_000_000_000_000_000  # guilds are GUILD_ID + 100 * n, with their text channel at the guild ID + 1
+USER_IDS = (100_000_000_000_000_000, 199_999_999_999_999_999)
+BOT_USER = {"id": "1", "username": "bot", "discriminator": "0000", "avatar": None, "bot": True}
+
+
+class Flags(commands.FlagConverter):
+    count: int = 1
+    label: str
+
+
+def make_load_bot(**kwargs: Any) -> lazy_slash.SlashBot:
+    """A SlashBot whose commands respond in each of the ways commands usually do, which is never logged in."""
+
+    kwargs.setdefault("auto_upload", False)
+    bot = lazy_slash.SlashBot(command_prefix="!", intents=discord.Intents.none(), **kwargs)
+    bot._connection.user = SimpleNamespace(id=int(BOT_USER["id"]))  # type: ignore
+    bot._connection.application_id = APPLICATION_ID
+
+    @bot.command()
+    async def echo(ctx, amount: int, text: str, ratio: float = 1.0, *, rest: str = ""):
+        """Initial response only."""
+        await ctx.send(f"{text * min(amount, 3)} {ratio} {rest}", return_message=False)
+
+    @bot.command()
+    async def flagged(ctx, *, flags: Flags):
+        """Initial response, then a followup."""
+        await ctx.send(flags.label, return_message=False)
+        await ctx.send(str(flags.count), return_message=False)
+
+    @bot.command()
+    async def greet(ctx, user: discord.User):
+        """Initial response, fetched."""
+        await ctx.send(f"Hello {user.mention}")
+
+    @bot.command()
+    @commands.guild_only()
+    async def role(ctx, role: discord.Role):
+        """Initial response, with the guild only check."""
+        await ctx.send(role.mention, return_message=False)
+
+    @bot.group()
+    async def config(ctx):
+        pass
+
+    @config.group(name="set")
+    async def config_set(ctx):
+        pass
+
+    @config_set.command()
+    async def prefix(ctx, new_prefix: str, enabled: bool = True):
+        """Deferred, then a followup."""
+        await ctx.defer()
+        await ctx.send(f"Prefix set to {new_prefix}")
+
+    return bot
+
+
+class _MockWebhookAdapter(AsyncWebhookAdapter):
+    # Interaction responses and followups are sent through the webhook adapter, not bot.http
+    def __init__(self, discord: "MockDiscord") -> None:
+        super().__init__()
+        self.discord = discord
+
+    async def request(
+        self, route: Route, session: Any, *, payload: Optional[Dict[str, Any]] = None, **kwargs: Any
+    ) -> Any:
+        return await self.discord.request(route, payload)
+
+
+class MockDiscord:
+    """Answers requests after ``latency`` seconds, plus up to ``jitter`` more.
+
+    ``rate_limit`` is the share of requests answered with a 429, which are retried after
+    ``retry_after`` seconds as discord.py would. Requests and 429s are counted per route.
+    Registered application commands are kept per scope, by command ID.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        rate_limit: float = 0.0,
+        retry_after: float = 0.25,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.requests: Counter[str] = Counter()
+        self.rate_limited: Counter[str] = Counter()
+        self.registered: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        self._random = random.Random(seed)
+        self._ids = itertools.count(10_000)
+
+    def install(self, bot: commands.Bot) -> None:
+        """Routes every request of ``bot`` and interactions created afterwards in this context here."""
+
+        async def request(route: Route, **kwargs: Any) -> Any:
+            return await self.request(route, kwargs.get("json"))
+
+        bot.http.request = request  # type: ignore
+        async_context.set(_MockWebhookAdapter(self))
+
+    async def request(self, route: Route, payload: Optional[Dict[str, Any]]) -> Any:
+        key = f"{route.method} {route.path}"
+        while True:
+            self.requests[key] += 1
+            await asyncio.sleep(self.latency + self._random.random() * self.jitter)
+            if self._random.random() >= self.rate_limit:
+                return self._respond(route, payload)
+
+            self.rate_limited[key] += 1
+            await asyncio.sleep(self.retry_after)
+
+    def _message(self, route: Route, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        data = (payload or {}).get("data", payload) or {}
+        return {
+            "id": str(next(self._ids)),
+            "type": 0,
+            "channel_id": str(route.channel_id or 0),
+            "author": BOT_USER,
+            "content": data.get("content") or "",
+            "timestamp": discord.utils.utcnow().isoformat(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": data.get("embeds") or [],
+            "pinned": False,
+        }
+
+    def _respond(self, route: Route, payload: Optional[Dict[str, Any]]) -> Any:
+        path = route.path
+        if path.endswith("/callback") or path.endswith("/typing"):
+            return None
+        if path.startswith("/webhooks/"):
+            return self._message(route, payload)  # followups and the original response
+        if path == "/users/{user_id}":
+            return _user(int(route.url.rpartition("/")[2]))  # converters fetch users that are not cached
+        if path.endswith("/commands") or path.endswith("/commands/{command_id}"):
+            return self._commands(route, payload)
+
+        return None
+
+    def _commands(self, route: Route, payload: Any) -> Any:
+        if route.path.endswith("/commands"):
+            scope, command_id = route.url, None
+        else:
+            scope, _, command_id = route.url.rpartition("/")
+
+        registered = self.registered.setdefault(scope, {})
+        if route.method == "GET":
+            return list(registered.values())
+        if route.method == "PUT":
+            registered.clear()
+            registered.update((command["id"], command) for command in self._with_ids(payload or []))
+            return list(registered.values())
+        if route.method == "POST":
+            # Creating a command with the name of a registered one of the same type overwrites it
+            for existing in list(registered.values()):
+                if (existing["name"], existing.get("type", 1)) == (payload["name"], payload.get("type", 1)):
+                    del registered[existing["id"]]
+
+            (command,) = self._with_ids([payload])
+            registered[command["id"]] = command
+            return command
+        if route.method == "PATCH":
+            command = registered[command_id] = {**registered[command_id], **payload}  # type: ignore
+            return command
+        if route.method == "DELETE":
+            del registered[command_id]  # type: ignore
+
+        return None
+
+    def _with_ids(self, payload: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Like Discord, context menus are given back with an empty description
+        return [{"description": "", **command, "id": str(next(self._ids))} for command in payload]
+
+
+def _role(role_id: int, name: str) -> Dict[str, Any]:
+    role = {"id": str(role_id), "name": name, "permissions": "0", "position": 0, "color": 0}
+    role.update(hoist=False, managed=False, mentionable=True)
+    return role
+
+
+def _user(user_id: int) -> Dict[str, Any]:
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0001", "avatar": None}
+
+
+def cache_guilds(bot: commands.Bot, guild_ids: List[int]) -> None:
+    """Caches the guilds interactions are sent from, as their GUILD_CREATE events would."""
+
+    state = bot._connection
+    for guild_id in guild_ids:
+        roles = [_role(guild_id, "@everyone")] + [_role(role_id, "role") for role_id in _role_ids(guild_id)]
+        channel = {"id": str(guild_id + 1), "type": 0, "name": "general", "position": 0, "guild_id": str(guild_id)}
+        data = {"id": str(guild_id), "name": f"guild{guild_id}", "channels": [channel], "roles": roles}
+        state._add_guild(discord.Guild(data=data, state=state))  # type: ignore
+
+
+def _role_ids(guild_id: int) -> range:
+    return range(guild_id + 10, guild_id + 15)
+
+
+def _member(joined: str) -> Dict[str, Any]:
+    return {"roles": [], "joined_at": joined, "deaf": False, "mute": False, "nick": None}
+
+
+class PayloadFactory:
+    """Builds INTERACTION_CREATE payloads for the commands of :func:`make_load_bot`.
+
+    ``dm_ratio`` of them are sent from DMs, the rest from one of ``guilds`` guilds,
+    with the author and any mentioned users, members and roles in ``resolved`` as Discord sends them.
+    """
+
+    KINDS = ("echo", "flagged", "greet", "role", "config set prefix")
+
+    def __init__(self, *, dm_ratio: float = 0.2, guilds: int = 10, seed: Optional[int] = None) -> None:
+        self.dm_ratio = dm_ratio
+        self.guilds = guilds
+        self._random = random.Random(seed)
+        self._tokens = itertools.count()
+        self._increment = itertools.count()
+
+    @property
+    def guild_ids(self) -> List[int]:
+        return [GUILD_ID + 100 * guild for guild in range(self.guilds)]
+
+    def _options(self, kind: str, guild_id: Optional[int]) -> Tuple[str, List[Dict[str, Any]], Dict[str, Any]]:
+        rng = self._random
+        joined = discord.utils.utcnow().isoformat()
+
+        if kind == "echo":
+            options = [
+                {"name": "amount", "type": 4, "value": rng.randint(1, 10)},
+                {"name": "text", "type": 3, "value": "\"quoted\" 'text' with «every» quote"},
+                {"name": "ratio", "type": 10, "value": rng.random()},
+                {"name": "rest", "type": 3, "value": "the rest of the message"},
+            ]
+            return "echo", options, {}
+
+        if kind == "flagged":
+            options = [
+                {"name": "count", "type": 4, "value": rng.randint(1, 5)},
+                {"name": "label", "type": 3, "value": "hi"},
+            ]
+            return "flagged", options, {}
+
+        if kind == "greet":
+            user_id = rng.randint(*USER_IDS)
+            resolved: Dict[str, Any] = {"users": {str(user_id): _user(user_id)}}
+            if guild_id is not None:
+                resolved["members"] = {str(user_id): _member(joined)}
+            return "greet", [{"name": "user", "type": 6, "value": str(user_id)}], resolved
+
+        if kind == "role":
+            role_id = rng.choice(_role_ids(guild_id))  # type: ignore # roles are only sent from guilds
+            resolved = {"roles": {str(role_id): _role(role_id, "role")}}
+            return "role", [{"name": "role", "type": 8, "value": str(role_id)}], resolved
+
+        set_prefix = {"name": "prefix", "type": 1, "options": [{"name": "new_prefix", "type": 3, "value": "?"}]}
+        return "config", [{"name": "set", "type": 2, "options": [set_prefix]}], {}
+
+    def make(self, kind: Optional[str] = None) -> Dict[str, Any]:
+        rng = self._random
+        if kind is None:
+            kind = rng.choice(self.KINDS)
+
+        guild_id = None if rng.random() < self.dm_ratio else rng.choice(self.guild_ids)
+        if kind == "role" and guild_id is None:
+            guild_id = self.guild_ids[0]  # Discord only sends role options from guilds
+
+        name, options, resolved = self._options(kind, guild_id)
+        data: Dict[str, Any] = {"id": "5", "name": name, "type": 1, "options": options}
+        if resolved:
+            data["resolved"] = resolved
+
+        author_id = rng.randint(*USER_IDS)
+        payload: Dict[str, Any] = {
+            # The low bits are an increment, so interactions created in the same millisecond differ
+            "id": str(discord.utils.time_snowflake(discord.utils.utcnow()) + next(self._increment) % 4096),
+            "application_id": str(APPLICATION_ID),
+            "type": 2,
+            "token": f"token{next(self._tokens)}",
+            "version": 1,
+            "data": data,
+            "locale": "en-US",
+        }
+        if guild_id is None:
+            payload["channel_id"] = str(author_id + 1)
+            payload["user"] = _user(author_id)
+        else:
+            payload["channel_id"] = str(guild_id + 1)
+            payload["guild_id"] = str(guild_id)
+            payload["member"] = {**_member(discord.utils.utcnow().isoformat()), "user": _user(author_id)}
+            payload["member"]["permissions"] = str(discord.Permissions.all().value)
+            payload["app_permissions"] = str(discord.Permissions.all().value)
+
+        return payload
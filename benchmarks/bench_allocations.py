@@ -0,0 +1,50 @@
+"""Measures the objects and bytes kept alive by the message and context of each slash invocation.
+
+Run with ``python benchmarks/bench_allocations.py``, this does not connect to Discord.
+"""
+
+import asyncio
+import gc
+import tracemalloc
+
+from discord.ext import lazy_slash
+
+from _fakes import interactions, make_bot
+
+INVOCATIONS = 2_000
+
+
+async def measure(bot, interaction):
+    # Keep every context alive, so everything built for the invocation can be counted
+    contexts = []
+
+    async def invoke(ctx):
+        contexts.append(ctx)
+
+    bot.invoke = invoke
+
+    gc.collect()
+    objects = len(gc.get_objects())
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    for _ in range(INVOCATIONS):
+        await lazy_slash.process_slash_commands(bot, interaction)  # type: ignore
+
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+
+    return (len(gc.get_objects()) - objects) / INVOCATIONS, (end - start) / INVOCATIONS
+
+
+async def main():
+    bot = make_bot()
+    for name, interaction in interactions(bot._connection).items():
+        for direct_binding in (False, True):
+            bot.direct_binding = direct_binding
+            objects, size = await measure(bot, interaction)
+            print(f"{name:<18} {'direct' if direct_binding else 'string':<7} {objects:>6.1f} objects {size:>8.0f}B")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
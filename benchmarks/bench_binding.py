@@ -0,0 +1,43 @@
+"""Compares the per-invoke cost of direct argument binding against the message content path.
+
+Run with ``python benchmarks/bench_binding.py``, this does not connect to Discord.
+"""
+
+import asyncio
+import time
+
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+
+from _fakes import interactions, make_bot
+
+ITERATIONS = 20_000
+
+
+async def bench(bot, interaction) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        await lazy_slash.process_slash_commands(bot, interaction)  # type: ignore
+
+    return (time.perf_counter() - start) / ITERATIONS * 1_000_000
+
+
+async def main():
+    bot = make_bot()
+    for name, interaction in interactions(bot._connection).items():
+        for direct_binding in (False, True):
+            if name == "greet" and not direct_binding:
+                continue  # the message content path would have to fetch the uncached user
+
+            bot.direct_binding = direct_binding
+            try:
+                result = f"{await bench(bot, interaction):.2f}us/invoke"
+            except commands.CommandError as error:
+                result = f"failed: {error!r}"
+
+            print(f"{name:<18} {'direct' if direct_binding else 'string':<7} {result}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+"""Times loading a large synthetic bot of cogs, then converting all of its commands for upload.
+
+Run with ``python benchmarks/bench_cog_load.py [--cogs N] [--commands N]``, this does not connect to Discord.
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import discord
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash.to_slash import get_application_command
+
+from _fakes import make_bot
+
+ANNOTATIONS = ["int", "str", "float", "bool", "discord.Member", "discord.Role", "discord.TextChannel", "Optional[int]"]
+
+
+def make_cog_source(index: int, command_count: int) -> str:
+    arguments = ", ".join(
+        f"option{param}: {annotation} = Option(None, description='option {param}')"
+        if param >= len(ANNOTATIONS) // 2
+        else f"option{param}: {annotation}"
+        for param, annotation in enumerate(ANNOTATIONS)
+    )
+    methods = "".join(
+        f"    @commands.command()\n"
+        f"    async def cog{index}_command{command}(self, ctx, {arguments}):\n"
+        f"        '''A synthetic command.'''\n\n"
+        for command in range(command_count)
+    )
+    return f"class Cog{index}(commands.Cog):\n{methods}"
+
+
+async def load(cog_count: int, command_count: int) -> None:
+    bot = make_bot()
+    namespace: Dict[str, Any] = {
+        "commands": commands,
+        "discord": discord,
+        "Optional": Optional,
+        "Option": lazy_slash.Option,
+    }
+    sources = [make_cog_source(index, command_count) for index in range(cog_count)]
+
+    start = time.perf_counter()
+    for index, source in enumerate(sources):
+        exec(source, namespace)
+        await discord.utils.maybe_coroutine(bot.add_cog, namespace[f"Cog{index}"]())
+    loaded = time.perf_counter()
+
+    for command in bot.commands:
+        get_application_command(command)
+    converted = time.perf_counter()
+
+    total = cog_count * command_count
+    print(f"load {cog_count} cogs of {command_count} commands ({total} total): {(loaded - start) * 1000:.1f}ms")
+    print(f"convert {total} commands for upload: {(converted - loaded) * 1000:.1f}ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cogs", type=int, default=50)
+    parser.add_argument("--commands", type=int, default=40)
+    args = parser.parse_args()
+
+    await load(args.cogs, args.commands)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""Counts the requests to Discord each style of responding makes, per slash command invoked.
+
+Run with ``python benchmarks/bench_requests.py``, this does not connect to Discord.
+"""
+
+import asyncio
+
+from discord.ext import lazy_slash
+
+from _fakes import make_bot, make_interaction
+
+LINES = 5
+
+
+def add_commands(bot: lazy_slash.SlashBot) -> None:
+    @bot.command()
+    async def reply(ctx):
+        await ctx.send("pong")
+
+    @bot.command()
+    async def reply_quiet(ctx):
+        await ctx.send("pong", return_message=False)
+
+    @bot.command()
+    async def deferred(ctx):
+        await ctx.defer()
+        await ctx.send("done")
+
+    @bot.command()
+    async def lines(ctx):
+        for line in range(LINES):
+            await ctx.send(f"line {line}", return_message=False)
+
+    @bot.command()
+    async def lines_batched(ctx):
+        async with ctx.batch_sends():
+            for line in range(LINES):
+                await ctx.send(f"line {line}", return_message=False)
+
+
+async def main():
+    bot = make_bot()
+    add_commands(bot)
+
+    for name in ("reply", "reply_quiet", "deferred", "lines", "lines_batched"):
+        interaction = make_interaction(bot._connection, name, [])
+        await lazy_slash.process_slash_commands(bot, interaction)  # type: ignore
+
+        routes = ", ".join(f"{route}={count}" for route, count in sorted(interaction.requests.items()))
+        print(f"/{name:<14} {sum(interaction.requests.values())} requests ({routes})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
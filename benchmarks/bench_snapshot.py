@@ -0,0 +1,101 @@
+"""Compares a cold build of every command's payload and invocation plan against loading them from a snapshot.
+
+Each measurement runs in a fresh process, like a real startup, with a synthetic bot from ``bench_cog_load``.
+
+Run with ``python benchmarks/bench_snapshot.py [--cogs N] [--commands N] [--repeat N]``
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+import discord
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash.plans import get_plan
+from discord.ext.lazy_slash.to_slash import get_application_command
+
+from _fakes import make_bot
+from bench_cog_load import make_cog_source
+
+
+async def make_synthetic_bot(cog_count: int, command_count: int) -> lazy_slash.SlashBot:
+    bot = make_bot()
+    namespace: Dict[str, Any] = {
+        "commands": commands,
+        "discord": discord,
+        "Optional": Optional,
+        "Option": lazy_slash.Option,
+    }
+    for index in range(cog_count):
+        exec(make_cog_source(index, command_count), namespace)
+        await discord.utils.maybe_coroutine(bot.add_cog, namespace[f"Cog{index}"]())
+
+    return bot
+
+
+async def run(mode: str, cog_count: int, command_count: int, path: str) -> float:
+    bot = await make_synthetic_bot(cog_count, command_count)
+    ext_commands = list(bot.walk_commands())
+
+    start = time.perf_counter()
+    if mode == "export":
+        lazy_slash.export_snapshot(ext_commands, path)
+    elif mode == "warm":
+        loaded, stale = lazy_slash.load_snapshot(ext_commands, path)
+        assert stale == 0, f"{stale} commands were stale"
+        for command in ext_commands:
+            get_plan(command)  # restored from the snapshot
+    else:
+        for command in ext_commands:
+            get_application_command(command)
+            get_plan(command)
+
+    return time.perf_counter() - start
+
+
+def process_main(mode: str, cog_count: int, command_count: int, path: str, queue: Any) -> None:
+    queue.put(asyncio.run(run(mode, cog_count, command_count, path)))
+
+
+def measure(mode: str, cog_count: int, command_count: int, path: str) -> float:
+    """Runs ``mode`` in a fresh process and returns the seconds it took."""
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=process_main, args=(mode, cog_count, command_count, path, queue))
+    process.start()
+    seconds = queue.get()
+    process.join()
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cogs", type=int, default=50)
+    parser.add_argument("--commands", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "commands.snapshot.json")
+        measure("export", args.cogs, args.commands, path)
+
+        total = args.cogs * args.commands
+        medians = {}
+        for mode in ("cold", "warm"):
+            times = [measure(mode, args.cogs, args.commands, path) * 1000 for _ in range(args.repeat)]
+            medians[mode] = statistics.median(times)
+            print(f"{mode} {total} commands: " + " ".join(f"{ms:.1f}ms" for ms in times))
+
+        print(f"warm load takes {medians['warm'] / medians['cold']:.0%} of a cold build")
+
+
+if __name__ == "__main__":
+    main()
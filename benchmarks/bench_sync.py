@@ -0,0 +1,61 @@
+"""Shows the startup speedup of uploading guild commands concurrently, against a fake HTTP client with latency.
+
+Run with ``python benchmarks/bench_sync.py``, this does not connect to Discord.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+
+GUILDS = 40
+LATENCY = 0.05
+
+
+class FakeHTTP:
+    def __init__(self) -> None:
+        self.requests = 0
+
+    async def _request(self) -> list:
+        self.requests += 1
+        await asyncio.sleep(LATENCY)
+        return []
+
+    async def bulk_upsert_global_commands(self, application_id, payload):
+        return await self._request()
+
+    async def bulk_upsert_guild_commands(self, application_id, guild_id, payload):
+        return await self._request()
+
+
+def make_commands(count: int = 50) -> list:
+    def make_command(index: int) -> commands.Command:
+        async def callback(ctx, member_id: int, reason: str = "none", *, note: str = ""):
+            pass
+
+        return commands.Command(callback, name=f"command{index}")
+
+    return [make_command(index) for index in range(count)]
+
+
+async def main():
+    guild_commands = make_commands()
+    for concurrency in (1, 8, 32):
+        bot = SimpleNamespace(application_id=1, http=FakeHTTP())
+
+        start = time.perf_counter()
+        await lazy_slash.create_slash_commands(
+            bot,  # type: ignore
+            upload_as_guild={guild_id: guild_commands for guild_id in range(GUILDS)},
+            upload_concurrency=concurrency,
+        )
+        elapsed = time.perf_counter() - start
+
+        print(f"concurrency={concurrency:<3} {bot.http.requests} requests in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
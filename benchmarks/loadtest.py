@@ -0,0 +1,177 @@
+"""Offline end to end load test of SlashBot, against a mocked Discord.
+
+Interactions are built as the gateway sends them and fed through ``on_interaction`` at a fixed rate,
+while every HTTP request is answered by :class:`MockDiscord` after a simulated latency. Reports the
+achieved throughput, the latency from dispatch to the first response and to the command finishing,
+the time spent in each stage and the requests made per route.
+
+Run with ``python benchmarks/loadtest.py [--rate N] [--count N] [--latency S] [--rate-limit P] ...``
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+import discord
+
+from discord.ext.lazy_slash import HistogramTracer, Trace
+
+from _mock_discord import MockDiscord, PayloadFactory, cache_guilds, make_load_bot
+
+
+class LoadTracer(HistogramTracer):
+    """Records the exact latencies from when each interaction was dispatched, on top of the histograms."""
+
+    def __init__(self, expected: int) -> None:
+        super().__init__()
+        self.dispatched: Dict[int, float] = {}
+        self.response_latencies: List[float] = []
+        self.total_latencies: List[float] = []
+        self.finished_at = 0.0
+
+        self._expected = expected
+        self.done = asyncio.Event()
+
+    def record_response(self, trace: Trace) -> None:
+        super().record_response(trace)
+        self.response_latencies.append(time.perf_counter() - self.dispatched[trace.interaction.id])
+
+    def record(self, trace: Trace) -> None:
+        super().record(trace)
+        self.finished_at = time.perf_counter()
+        self.total_latencies.append(self.finished_at - self.dispatched.pop(trace.interaction.id))
+        if len(self.total_latencies) == self._expected:
+            self.done.set()
+
+
+def _distribution(latencies: List[float]) -> Dict[str, float]:
+    if len(latencies) < 2:
+        return {}
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "mean": statistics.mean(latencies) * 1000,
+        "p50": quantiles[49] * 1000,
+        "p90": quantiles[89] * 1000,
+        "p99": quantiles[98] * 1000,
+        "max": max(latencies) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    tracer = LoadTracer(args.count)
+    factory = PayloadFactory(dm_ratio=args.dm_ratio, guilds=args.guilds, seed=args.seed)
+    guild_ids = factory.guild_ids
+    bot = make_load_bot(
+        tracer=tracer,
+        direct_binding=not args.string_binding,
+        auto_defer=args.auto_defer,
+        slash_command_guilds=None if args.global_upload else guild_ids,
+    )
+    cache_guilds(bot, guild_ids)
+
+    mock = MockDiscord(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    mock.install(bot)
+    await bot._async_setup_hook()  # what login would do, binds the bot to this event loop
+
+    # Startup upload, through the same path as SlashBot.setup_hook
+    bot.auto_upload = True
+    upload_start = time.perf_counter()
+    await bot.setup_hook()
+    upload_time = time.perf_counter() - upload_start
+
+    state = bot._connection
+
+    start = time.perf_counter()
+    for index in range(args.count):
+        # Open loop, so a slow bot gets interactions queued up like it would from the gateway
+        delay = start + index / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        interaction = discord.Interaction(data=factory.make(), state=state)  # type: ignore
+        tracer.dispatched[interaction.id] = time.perf_counter()
+        bot.dispatch("interaction", interaction)
+
+    dispatched_in = time.perf_counter() - start
+    try:
+        await asyncio.wait_for(tracer.done.wait(), timeout=args.timeout)
+    except asyncio.TimeoutError:
+        pass
+
+    elapsed = (tracer.finished_at or time.perf_counter()) - start
+    summary = tracer.summary()
+    return {
+        "interactions": args.count,
+        "finished": len(tracer.total_latencies),
+        "target_rate": args.rate,
+        "dispatch_rate": args.count / dispatched_in if dispatched_in else float("inf"),
+        "throughput": len(tracer.total_latencies) / elapsed,
+        "upload_ms": upload_time * 1000,
+        "response_ms": _distribution(tracer.response_latencies),
+        "total_ms": _distribution(tracer.total_latencies),
+        "stages_ms": {name: stage["mean"] for name, stage in summary["stages"].items()},
+        "outcomes": summary["outcomes"],
+        "responses": summary["responses"],
+        "requests": dict(mock.requests),
+        "rate_limited": dict(mock.rate_limited),
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(
+        f"{report['finished']}/{report['interactions']} interactions finished, "
+        f"{report['throughput']:.0f}/s achieved of {report['target_rate']:.0f}/s targeted "
+        f"({report['dispatch_rate']:.0f}/s dispatched)"
+    )
+    print(f"startup upload took {report['upload_ms']:.1f}ms")
+
+    for name in ("response_ms", "total_ms"):
+        distribution = report[name]
+        if distribution:
+            label = "first response" if name == "response_ms" else "finished"
+            print(f"{label:<15} " + "  ".join(f"{key} {value:>8.2f}ms" for key, value in distribution.items()))
+
+    print("mean stage times  " + "  ".join(f"{name}={value:.3f}ms" for name, value in report["stages_ms"].items()))
+    print(f"outcomes {report['outcomes']}, responses {report['responses']}")
+    for route, count in sorted(report["requests"].items()):
+        limited = report["rate_limited"].get(route, 0)
+        print(f"  {count:>7} {route}" + (f" ({limited} rate limited)" if limited else ""))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=5_000, help="interactions to send")
+    parser.add_argument("--rate", type=float, default=1_000, help="interactions sent per second")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds every request takes")
+    parser.add_argument("--jitter", type=float, default=0.02, help="up to this many more seconds per request")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="share of requests answered with a 429")
+    parser.add_argument("--retry-after", type=float, default=0.25, help="seconds to wait after a 429")
+    parser.add_argument("--dm-ratio", type=float, default=0.2, help="share of interactions sent from DMs")
+    parser.add_argument("--guilds", type=int, default=10, help="guilds to send interactions from and upload to")
+    parser.add_argument("--global-upload", action="store_true", help="upload global commands instead of per guild")
+    parser.add_argument("--string-binding", action="store_true", help="use SlashBot(direct_binding=False)")
+    parser.add_argument("--auto-defer", type=float, default=None, help="SlashBot(auto_defer=...)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for stragglers")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = await run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,113 @@
+"""Offline benchmarks of the slash conversion and dispatch hot paths.
+
+Run with ``python benchmarks/run.py [names...] [--iterations N]``, this does not connect to Discord.
+Each benchmark reports throughput, p50/p99 latency, peak allocations and gen 0 collections per call.
+"""
+
+import argparse
+import asyncio
+from typing import Awaitable, Callable, Dict, List
+
+from discord.ext.commands.view import StringView
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash.from_slash import _FakeSlashMessage, _unwrap_slash_groups
+from discord.ext.lazy_slash.resolved import ResolvedData
+from discord.ext.lazy_slash.to_slash import to_application_command
+
+from _fakes import interactions, make_bot, make_command_tree, make_interaction
+from _harness import Result, measure
+
+Benchmark = Callable[[int], Awaitable[List[Result]]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(func: Benchmark) -> Benchmark:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+@benchmark
+async def unwrap(iterations: int) -> List[Result]:
+    bot = make_bot()
+    data = interactions(bot._connection)["config set prefix"].data
+    return [await measure("unwrap nested groups", lambda: _unwrap_slash_groups(data), iterations)]
+
+
+@benchmark
+async def dispatch(iterations: int) -> List[Result]:
+    bot = make_bot()
+    results = []
+    for name, interaction in interactions(bot._connection).items():
+        for direct_binding in (False, True):
+            if name == "greet" and not direct_binding:
+                continue  # the message content path would have to fetch the uncached user
+
+            bot.direct_binding = direct_binding
+            mode = "direct" if direct_binding else "string"
+            results.append(
+                await measure(
+                    f"dispatch {name} ({mode})",
+                    lambda: lazy_slash.process_slash_commands(bot, interaction),  # type: ignore
+                    iterations,
+                )
+            )
+
+    return results
+
+
+@benchmark
+async def convert(iterations: int) -> List[Result]:
+    tree = make_command_tree()
+
+    def convert_tree():
+        for command in tree:
+            to_application_command(command)
+
+    # Each call converts the whole tree, so run it far less often
+    return [await measure(f"convert {len(tree)} commands", convert_tree, max(iterations // 500, 5), warmup=1)]
+
+
+@benchmark
+async def send(iterations: int) -> List[Result]:
+    bot = make_bot()
+    state = bot._connection
+
+    def make_context(**kwargs) -> lazy_slash.SlashContext:
+        interaction = make_interaction(state, "echo", [])
+        message = _FakeSlashMessage.from_interaction(
+            interaction, interaction.channel, ResolvedData(interaction)  # type: ignore
+        )
+        ctx = lazy_slash.SlashContext(message=message, bot=bot, view=StringView(""), prefix="/")
+        ctx.interaction = interaction  # type: ignore
+        return ctx
+
+    async def send_response():
+        await make_context().send("hello", return_message=False)
+
+    async def send_followup():
+        await make_context().send("hello", return_message=True)
+
+    return [
+        await measure("send (initial response)", send_response, iterations),
+        await measure("send (initial response, fetched)", send_followup, iterations),
+    ]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help=f"benchmarks to run out of {', '.join(BENCHMARKS)}, defaults to all")
+    parser.add_argument("--iterations", type=int, default=5_000)
+    args = parser.parse_args()
+
+    unknown = set(args.names) - BENCHMARKS.keys()
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    for name in args.names or BENCHMARKS:
+        for result in await BENCHMARKS[name](args.iterations):
+            print(result)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
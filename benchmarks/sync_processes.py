@@ -0,0 +1,101 @@
+"""Starts several processes of the same bot against a mocked Discord, to check only one of them syncs commands.
+
+Each process runs ``setup_hook`` with its own :class:`MockDiscord`, so the uploads of every process are
+counted separately. Processes start ``--stagger`` seconds apart, like a rolling deploy, and share a manifest
+so a process elected after another already synced skips the unchanged scopes.
+
+Run with ``python benchmarks/sync_processes.py [--processes N] [--coordinator none|file|socket] [--fail-leader]``
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+from discord.ext import lazy_slash
+
+from _mock_discord import MockDiscord, make_load_bot
+
+
+def make_coordinator(kind: str, lock_dir: str, port: int) -> Optional[lazy_slash.SyncCoordinator]:
+    if kind == "file":
+        return lazy_slash.FileLockCoordinator(os.path.join(lock_dir, "sync.lock"), poll_interval=0.05)
+    if kind == "socket":
+        return lazy_slash.SocketCoordinator(port)
+    return None
+
+
+async def run_process(index: int, args: argparse.Namespace, lock_dir: str) -> Dict[str, Any]:
+    await asyncio.sleep(index * args.stagger)
+
+    coordinator = make_coordinator(args.coordinator, lock_dir, args.port)
+    bot = make_load_bot(
+        slash_command_guilds=list(range(1, args.guilds + 1)),
+        sync=args.sync,
+        manifest_path=os.path.join(lock_dir, "manifest.json"),
+        sync_coordinator=coordinator,
+    )
+    mock = MockDiscord(latency=args.latency, jitter=0)
+    mock.install(bot)
+    if args.fail_leader and index == 0:
+        bot.sync_slash_commands = _failing_sync  # type: ignore
+
+    await bot._async_setup_hook()
+    bot.auto_upload = True
+    start = time.perf_counter()
+    error = None
+    try:
+        await bot.setup_hook()
+    except Exception as exc:
+        error = repr(exc)
+
+    uploads = sum(count for route, count in mock.requests.items() if route.startswith("PUT"))
+    return {"index": index, "uploads": uploads, "seconds": time.perf_counter() - start, "error": error}
+
+
+async def _failing_sync():
+    await asyncio.sleep(0.2)
+    raise RuntimeError("simulated crash while syncing")
+
+
+def process_main(index: int, args: argparse.Namespace, lock_dir: str, queue: Any) -> None:
+    queue.put(asyncio.run(run_process(index, args, lock_dir)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--coordinator", choices=("none", "file", "socket"), default="file")
+    parser.add_argument("--guilds", type=int, default=5, help="guilds each process uploads to")
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds every request takes")
+    parser.add_argument("--stagger", type=float, default=0.05, help="seconds between process starts")
+    parser.add_argument("--port", type=int, default=47_813, help="port for --coordinator socket")
+    parser.add_argument("--sync", choices=("always", "manifest"), default="manifest", help="SlashBot(sync=...)")
+    parser.add_argument("--fail-leader", action="store_true", help="make the first process crash while syncing")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    with tempfile.TemporaryDirectory() as lock_dir:
+        processes = [
+            context.Process(target=process_main, args=(index, args, lock_dir, queue)) for index in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+
+        reports = sorted((queue.get() for _ in processes), key=lambda report: report["index"])
+        for process in processes:
+            process.join()
+
+    for report in reports:
+        error = f"  {report['error']}" if report["error"] else ""
+        print(f"process {report['index']}: {report['uploads']} uploads in {report['seconds']:.2f}s{error}")
+
+    print(f"{sum(report['uploads'] for report in reports)} uploads in total over {args.processes} processes")
+
+
+if __name__ == "__main__":
+    main()
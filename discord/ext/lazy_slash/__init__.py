@@ -1,38 +1,148 @@
-from typing import Iterable, Optional, Type
+from typing import Dict, Iterable, List, Literal, Optional, Type
 
 import discord
 from discord.ext import commands
 
+from .autocomplete import AutocompleteDispatcher
 from .from_slash import process_slash_commands
-from .to_slash import create_slash_commands
+from .hot_reload import DeltaSync
+from .to_slash import OptionType, create_slash_commands, register_option_type
 from .context import SlashContext
+from .context_menus import context_menu
+from .coordination import CallbackCoordinator, FileLockCoordinator, SocketCoordinator, SyncCoordinator, run_coordinated
 from .patches import Option  # also has side effects
+from .pools import WorkerPool, offload
+from .routing import DEFAULT_ERROR_MESSAGES
+from .snapshot import export_snapshot, load_snapshot
+from .sync import SyncResult
+from .tracing import HistogramTracer, LogTracer, Trace, Tracer
+from .typing_scheduler import TypingScheduler
 
-__all__ = ("SlashBot", "SlashContext", "process_slash_commands", "create_slash_commands", "Option")
+__all__ = (
+    "SlashBot",
+    "SlashContext",
+    "process_slash_commands",
+    "create_slash_commands",
+    "register_option_type",
+    "export_snapshot",
+    "load_snapshot",
+    "Option",
+    "OptionType",
+    "SyncResult",
+    "Tracer",
+    "Trace",
+    "LogTracer",
+    "HistogramTracer",
+    "WorkerPool",
+    "offload",
+    "context_menu",
+    "SyncCoordinator",
+    "CallbackCoordinator",
+    "FileLockCoordinator",
+    "SocketCoordinator",
+)
 
 
 class SlashBot(commands.Bot):
-    def __init__(self, *args, auto_upload: bool, slash_command_guilds: Optional[Iterable[int]] = None, **kwargs):
+    # Slash invocations build this context directly instead of calling get_context, unless get_context is overridden
+    slash_context_class: Optional[Type[commands.Context]] = SlashContext
+
+    def __init__(
+        self,
+        *args,
+        auto_upload: bool,
+        slash_command_guilds: Optional[Iterable[int]] = None,
+        direct_binding: bool = True,
+        sync: Literal["always", "remote", "manifest"] = "always",
+        manifest_path: str = ".lazy_slash_manifest.json",
+        upload_concurrency: int = 8,
+        invalid_commands: Literal["raise", "skip"] = "raise",
+        snapshot_path: Optional[str] = None,
+        autocomplete_cache_ttl: float = 30.0,
+        tracer: Optional[Tracer] = None,
+        auto_defer: Optional[float] = None,
+        auto_defer_ephemeral: bool = False,
+        worker_pools: Optional[Dict[str, WorkerPool]] = None,
+        error_messages: Optional[Dict[str, str]] = None,
+        early_admission: bool = False,
+        max_in_flight: Optional[int] = None,
+        sync_coordinator: Optional[SyncCoordinator] = None,
+        hot_reload_delay: Optional[float] = None,
+        **kwargs,
+    ):
+        # Set before ext.commands adds the help command, only enabled once the startup sync is done
+        self.delta_sync = DeltaSync(self, delay=hot_reload_delay) if hot_reload_delay is not None else None
+        self.sync_coordinator = sync_coordinator
+        self.early_admission = early_admission
+        self.max_in_flight = max_in_flight
+        self._slash_in_flight = 0
+        self.error_messages = DEFAULT_ERROR_MESSAGES if error_messages is None else error_messages
+        self.worker_pools = worker_pools or {}
+        for name, pool in self.worker_pools.items():
+            pool.name = name
+
+        self.auto_defer = auto_defer
+        self.auto_defer_ephemeral = auto_defer_ephemeral
+        self.tracer = tracer
+        self.snapshot_path = snapshot_path
+        self.autocomplete_dispatcher = AutocompleteDispatcher(cache_ttl=autocomplete_cache_ttl)
+        self.sync = sync
+        self.upload_concurrency = upload_concurrency
+        self.invalid_commands = invalid_commands
+        self.manifest_path = manifest_path
         self.auto_upload = auto_upload
+        self.direct_binding = direct_binding
         self.slash_command_guilds = slash_command_guilds
 
         super().__init__(*args, **kwargs)
+        self.typing_scheduler = TypingScheduler(self.http)
 
     on_interaction = process_slash_commands
 
     async def setup_hook(self):
         await super().setup_hook()
 
+        if self.snapshot_path is not None:
+            load_snapshot(self.walk_commands(), self.snapshot_path)
+
         if not self.auto_upload:
             return None
 
-        if self.slash_command_guilds is None:
-            await create_slash_commands(self, upload_as_global=self.commands)
+        if self.sync_coordinator is None:
+            await self.sync_slash_commands()
         else:
-            for guild in self.slash_command_guilds:
-                await create_slash_commands(self, upload_as_guild={guild: list(self.all_commands.values())})
+            await run_coordinated(self.sync_coordinator, self.sync_slash_commands)
+
+        if self.delta_sync is not None:
+            self.delta_sync.enabled = True
+
+    async def sync_slash_commands(self) -> List[SyncResult]:
+        """Uploads the bot's commands globally, or to ``slash_command_guilds``, as ``setup_hook`` does."""
+
+        sync_kwargs = {
+            "sync": self.sync,
+            "manifest_path": self.manifest_path,
+            "upload_concurrency": self.upload_concurrency,
+            "invalid_commands": self.invalid_commands,
+        }
+        if self.slash_command_guilds is None:
+            return await create_slash_commands(self, upload_as_global=self.commands, **sync_kwargs)
+
+        # all_commands has an entry per alias, commands has each command once
+        guild_commands = list(self.commands)
+        return await create_slash_commands(
+            self, upload_as_guild={guild: guild_commands for guild in self.slash_command_guilds}, **sync_kwargs
+        )
+
+    async def close(self) -> None:
+        await super().close()
+        for pool in self.worker_pools.values():
+            pool.executor.shutdown(wait=False)
 
     async def get_context(
         self, message: discord.Message, cls: Type[commands.Context] = SlashContext
     ) -> commands.Context:
         return await super().get_context(message, cls=cls)
+
+    # Only this get_context may be skipped by building a slash_context_class directly
+    get_context.__lazy_slash_direct__ = True  # type: ignore
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import discord
+from discord.ext import commands
+from discord.ext.commands import BucketType
+
+# Returned for buckets keyed by something the interaction does not carry, which ext.commands checks as usual
+_UNKNOWN = object()
+
+
+def bucket_key(bucket_type: Any, interaction: discord.Interaction) -> Any:
+    """Returns the key :meth:`BucketType.get_key` would give the slash command message of ``interaction``.
+
+    Only the bucket types keyed by IDs are supported, others return a sentinel.
+    """
+
+    user = interaction.user
+    if bucket_type is BucketType.default:
+        return 0
+    if bucket_type is BucketType.user:
+        return user.id
+    if bucket_type is BucketType.guild:
+        return interaction.guild_id or user.id
+    if bucket_type is BucketType.channel:
+        return interaction.channel_id if interaction.channel_id is not None else _UNKNOWN
+    if bucket_type is BucketType.member:
+        return (interaction.guild_id, user.id)
+
+    return _UNKNOWN  # category and role need cached channels and members, custom types need the message
+
+
+def _check_cooldown(command: commands.Command, interaction: discord.Interaction, current: float) -> None:
+    buckets = command._buckets
+    if not buckets.valid or isinstance(buckets, commands.DynamicCooldownMapping):
+        return
+
+    if buckets.type is BucketType.default:
+        bucket = buckets._cooldown
+    else:
+        key = bucket_key(buckets.type, interaction)
+        bucket = buckets._cache.get(key) if key is not _UNKNOWN else None
+
+    # Only peeked at, the token is taken by ext.commands once the command is prepared
+    if bucket is not None and bucket.get_tokens(current) == 0:
+        raise commands.CommandOnCooldown(bucket, bucket.get_retry_after(current), buckets.type)  # type: ignore
+
+
+def _check_max_concurrency(command: commands.Command, interaction: discord.Interaction) -> None:
+    max_concurrency: Optional[commands.MaxConcurrency] = command._max_concurrency
+    if max_concurrency is None or max_concurrency.wait:
+        return
+
+    key = bucket_key(max_concurrency.per, interaction)
+    semaphore = max_concurrency._mapping.get(key) if key is not _UNKNOWN else None
+    if semaphore is not None and semaphore.value <= 0:
+        raise commands.MaxConcurrencyReached(max_concurrency.number, max_concurrency.per)
+
+
+def check_admission(command: commands.Command, interaction: discord.Interaction) -> None:
+    """Raises the error ext.commands would raise if ``command`` is on cooldown or at its concurrency limit.
+
+    This runs before any conversion or context work, using only the IDs in the interaction,
+    for the command and each parent group it is invoked through.
+    """
+
+    # ext.commands times cooldowns with the message's creation time, the same as the interaction's
+    current = discord.utils.snowflake_time(interaction.id).timestamp()
+    for checked in (*reversed(command.parents), command):
+        _check_cooldown(checked, interaction, current)
+        _check_max_concurrency(checked, interaction)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+from .index import get_slash_command
+
+if TYPE_CHECKING:
+    from discord.types.interactions import ApplicationCommandInteractionDataOption
+
+_log = logging.getLogger(__name__)
+
+AutocompleteCallback = Callable[[discord.Interaction, str], Awaitable[List[Any]]]
+
+# Discord drops autocomplete responses after 3 seconds, keep some room for the response itself
+AUTOCOMPLETE_DEADLINE = 2.5
+MAX_CHOICES = 25
+
+
+class AutocompleteCache:
+    """A LRU cache of autocomplete choices, with entries expiring after ``ttl`` seconds."""
+
+    __slots__ = ("ttl", "maxsize", "_entries")
+
+    def __init__(self, *, ttl: float = 30.0, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, Tuple[float, List[discord.app_commands.Choice]]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[List[discord.app_commands.Choice]]:
+        try:
+            expires, choices = self._entries[key]
+        except KeyError:
+            return None
+
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return choices
+
+    def set(self, key: Hashable, choices: List[discord.app_commands.Choice]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, choices)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _to_choice(value: Any) -> discord.app_commands.Choice:
+    if isinstance(value, discord.app_commands.Choice):
+        return value
+    if isinstance(value, tuple):
+        name, value = value
+        return discord.app_commands.Choice(name=str(name), value=value)
+
+    return discord.app_commands.Choice(name=str(value), value=value)
+
+
+class AutocompleteDispatcher:
+    """Answers autocomplete interactions with the providers given to :class:`Option`.
+
+    Choices are cached per command, option and typed value. When the same user types
+    again before their last request finished, the older request is cancelled, as
+    Discord only shows the newest response anyway.
+    """
+
+    def __init__(self, *, cache_ttl: float = 30.0, cache_size: int = 1024) -> None:
+        self.cache = AutocompleteCache(ttl=cache_ttl, maxsize=cache_size)
+        self._pending: Dict[Hashable, asyncio.Task] = {}
+
+    async def dispatch(
+        self,
+        bot: commands.Bot,
+        interaction: discord.Interaction,
+        command_path: Tuple[str, ...],
+        command_options: Dict[str, ApplicationCommandInteractionDataOption],
+    ) -> None:
+        command = get_slash_command(bot, command_path)
+        focused = next((option for option in command_options.values() if option.get("focused")), None)
+        if command is None or focused is None:
+            return
+
+        provider: Optional[AutocompleteCallback] = getattr(command, "option_autocomplete", {}).get(focused["name"])
+        if provider is None:
+            return
+
+        current = str(focused.get("value", ""))
+        cache_key = (command.qualified_name, focused["name"], current)
+        choices = self.cache.get(cache_key)
+        if choices is None:
+            choices = await self._run_provider(provider, interaction, current, command.qualified_name, focused["name"])
+            if choices is None:
+                return  # superseded or out of time, nothing useful to send
+
+            self.cache.set(cache_key, choices)
+
+        try:
+            await interaction.response.autocomplete(choices)
+        except discord.HTTPException as error:
+            _log.debug("Failed to respond to autocomplete for %s: %s", command.qualified_name, error)
+
+    async def _run_provider(
+        self,
+        provider: AutocompleteCallback,
+        interaction: discord.Interaction,
+        current: str,
+        command_name: str,
+        option_name: str,
+    ) -> Optional[List[discord.app_commands.Choice]]:
+        pending_key = (getattr(interaction.user, "id", None), command_name, option_name)
+        previous = self._pending.pop(pending_key, None)
+        if previous is not None:
+            previous.cancel()
+
+        task = asyncio.ensure_future(provider(interaction, current))
+        self._pending[pending_key] = task
+
+        elapsed = discord.utils.utcnow() - discord.utils.snowflake_time(interaction.id)
+        try:
+            done, _ = await asyncio.wait({task}, timeout=AUTOCOMPLETE_DEADLINE - elapsed.total_seconds())
+        finally:
+            if self._pending.get(pending_key) is task:
+                del self._pending[pending_key]
+
+        if not done:
+            task.cancel()
+            return None
+
+        if task.cancelled():
+            return None
+
+        return [_to_choice(value) for value in task.result()[:MAX_CHOICES]]
+
+
+def _get_dispatcher(bot: commands.Bot) -> AutocompleteDispatcher:
+    dispatcher = getattr(bot, "autocomplete_dispatcher", None)
+    if dispatcher is None:
+        dispatcher = bot.autocomplete_dispatcher = AutocompleteDispatcher()  # type: ignore
+
+    return dispatcher
+
+
+async def dispatch_autocomplete(
+    bot: commands.Bot,
+    interaction: discord.Interaction,
+    command_path: Tuple[str, ...],
+    command_options: Dict[str, ApplicationCommandInteractionDataOption],
+) -> None:
+    await _get_dispatcher(bot).dispatch(bot, interaction, command_path, command_options)
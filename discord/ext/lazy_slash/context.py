@@ -1,13 +1,165 @@
 import asyncio
-from typing import Any, Literal, Optional, Union, overload
+import contextlib
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Literal, Optional, Tuple, Union, overload
 
 import discord
 from discord.ext import commands
 
+from .tracing import NULL_TRACE
+from .typing_scheduler import get_typing_scheduler
+
+_log = logging.getLogger(__name__)
+
+MAX_CONTENT_LENGTH = 2000
+MAX_EMBEDS = 10
+
+
+class AutoDefer:
+    """Defers an interaction in the background if it has not been responded to within ``delay`` seconds.
+
+    ``sleep`` is awaited for the delay, and can be replaced to control the clock.
+    :attr:`deferred` is set once the defer was sent.
+    """
+
+    __slots__ = ("interaction", "delay", "ephemeral", "trace", "deferred", "_sleep", "_task", "_deferring")
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        delay: float,
+        *,
+        ephemeral: bool = False,
+        trace: Any = NULL_TRACE,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        self.interaction = interaction
+        self.delay = delay
+        self.ephemeral = ephemeral
+        self.trace = trace
+        self.deferred = False
+        self._sleep = sleep
+        self._task: Optional[asyncio.Task] = None
+        self._deferring = False
+
+    def start(self) -> None:
+        self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        await self._sleep(self.delay)
+        if self.interaction.response.is_done():
+            return
+
+        self._deferring = True
+        try:
+            await self.interaction.response.defer(ephemeral=self.ephemeral)
+        except discord.HTTPException as error:
+            _log.debug("Failed to automatically defer interaction %s: %s", self.interaction.id, error)
+        else:
+            self.deferred = True
+            self.trace.respond(deferred=True)
+
+    def cancel(self) -> None:
+        """Stops the timer, unless the defer is already being sent."""
+
+        if self._task is not None and not self._deferring:
+            self._task.cancel()
+
+    async def stop(self) -> None:
+        """Stops the timer, waiting for the defer to finish if it is already being sent.
+
+        After this returns ``interaction.response.is_done()`` can be trusted.
+        """
+
+        task = self._task
+        if task is None or task.done():
+            return
+
+        if not self._deferring:
+            self.cancel()
+            return
+
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+
+
+class _SendBatch:
+    # Sends queued by SlashContext.batch_sends, all with the same ephemeral flag
+    __slots__ = ("ephemeral", "items")
+
+    def __init__(self) -> None:
+        self.ephemeral: Optional[bool] = None
+        self.items: List[Tuple[Optional[str], List[discord.Embed]]] = []
+
+    def add(self, content: Optional[str], ephemeral: bool, kwargs: Any) -> bool:
+        """Queues the send if it only has text and embeds, returning if it was."""
+
+        if kwargs.keys() - {"embed", "embeds"} or (self.items and ephemeral != self.ephemeral):
+            return False
+
+        embeds = list(kwargs.get("embeds") or ())
+        if kwargs.get("embed") is not None:
+            embeds.append(kwargs["embed"])
+
+        self.ephemeral = ephemeral
+        self.items.append((None if content is None else str(content), embeds))
+        return True
+
+    def merge(self) -> List[Tuple[Optional[str], List[discord.Embed]]]:
+        """Empties the batch into as few messages as fit Discord's content and embed limits."""
+
+        messages: List[Tuple[Optional[str], List[discord.Embed]]] = []
+        lines: List[str] = []
+        embeds: List[discord.Embed] = []
+        length = 0
+
+        for content, item_embeds in self.items:
+            added = 0 if content is None else len(content) + bool(lines)
+            if (lines or embeds) and (
+                length + added > MAX_CONTENT_LENGTH or len(embeds) + len(item_embeds) > MAX_EMBEDS
+            ):
+                messages.append(("\n".join(lines) or None, embeds))
+                lines, embeds, length = [], [], 0
+                added = 0 if content is None else len(content)
+
+            if content is not None:
+                lines.append(content)
+                length += added
+            embeds.extend(item_embeds)
+
+        if lines or embeds:
+            messages.append(("\n".join(lines) or None, embeds))
+
+        self.items = []
+        return messages
+
 
 class SlashContext(commands.Context):
     interaction: discord.Interaction
 
+    async def resolve_prefix(self) -> str:
+        """|coro|
+
+        Returns the prefix the bot would use for this context, resolved with ``get_prefix`` on first use.
+
+        Slash commands skip prefix resolution, so :attr:`prefix` is ``/`` in them.
+        """
+
+        prefix: Optional[str] = getattr(self, "_resolved_prefix", None)
+        if prefix is None:
+            if self.interaction is None:
+                prefix = self.prefix or ""
+            else:
+                resolved = await self.bot.get_prefix(self.message)
+                prefix = resolved[0] if isinstance(resolved, list) else resolved
+
+            self._resolved_prefix = prefix
+
+        return prefix
+
     @overload
     async def send(
         self,
@@ -42,7 +194,9 @@ class SlashContext(commands.Context):
         ------------
         return_message: :class:`bool`
             Ignored if not in a slash command context.
-            If this is set to False more native interaction methods will be used.
+            If this is set to False the initial response is not fetched after being sent, saving a request,
+            and the send can be queued by :meth:`batch_sends`. Followups always return the message
+            without another request.
         ephemeral: :class:`bool`
             Ignored if not in a slash command context.
             Indicates if the message should only be visible to the user who started the interaction.
@@ -57,10 +211,21 @@ class SlashContext(commands.Context):
             In a normal context, it always returns a :class:`.Message`
         """
 
-        if hasattr(self, "_typing_task"):
-            self._typing_task.cancel()
-            del self._typing_task
+        self.release_typing()
 
+        batch: Optional[_SendBatch] = getattr(self, "_send_batch", None)
+        if batch is not None:
+            if not return_message and batch.add(content, ephemeral, kwargs):
+                return None
+
+            # Anything else is sent as normal, after what was queued so the order is kept
+            await self._flush_batch(batch)
+
+        return await self._send(content, return_message, ephemeral, **kwargs)
+
+    async def _send(
+        self, content: Optional[str], return_message: bool, ephemeral: bool, **kwargs: Any
+    ) -> Optional[Union[discord.Message, discord.WebhookMessage]]:
         if self.interaction is None:
             return await super().send(content, **kwargs)
 
@@ -70,16 +235,77 @@ class SlashContext(commands.Context):
         kwargs.pop("reference", None)
         kwargs.pop("mention_author", None)
 
-        if not (return_message or self.interaction.response.is_done()):
-            send = self.interaction.response.send_message
-        else:
-            # We have to defer in order to use the followup webhook
-            if not self.interaction.response.is_done():
-                await self.interaction.response.defer(ephemeral=ephemeral)
+        auto_defer: Optional[AutoDefer] = getattr(self, "_auto_defer", None)
+        if auto_defer is not None:
+            await auto_defer.stop()
+            self._auto_defer = None  # only the first send can be affected by it
+            if auto_defer.deferred and ephemeral != auto_defer.ephemeral:
+                # The first followup replaces the thinking message, which keeps the visibility it was deferred with
+                _log.warning(
+                    "Command %s was deferred automatically with ephemeral=%s, so its send with ephemeral=%s is not. "
+                    "Call ctx.defer(ephemeral=%s) before the delay, or set auto_defer_ephemeral",
+                    self.command and self.command.qualified_name,
+                    auto_defer.ephemeral,
+                    ephemeral,
+                    ephemeral,
+                )
+
+        if self.interaction.response.is_done():
+            # The webhook gives the message back in the same request when asked to wait for it
+            kwargs.setdefault("wait", return_message)
+            return await self._followup().send(content, ephemeral=ephemeral, **kwargs)  # type: ignore
+
+        # Respond with the message itself instead of deferring, so it is shown after one request
+        await self.interaction.response.send_message(content, ephemeral=ephemeral, **kwargs)
+        getattr(self, "_slash_trace", NULL_TRACE).respond(deferred=False)
+        if not return_message:
+            return None
+
+        # The interaction callback has no response body, so the message has to be fetched (cached on the interaction)
+        return await self._original_response()
 
-            send = self.interaction.followup.send
+    async def _original_response(self) -> discord.InteractionMessage:
+        # Renamed from original_message in later discord.py versions, support both
+        interaction: Any = self.interaction
+        fetch = getattr(interaction, "original_response", None) or interaction.original_message
+        return await fetch()
 
-        return await send(content, ephemeral=ephemeral, **kwargs)  # type: ignore
+    def _followup(self) -> discord.Webhook:
+        # Interaction.followup builds a new Webhook on every access, keep one per interaction
+        followup: Optional[discord.Webhook] = getattr(self, "_followup_webhook", None)
+        if followup is None:
+            followup = self._followup_webhook = self.interaction.followup
+
+        return followup
+
+    async def _flush_batch(self, batch: _SendBatch) -> None:
+        for content, embeds in batch.merge():
+            await self._send(content, False, bool(batch.ephemeral), **({"embeds": embeds} if embeds else {}))
+
+    @contextlib.asynccontextmanager
+    async def batch_sends(self) -> AsyncIterator[None]:
+        """Queues text and embed only sends made with ``return_message=False`` inside the block,
+        then sends them joined into as few messages as fit in Discord's limits when it exits.
+
+        Any other send first sends what is queued, so messages keep their order. Nesting this does nothing.
+
+        .. code-block:: python3
+
+            async with ctx.batch_sends():
+                for line in lines:
+                    await ctx.send(line, return_message=False)
+        """
+
+        if getattr(self, "_send_batch", None) is not None:
+            yield
+            return
+
+        batch = self._send_batch = _SendBatch()
+        try:
+            yield
+        finally:
+            self._send_batch = None
+            await self._flush_batch(batch)
 
     @overload
     async def reply(
@@ -99,12 +325,22 @@ class SlashContext(commands.Context):
     ) -> Optional[Union[discord.Message, discord.WebhookMessage]]:
         return await self.send(content, return_message=return_message, reference=self.message, **kwargs)  # type: ignore
 
+    def release_typing(self) -> None:
+        """Stops triggering typing for this context, started by :meth:`defer` in a message command.
+
+        This is called by :meth:`send`, and once the command finished.
+        """
+
+        if getattr(self, "_typing", False):
+            get_typing_scheduler(self.bot).release(self.channel.id)
+            self._typing = False
+
     async def defer(self, *, ephemeral: bool = False, trigger_typing: bool = True) -> None:
         """|coro|
 
         Defers the Slash Command interaction if ran in a slash command **or**
 
-        Loops triggering ``Bot is typing`` in the channel if run in a message command.
+        Keeps ``Bot is typing`` shown in the channel until :meth:`send` or the command finishes, if run in a message command.
 
         Parameters
         ------------
@@ -115,13 +351,15 @@ class SlashContext(commands.Context):
         """
 
         if self.interaction is None:
-            if not hasattr(self, "_typing_task") and trigger_typing:
-
-                async def typing_task():
-                    while True:
-                        await self.trigger_typing()
-                        await asyncio.sleep(10)
-
-                self._typing_task = self.bot.loop.create_task(typing_task())
+            if not getattr(self, "_typing", False) and trigger_typing:
+                get_typing_scheduler(self.bot).acquire(self.channel.id)
+                self._typing = True
         else:
+            auto_defer: Optional[AutoDefer] = getattr(self, "_auto_defer", None)
+            if auto_defer is not None:
+                await auto_defer.stop()
+                if self.interaction.response.is_done():
+                    return
+
             await self.interaction.response.defer(ephemeral=ephemeral)
+            getattr(self, "_slash_trace", NULL_TRACE).respond(deferred=True)
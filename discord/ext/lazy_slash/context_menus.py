@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Literal, Optional, Tuple, TypeVar
+
+from discord.ext import commands
+
+# Application command types
+CHAT_INPUT = 1
+USER_COMMAND = 2
+MESSAGE_COMMAND = 3
+CONTEXT_MENU_TYPES = {"user": USER_COMMAND, "message": MESSAGE_COMMAND}
+
+T = TypeVar("T")
+
+
+def context_menu(type: Literal["user", "message"], *, name: Optional[str] = None) -> Callable[[T], T]:
+    """Marks a command to be uploaded as a user or message context menu command, instead of a slash command.
+
+    The user or message the menu was used on is passed as the command's first parameter,
+    taken from the interaction so it never has to be fetched. Any other parameters get their defaults.
+    The command still works as a message command as usual.
+
+    .. code-block:: python3
+
+        @bot.command()
+        @lazy_slash.context_menu("user", name="Show Avatar")
+        async def avatar(ctx, user: discord.User):
+            await ctx.send(user.display_avatar.url)
+
+    Parameters
+    -----------
+    type: Literal["user", "message"]
+        What the menu is shown on.
+    name: Optional[:class:`str`]
+        The name shown in the menu, which may have spaces and capitals, defaults to the command's name.
+    """
+
+    if type not in CONTEXT_MENU_TYPES:
+        raise ValueError(f"Context menu type must be 'user' or 'message', not {type!r}")
+
+    def decorator(func: T) -> T:
+        # Set on the callback like ext.commands' own decorators, so cog copies keep it
+        callback: Any = func.callback if isinstance(func, commands.Command) else func
+        callback.__lazy_slash_context_menu__ = (CONTEXT_MENU_TYPES[type], name)
+        if isinstance(func, commands.Command):
+            # It may already be on a bot, so it has to move from the slash commands to the context menus
+            from . import hot_reload, index  # both import this module
+
+            func._slash_payload = None  # type: ignore
+            index.invalidate()
+            hot_reload.schedule_changed(func)
+
+        return func
+
+    return decorator
+
+
+def get_context_menu(command: commands.Command) -> Optional[Tuple[int, str]]:
+    """Returns the application command type and name of ``command`` if it is a context menu command."""
+
+    marker: Optional[Tuple[int, Optional[str]]] = getattr(command.callback, "__lazy_slash_context_menu__", None)
+    if marker is None:
+        return None
+
+    command_type, name = marker
+    return command_type, name or command.name
+
+
+def to_context_menu(command: commands.Command) -> Optional[Dict[str, Any]]:
+    """Returns the payload of ``command`` if it is a context menu command."""
+
+    menu = get_context_menu(command)
+    if menu is None:
+        return None
+
+    command_type, name = menu
+    return {"name": name, "type": command_type}
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, List, Optional
+
+from .sync import SyncResult
+
+_log = logging.getLogger(__name__)
+
+
+def _dump_results(results: List[SyncResult]) -> List[List[Any]]:
+    return [list(result) for result in results]
+
+
+def _load_results(data: List[List[Any]]) -> List[SyncResult]:
+    return [SyncResult(*result) for result in data]
+
+
+class SyncCoordinator:
+    """Elects the one process of a deployment that syncs commands, so the others do not upload the same commands.
+
+    This base class elects every process, as if nothing was coordinated. Subclasses implement
+    :meth:`acquire`, and :meth:`publish` and :meth:`wait_for_results` if the other processes can
+    wait for the elected process to finish.
+
+    Parameters
+    -----------
+    wait: :class:`bool`
+        Indicates whether processes that were not elected wait for the results of the sync,
+        instead of skipping it straight away.
+    timeout: :class:`float`
+        The most seconds to wait for the results before giving up.
+    """
+
+    def __init__(self, *, wait: bool = True, timeout: float = 300.0) -> None:
+        self.wait = wait
+        self.timeout = timeout
+
+    async def acquire(self) -> bool:
+        """Returns whether this process was elected to sync, without waiting for the elected process."""
+        return True
+
+    async def publish(self, results: List[SyncResult]) -> None:
+        """Called by the elected process after a successful sync, with its results."""
+
+    async def release(self) -> None:
+        """Called by the elected process once it finished syncing, whether it succeeded or not."""
+
+    async def wait_for_results(self) -> Optional[List[SyncResult]]:
+        """Waits for the elected process and returns its results, or ``None`` if it failed or they are unknown."""
+        return None
+
+
+class CallbackCoordinator(SyncCoordinator):
+    """Elects the processes for which ``is_leader`` returns ``True``, such as the process running shard 0.
+
+    The other processes cannot see the results, so they skip the sync.
+    """
+
+    def __init__(self, is_leader: Callable[[], Awaitable[bool]]) -> None:
+        super().__init__(wait=False)
+        self.is_leader = is_leader
+
+    async def acquire(self) -> bool:
+        return await self.is_leader()
+
+
+class FileLockCoordinator(SyncCoordinator):
+    """Elects the process that creates the lock file at ``path``, for processes sharing a filesystem.
+
+    The results are written next to it, at ``path`` + ``.results``. A lock file older than
+    ``stale_after`` seconds is assumed to be left behind by a crashed process and taken over.
+    """
+
+    def __init__(
+        self,
+        path: str = ".lazy_slash_sync.lock",
+        *,
+        stale_after: float = 600.0,
+        poll_interval: float = 0.25,
+        wait: bool = True,
+        timeout: float = 300.0,
+    ) -> None:
+        super().__init__(wait=wait, timeout=timeout)
+        self.path = path
+        self.results_path = f"{path}.results"
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+
+        # Identifies one sync, so results of an earlier one are never mistaken for it
+        self._token: Optional[str] = None
+
+    def _read(self, path: str) -> Optional[Any]:
+        try:
+            with open(path) as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None  # missing, or still being written
+
+    def _create_lock(self) -> bool:
+        token = uuid.uuid4().hex
+        try:
+            fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+
+        with os.fdopen(fd, "w") as lock:
+            json.dump({"token": token, "pid": os.getpid()}, lock)
+
+        self._token = token
+        return True
+
+    async def acquire(self) -> bool:
+        if self._create_lock():
+            return True
+
+        try:
+            stale = time.time() - os.path.getmtime(self.path) > self.stale_after
+        except FileNotFoundError:
+            stale = True  # released in between
+
+        if stale:
+            _log.warning("Taking over the command sync lock at %s", self.path)
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+            if self._create_lock():
+                return True
+
+        lock = self._read(self.path)
+        self._token = lock and lock.get("token")
+        return False
+
+    async def publish(self, results: List[SyncResult]) -> None:
+        temp_path = f"{self.results_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"token": self._token, "results": _dump_results(results)}, file)
+
+        os.replace(temp_path, self.results_path)
+
+    async def release(self) -> None:
+        lock = self._read(self.path)
+        if lock is not None and lock.get("token") == self._token:
+            os.remove(self.path)
+
+    async def wait_for_results(self) -> Optional[List[SyncResult]]:
+        while True:
+            published = self._read(self.results_path)
+            if published is not None and published.get("token") == self._token:
+                return _load_results(published["results"])
+
+            lock = self._read(self.path)
+            if not os.path.exists(self.path) or (lock is not None and lock.get("token") != self._token):
+                # Released without publishing, unless the results were written just before
+                published = self._read(self.results_path)
+                if published is not None and published.get("token") == self._token:
+                    return _load_results(published["results"])
+                return None
+
+            await asyncio.sleep(self.poll_interval)
+
+
+class SocketCoordinator(SyncCoordinator):
+    """Elects the process that manages to listen on ``host``:``port``, for processes on the same machine.
+
+    The other processes connect to it and are sent the results once it is done. Unlike a lock file,
+    nothing is left behind if the elected process crashes. A process starting after the elected one
+    finished is elected again, so use ``sync="manifest"`` or ``sync="remote"`` to skip the upload then.
+    """
+
+    def __init__(self, port: int, host: str = "127.0.0.1", *, wait: bool = True, timeout: float = 300.0) -> None:
+        super().__init__(wait=wait, timeout=timeout)
+        self.host = host
+        self.port = port
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._published: Optional[asyncio.Future[Optional[bytes]]] = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        assert self._published is not None
+        try:
+            published = await self._published
+            writer.write(published or b"null\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def acquire(self) -> bool:
+        self._published = asyncio.get_running_loop().create_future()
+        try:
+            self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        except OSError:
+            return False  # already listened on by the elected process
+
+        return True
+
+    async def publish(self, results: List[SyncResult]) -> None:
+        assert self._published is not None
+        self._published.set_result(json.dumps(_dump_results(results)).encode() + b"\n")
+
+    async def release(self) -> None:
+        assert self._published is not None and self._server is not None
+        if not self._published.done():
+            self._published.set_result(None)
+
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def wait_for_results(self) -> Optional[List[SyncResult]]:
+        try:
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+        except OSError:
+            return None  # the elected process already finished
+
+        try:
+            data = json.loads(await reader.readline() or b"null")
+        finally:
+            writer.close()
+
+        return _load_results(data) if data is not None else None
+
+
+async def run_coordinated(
+    coordinator: SyncCoordinator, sync: Callable[[], Awaitable[List[SyncResult]]]
+) -> List[SyncResult]:
+    """Calls ``sync`` if this process is elected by ``coordinator``, otherwise returns the elected process' results.
+
+    If the elected process fails, a waiting process tries to take over. An empty list is
+    returned if the sync was skipped, or the results did not arrive within the coordinator's timeout.
+    """
+
+    deadline = time.perf_counter() + coordinator.timeout
+    while True:
+        if await coordinator.acquire():
+            try:
+                results = await sync()
+                await coordinator.publish(results)
+                return results
+            finally:
+                await coordinator.release()
+
+        if not coordinator.wait:
+            _log.info("Skipping the command sync, another process was elected to sync")
+            return []
+
+        remaining = deadline - time.perf_counter()
+        try:
+            results = await asyncio.wait_for(coordinator.wait_for_results(), timeout=max(remaining, 0))
+        except asyncio.TimeoutError:
+            _log.warning("Gave up waiting for the command sync of another process after %.0fs", coordinator.timeout)
+            return []
+
+        if results is not None:
+            _log.info("Another process synced the commands of %s scope(s)", len(results))
+            return results
+
+        _log.warning("The process syncing commands failed, trying to take over")
@@ -1,8 +1,15 @@
-from typing import Optional
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 import discord
 from discord.ext import commands
 
+if TYPE_CHECKING:
+    from .pools import WorkerPool
+    from .sync import SyncResult
+    from .validation import Violation
+
 
 class ApplicationCommandRegistrationError(discord.ClientException):
     """An exception raised when a command cannot be converted to an
@@ -19,3 +26,75 @@ class ApplicationCommandRegistrationError(discord.ClientException):
     def __init__(self, command: commands.Command, msg: Optional[str] = None) -> None:
         self.command = command
         super().__init__(msg or f"{command.qualified_name} failed to converted to an application command.")
+
+
+class CommandSyncError(discord.ClientException):
+    """An exception raised when uploading the commands of one or more scopes failed.
+
+    This inherits from :exc:`discord.ClientException`
+
+    Attributes
+    ----------
+    results: List[:class:`SyncResult`]
+        The scopes that were synced successfully.
+    failures: Dict[Optional[:class:`int`], :class:`BaseException`]
+        The exception raised for each failed scope, keyed by guild ID or ``None`` for global.
+    """
+
+    def __init__(self, results: List[SyncResult], failures: Dict[Optional[int], BaseException]) -> None:
+        self.results = results
+        self.failures = failures
+
+        scopes = ", ".join("global" if guild_id is None else str(guild_id) for guild_id in failures)
+        super().__init__(f"Failed to sync the commands of {len(failures)} scope(s): {scopes}")
+
+
+class CommandValidationError(discord.ClientException):
+    """An exception raised before uploading when commands break Discord's limits, or could not be converted.
+
+    This inherits from :exc:`discord.ClientException`
+
+    Attributes
+    ----------
+    violations: List[:class:`Violation`]
+        Every limit broken, with the command it was broken by.
+    """
+
+    def __init__(self, violations: List[Violation]) -> None:
+        self.violations = violations
+
+        details = "\n".join(f"  {violation}" for violation in violations)
+        super().__init__(f"{len(violations)} command validation error(s):\n{details}")
+
+
+class PoolSaturated(commands.CommandError):
+    """An exception raised when a command is offloaded to a :class:`WorkerPool` that is full.
+
+    This inherits from :exc:`commands.CommandError`, so is handled by ``on_command_error``.
+
+    Attributes
+    ----------
+    pool: :class:`WorkerPool`
+        The pool that rejected the command.
+    """
+
+    def __init__(self, pool: WorkerPool) -> None:
+        self.pool = pool
+        super().__init__(f"The {pool.name} worker pool is full, try again later.")
+
+
+class InFlightLimitReached(commands.CommandError):
+    """An exception raised when a slash command arrives while ``SlashBot.max_in_flight`` are already being processed.
+
+    This inherits from :exc:`commands.CommandError`, but is dispatched to ``on_slash_command_rejected``
+    as no context is created for the interaction.
+
+    Attributes
+    ----------
+    limit: :class:`int`
+        The most slash commands processed at once.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        super().__init__(f"Already processing {limit} slash commands, try again later.")
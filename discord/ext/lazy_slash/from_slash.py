@@ -1,55 +1,91 @@
 from __future__ import annotations
 
-import functools
 import inspect
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Union, cast
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Sequence, Tuple, Type, Union, cast
 
 import discord
 from discord.ext import commands
+from discord.ext.commands.flags import convert_flag
+from discord.ext.commands.view import StringView
 from discord.ext.commands.view import _quotes as supported_quotes
 
+from . import errors
+from .admission import check_admission
+from .autocomplete import dispatch_autocomplete
+from .context_menus import CHAT_INPUT, USER_COMMAND
+from .context import AutoDefer
+from .index import get_slash_command
+from .options import get_command_options
+from .plans import BIND_FLAGS, BIND_VIEW, ParameterPlan, get_plan
+from .resolved import CHANNEL, ENTITY_OPTION_TYPES, ROLE, USER, InteractionChannel, ResolvedData
+from .routing import reply_error, tree_has_command
+from .tracing import NULL_TRACE, Trace, get_trace
+
 if TYPE_CHECKING:
     from discord.types.interactions import ApplicationCommandInteractionData, ApplicationCommandInteractionDataOption
 
+# The prefix of slash invocations, as typed by the user
+SLASH_PREFIX = "/"
+
 
 class _FakeSlashMessage(discord.PartialMessage):
+    __slots__ = (
+        "author",
+        "content",
+        "_resolved",
+        "_slash_command",
+        "_slash_options",
+        "_cs_mentions",
+        "_cs_role_mentions",
+        "_cs_channel_mentions",
+        "_cs_raw_mentions",
+        "_cs_raw_role_mentions",
+        "_cs_raw_channel_mentions",
+        "_cs_clean_content",
+    )
+
     activity = application = edited_at = reference = webhook_id = None
     attachments = components = reactions = stickers = []
     tts = False
 
     raw_mentions = discord.Message.raw_mentions
     clean_content = discord.Message.clean_content
-    channel_mentions = discord.Message.channel_mentions
     raw_role_mentions = discord.Message.raw_role_mentions
     raw_channel_mentions = discord.Message.raw_channel_mentions
 
     author: Union[discord.User, discord.Member]
+    content: str
 
     @classmethod
     def from_interaction(
-        cls, interaction: discord.Interaction, channel: Union[discord.TextChannel, discord.DMChannel, discord.Thread]
+        cls,
+        interaction: discord.Interaction,
+        channel: Union[discord.TextChannel, discord.DMChannel, discord.Thread],
+        resolved: ResolvedData,
     ):
         self = cls(channel=channel, id=interaction.id)
         assert interaction.user is not None
         self.author = interaction.user
+        self._resolved = resolved
+        # Set for direct binding, kept on the message so the context needs no attributes of its own
+        self._slash_command = None
+        self._slash_options = None
 
         return self
 
-    @functools.cached_property
-    def mentions(self) -> List[Union[discord.Member, discord.User]]:
-        client = self._state._get_client()
-        if self.guild:
-            ensure_user = lambda id: self.guild.get_member(id) or client.get_user(id)  # type: ignore
-        else:
-            ensure_user = client.get_user
+    # Mentions are the users, roles and channels given as options, which Discord resolved for us
 
-        return discord.utils._unique(filter(None, map(ensure_user, self.raw_mentions)))  # type: ignore
+    @discord.utils.cached_slot_property("_cs_mentions")
+    def mentions(self) -> List[Union[discord.Member, discord.User]]:
+        return self._resolved.all(USER)
 
-    @functools.cached_property
+    @discord.utils.cached_slot_property("_cs_role_mentions")
     def role_mentions(self) -> List[discord.Role]:
-        if self.guild is None:
-            return []
-        return discord.utils._unique(filter(None, map(self.guild.get_role, self.raw_role_mentions)))  # type: ignore
+        return self._resolved.all(ROLE)
+
+    @discord.utils.cached_slot_property("_cs_channel_mentions")
+    def channel_mentions(self) -> List[Union[discord.abc.GuildChannel, discord.Thread]]:
+        return self._resolved.all(CHANNEL)
 
 
 def _quote_string_safe(string: str) -> str:
@@ -60,50 +96,46 @@ def _quote_string_safe(string: str) -> str:
     raise commands.UnexpectedQuoteError(string)
 
 
-def _unwrap_slash_groups(
+def _unwrap_slash_options(
     data: ApplicationCommandInteractionData,
-) -> Tuple[str, Dict[str, ApplicationCommandInteractionDataOption]]:
-    command_name = data["name"]
-    command_options: Any = data.get("options") or []
-    while True:
-        try:
-            option = next(o for o in command_options if o["type"] in {1, 2})
-        except StopIteration:
-            return command_name, {o["name"]: o for o in command_options}
-        else:
-            command_name += f' {option["name"]}'
-            command_options = option.get("options") or []
+) -> Tuple[Tuple[str, ...], Sequence[ApplicationCommandInteractionDataOption]]:
+    command_path: Tuple[str, ...] = (data["name"],)
+    command_options: Any = data.get("options") or ()
 
+    # A subcommand or subcommand group is always the only option at its level
+    while command_options and command_options[0]["type"] in (1, 2):
+        command_path += (command_options[0]["name"],)
+        command_options = command_options[0].get("options") or ()
 
-async def process_slash_commands(bot: commands.Bot, interaction: discord.Interaction):
-    if interaction.type != discord.InteractionType.application_command:
-        return
+    return command_path, command_options
 
-    if TYPE_CHECKING:
-        interaction.data = cast(ApplicationCommandInteractionData, interaction.data)
 
-    command_name, command_options = _unwrap_slash_groups(interaction.data)
-    command = bot.get_command(command_name)
-    if command is None:
-        raise commands.CommandNotFound(f'Command "{command_name}" is not found')
+def _unwrap_slash_groups(
+    data: ApplicationCommandInteractionData,
+) -> Tuple[Tuple[str, ...], Dict[str, ApplicationCommandInteractionDataOption]]:
+    command_path, command_options = _unwrap_slash_options(data)
+    return command_path, {o["name"]: o for o in command_options}
 
-    # Ensure the interaction channel is usable
-    channel = interaction.channel
-    if channel is None or isinstance(channel, discord.PartialMessageable):
-        if interaction.guild is None:
-            assert interaction.user is not None
-            channel = await interaction.user.create_dm()
-        elif interaction.channel_id is not None:
-            channel = await interaction.guild.fetch_channel(interaction.channel_id)
-        else:
-            return  # cannot do anything without stable channel
 
-    # Make our fake message so we can pass it to ext.commands
-    message: discord.Message = _FakeSlashMessage.from_interaction(interaction, channel)  # type: ignore
-    message.content = command_name
+def _find_option(
+    command_options: Sequence[ApplicationCommandInteractionDataOption], name: str
+) -> Optional[ApplicationCommandInteractionDataOption]:
+    # Scanning the few options sent is cheaper than building a dict of them for every invoke
+    for option in command_options:
+        if option["name"] == name:
+            return option
+
+    return None
+
+
+def _build_message_content(
+    command: commands.Command, command_name: str, command_options: Dict[str, ApplicationCommandInteractionDataOption]
+) -> Tuple[str, Optional[FrozenSet[str]]]:
+    content = [command_name]
 
     # Add arguments to fake message content, in the right order
-    ignored_params = []
+    ignored_params = set()
+    metadata = get_command_options(command)
     for name, param in command.clean_params.items():
         if inspect.isclass(param.annotation) and issubclass(param.annotation, commands.FlagConverter):
             for name, flag in param.annotation.get_flags().items():
@@ -115,34 +147,369 @@ async def process_slash_commands(bot: commands.Bot, interaction: discord.Interac
                 else:
                     prefix = param.annotation.__commands_flag_prefix__
                     delimiter = param.annotation.__commands_flag_delimiter__
-                    message.content += f" {prefix}{name}{delimiter}{option['value']}"  # type: ignore
+                    content.append(f"{prefix}{name}{delimiter}{option['value']}")  # type: ignore
             continue
 
-        option = command_options.get(name)
+        option = command_options.get(metadata.option_name(name))
         if option is None:
             if param.default is param.empty and not command._is_typing_optional(param.annotation):
                 raise commands.MissingRequiredArgument(param)
             elif param.annotation is None or param.annotation == str:
-                message.content += f" { _quote_string_safe('')}"
+                content.append(_quote_string_safe(""))
             else:
-                ignored_params.append(param)  # type: ignore
+                ignored_params.add(name)
         elif (
             option["type"] == 3
             and not isinstance(param.annotation, commands.Greedy)
             and param.kind in {param.POSITIONAL_OR_KEYWORD, param.POSITIONAL_ONLY}
         ):
             # String with space in without "consume rest"
-            message.content += f" {_quote_string_safe(option['value'])}"
+            content.append(_quote_string_safe(option["value"]))  # type: ignore
+        else:
+            content.append(str(option.get("value", "")))
+
+    return " ".join(content), frozenset(ignored_params) if ignored_params else None
+
+
+def _build_context(
+    bot: commands.Bot, message: discord.Message, command: commands.Command, cls: Type[commands.Context]
+) -> commands.Context:
+    # What bot.get_context does, without resolving the prefix only to strip it off again
+    view = StringView(message.content)
+    view.skip_string(SLASH_PREFIX)
+    invoked_with = view.get_word()
+    return cls(
+        message=message,
+        bot=bot,
+        view=view,
+        prefix=SLASH_PREFIX,
+        command=command.root_parent or command,
+        invoked_with=invoked_with,
+    )
+
+
+def _invocation_content(prefix: str, command: commands.Command) -> str:
+    # The message content is always the same for direct binding, so reuse the string.
+    # Cached on the command rather than globally, so removed commands are not kept alive.
+    cache: Optional[Dict[str, str]] = getattr(command, "_slash_invocation", None)
+    if cache is None or len(cache) >= 8:  # only get_prefix fallbacks see more than a couple of prefixes
+        cache = command._slash_invocation = {}  # type: ignore
+
+    content = cache.get(prefix)
+    if content is None:
+        content = cache[prefix] = f"{prefix}{command.qualified_name}"
+
+    return content
+
+
+async def _convert_with_view(command: commands.Command, ctx: commands.Context, param: inspect.Parameter, value: str):
+    # Greedy and *args need the value split into words, so let ext.commands do that on a view of just this option
+    view = ctx.view
+    ctx.view = StringView(value)
+    try:
+        if param.kind != param.VAR_POSITIONAL:
+            return await command.transform(ctx, param)
+
+        values = []
+        while not ctx.view.eof:
+            try:
+                values.append(await command.transform(ctx, param))
+            except RuntimeError:
+                break
+        return values
+    finally:
+        ctx.view = view
+
+
+async def _bind_flags(
+    ctx: commands.Context, plan: ParameterPlan, command_options: Sequence[ApplicationCommandInteractionDataOption]
+) -> commands.FlagConverter:
+    converter = plan.param.annotation
+    flags = converter.__new__(converter)
+    for flag_plan in plan.flags:
+        flag = flag_plan.flag
+        option = _find_option(command_options, flag_plan.option_name)
+        if option is None:
+            if flag.required:
+                raise commands.MissingRequiredFlag(flag)
+
+            default = flag.default
+            if callable(default):
+                default = await discord.utils.maybe_coroutine(default, ctx)
+
+            setattr(flags, flag.attribute, default)
+            continue
+
+        value = option.get("value")
+        if flag_plan.option_type == option["type"]:
+            value = flag_plan.native_type(value)  # type: ignore
+        else:
+            value = await convert_flag(ctx, str(value), flag)
+
+        if flag.max_args != 1:
+            value = [value]
+            if flag.cast_to_dict:
+                value = dict(value)
+
+        setattr(flags, flag.attribute, value)
+
+    return flags
+
+
+async def _convert_option(
+    command: commands.Command,
+    ctx: commands.Context,
+    plan: ParameterPlan,
+    option: ApplicationCommandInteractionDataOption,
+    resolved: Optional[ResolvedData],
+) -> Any:
+    param = plan.param
+    value = option.get("value")
+
+    if plan.entity_types and resolved is not None and option["type"] in ENTITY_OPTION_TYPES:
+        entity = resolved.find(option["type"], value, plan.entity_types)
+        if entity is not None:
+            return [entity] if plan.variadic else entity
+
+    if plan.strategy == BIND_VIEW:
+        return await _convert_with_view(command, ctx, param, str(value))
+
+    if plan.transform_type == option["type"]:
+        return plan.transform(value)  # type: ignore
+
+    if plan.option_type == option["type"]:
+        return plan.native_type(value)  # type: ignore
+
+    ctx.current_argument = argument = str(value)  # type: ignore
+    converter = param.annotation if param.annotation is not param.empty else str
+    return await commands.run_converters(ctx, converter, argument, param)  # type: ignore
+
+
+async def bind_arguments(
+    command: commands.Command,
+    ctx: commands.Context,
+    command_options: Sequence[ApplicationCommandInteractionDataOption],
+    resolved: Optional[ResolvedData] = None,
+) -> None:
+    """Fills ``ctx.args`` and ``ctx.kwargs`` directly from the slash command options.
+
+    This replaces :meth:`.Command._parse_arguments` for slash invokes, so the
+    already typed option values never have to round-trip through message content.
+    Users, members, roles and channels are taken from ``resolved`` when possible.
+    """
+
+    ctx.args = args = [ctx] if command.cog is None else [command.cog, ctx]
+    ctx.kwargs = {}
+
+    for plan in get_plan(command).parameters:
+        param = plan.param
+        ctx.current_parameter = param  # type: ignore
+
+        if plan.strategy == BIND_FLAGS:
+            value = await _bind_flags(ctx, plan, command_options)
+        else:
+            option = _find_option(command_options, plan.option_name)
+            if option is None:
+                if plan.required:
+                    raise commands.MissingRequiredArgument(param)  # type: ignore
+                value = () if plan.variadic else plan.default
+            else:
+                value = await _convert_option(command, ctx, plan, option, resolved)
+
+        if plan.keyword:
+            ctx.kwargs[plan.name] = value
+        elif plan.variadic:
+            args.extend(value)
+        else:
+            args.append(value)
+
+
+def _context_menu_targets(
+    interaction: discord.Interaction, command_type: int, channel: Any, resolved: ResolvedData
+) -> Tuple[Any, ...]:
+    target_id = int(interaction.data["target_id"])  # type: ignore
+    if command_type == USER_COMMAND:
+        return resolved.get(USER, target_id)  # the member first, if used in a guild
+
+    message = resolved.message(target_id, channel)
+    return (message,) if message is not None else ()
+
+
+async def bind_target(command: commands.Command, ctx: commands.Context, targets: Tuple[Any, ...]) -> None:
+    """Fills ``ctx.args`` and ``ctx.kwargs`` for a context menu command.
+
+    The first parameter gets the user or message the menu was used on, preferring
+    whichever of ``targets`` matches its annotation. The others get their defaults.
+    """
+
+    ctx.args = args = [ctx] if command.cog is None else [command.cog, ctx]
+    ctx.kwargs = {}
+
+    for index, plan in enumerate(get_plan(command).parameters):
+        ctx.current_parameter = plan.param  # type: ignore
+        if index == 0:
+            value = next((target for target in targets if isinstance(target, plan.entity_types)), targets[0])
+            if plan.variadic:
+                value = (value,)
+        elif plan.required:
+            raise commands.MissingRequiredArgument(plan.param)  # type: ignore
+        else:
+            value = () if plan.variadic else plan.default
+
+        if plan.keyword:
+            ctx.kwargs[plan.name] = value
+        elif plan.variadic:
+            args.extend(value)
         else:
-            message.content += f' {option.get("value", "")}'
+            args.append(value)
+
+
+async def process_slash_commands(bot: commands.Bot, interaction: discord.Interaction):
+    if interaction.type == discord.InteractionType.autocomplete:
+        command_path, command_options = _unwrap_slash_groups(interaction.data)  # type: ignore
+        return await dispatch_autocomplete(bot, interaction, command_path, command_options)
+
+    if interaction.type != discord.InteractionType.application_command:
+        return
+
+    trace = get_trace(bot, interaction)
+    in_flight: int = getattr(bot, "_slash_in_flight", 0)
+    max_in_flight: Optional[int] = getattr(bot, "max_in_flight", None)
+    if max_in_flight is not None and in_flight >= max_in_flight:
+        # Shed load before any work is done, so commands already running keep their latency
+        bot.dispatch("slash_command_rejected", interaction, None, errors.InFlightLimitReached(max_in_flight))
+        trace.finish("rejected")
+        return await reply_error(bot, interaction, "overloaded")
 
-    prefix = await bot.get_prefix(message)
-    if isinstance(prefix, list):
-        prefix = prefix[0]
+    auto_defer = None
+    auto_defer_delay: Optional[float] = getattr(bot, "auto_defer", None)
+    if auto_defer_delay is not None:
+        ephemeral = getattr(bot, "auto_defer_ephemeral", False)
+        auto_defer = AutoDefer(interaction, auto_defer_delay, ephemeral=ephemeral, trace=trace)
+        auto_defer.start()
 
-    message.content = f"{prefix}{message.content}"
+    bot._slash_in_flight = in_flight + 1  # type: ignore
+    try:
+        outcome = await _process_application_command(bot, interaction, trace, auto_defer)
+    except Exception:
+        trace.finish("error")
+        await reply_error(bot, interaction, "error")
+        raise
+    except BaseException:
+        trace.finish("error")
+        raise
+    finally:
+        bot._slash_in_flight -= 1  # type: ignore
+        if auto_defer is not None:
+            auto_defer.cancel()
 
-    ctx = await bot.get_context(message)
-    ctx._ignored_params = ignored_params  # type: ignore
+    if outcome is None:
+        return  # an app_commands command, processed by the tree
+
+    trace.finish(outcome)
+    if outcome in ("not_found", "no_channel"):
+        await reply_error(bot, interaction, outcome)
+
+
+async def _process_application_command(
+    bot: commands.Bot, interaction: discord.Interaction, trace: Trace, auto_defer: Optional[AutoDefer]
+) -> Optional[str]:
+    if TYPE_CHECKING:
+        interaction.data = cast(ApplicationCommandInteractionData, interaction.data)
+
+    command_type = interaction.data.get("type", CHAT_INPUT)
+    command_path, command_options = _unwrap_slash_options(interaction.data)
+    trace.command_path = command_path
+    command = get_slash_command(bot, command_path, command_type)
+    if command is None:
+        tree = getattr(bot, "tree", None)
+        if tree is not None and tree_has_command(tree, interaction.data):
+            return None
+
+        # Usually a command removed from the bot but still registered with Discord, so not worth an exception
+        bot.dispatch("slash_command_not_found", interaction, command_path)
+        return "not_found"
+
+    if getattr(bot, "early_admission", False):
+        try:
+            check_admission(command, interaction)
+        except commands.CommandOnCooldown as error:
+            bot.dispatch("slash_command_rejected", interaction, command, error)
+            await reply_error(bot, interaction, "cooldown", retry_after=error.retry_after)
+            return "rejected"
+        except commands.MaxConcurrencyReached as error:
+            bot.dispatch("slash_command_rejected", interaction, command, error)
+            await reply_error(bot, interaction, "max_concurrency")
+            return "rejected"
+
+    trace.mark("unwrap")
+
+    # Ensure the interaction channel is usable, without fetching it
+    channel = interaction.channel
+    if channel is None or isinstance(channel, discord.PartialMessageable):
+        if interaction.channel_id is not None:
+            channel = InteractionChannel(interaction, getattr(channel, "type", None))
+        elif interaction.guild is None:
+            assert interaction.user is not None
+            channel = await interaction.user.create_dm()
+        else:
+            return "no_channel"  # cannot do anything without stable channel
+
+    trace.mark("channel")
+
+    # Make our fake message so we can pass it to ext.commands
+    resolved = ResolvedData(interaction)
+    message: discord.Message = _FakeSlashMessage.from_interaction(interaction, channel, resolved)  # type: ignore
+    trace.mark("message")
+
+    targets: Tuple[Any, ...] = ()
+    if command_type != CHAT_INPUT:
+        targets = _context_menu_targets(interaction, command_type, channel, resolved)
+        if not targets:
+            raise commands.BadArgument("The target of the context menu was not sent with the interaction.")
+
+    # Context menus only pass their target, so there is never any content to parse
+    direct_binding = bool(targets) or getattr(bot, "direct_binding", True)
+    if direct_binding:
+        # Arguments are bound straight from the options, see patches.parse_arguments
+        content, ignored_params = _invocation_content("", command), None
+    else:
+        options_by_name = {o["name"]: o for o in command_options}
+        content, ignored_params = _build_message_content(command, command.qualified_name, options_by_name)
+
+    context_class: Optional[Type[commands.Context]] = getattr(bot, "slash_context_class", None)
+    if not getattr(type(bot).get_context, "__lazy_slash_direct__", False):
+        context_class = None  # get_context is overridden, it may use its own class or set attributes
+    if context_class is not None:
+        # The command is already known, so there is no prefix to resolve
+        prefix = SLASH_PREFIX
+    else:
+        message.content = content
+        prefix = await bot.get_prefix(message)
+        if isinstance(prefix, list):
+            prefix = prefix[0]
+
+    message.content = _invocation_content(prefix, command) if direct_binding else f"{prefix}{content}"
+    if context_class is not None:
+        ctx = _build_context(bot, message, command, context_class)
+    else:
+        ctx = await bot.get_context(message)
+
+    trace.mark("context")
     ctx.interaction = interaction  # type: ignore
+    if trace is not NULL_TRACE:
+        ctx._slash_trace = trace  # type: ignore
+    if auto_defer is not None:
+        ctx._auto_defer = auto_defer  # type: ignore
+
+    if targets:
+        ctx._slash_targets = targets  # type: ignore
+    elif direct_binding:
+        message._slash_command = command  # type: ignore
+        message._slash_options = command_options  # type: ignore
+    elif ignored_params is not None:
+        ctx._ignored_params = ignored_params  # type: ignore
+
     await bot.invoke(ctx)
+    trace.mark("invoke")
+    return "failed" if ctx.command_failed else "completed"
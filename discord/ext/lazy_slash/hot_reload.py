@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from discord.ext import commands
+
+from .context_menus import CHAT_INPUT
+from .sync import load_manifest, payload_hash, save_manifest, scope_key
+from .to_slash import get_application_command
+from .validation import MAX_COMMANDS, MAX_CONTEXT_MENUS, validate_command
+
+if TYPE_CHECKING:
+    from . import SlashBot
+
+_log = logging.getLogger(__name__)
+
+CommandKey = Tuple[int, str]
+
+# Every DeltaSync, so a change to a group deep in a bot's tree can find the bot it belongs to
+_syncs: weakref.WeakSet[DeltaSync] = weakref.WeakSet()
+
+
+def _command_key(payload: Dict[str, Any]) -> CommandKey:
+    # Names are only unique within each application command type
+    return payload.get("type", CHAT_INPUT), payload["name"]
+
+
+class DeltaSync:
+    """Re-registers the commands that changed as commands are added to and removed from the bot.
+
+    Changes are debounced by ``delay`` seconds, so loading or reloading an extension is one sync.
+    Only commands without a cached payload are converted again, then each scope is diffed against
+    the commands registered with Discord, which are fetched once and kept up to date afterwards.
+    Up to ``max_single_requests`` changes per scope are made with single command create, edit and
+    delete requests, more with one bulk upload.
+    """
+
+    def __init__(self, bot: SlashBot, *, delay: float = 2.0, max_single_requests: int = 5) -> None:
+        self.bot = bot
+        self.delay = delay
+        self.max_single_requests = max_single_requests
+        self.enabled = False
+
+        self._registered: Dict[Optional[int], Dict[CommandKey, Dict[str, Any]]] = {}
+        self._last_change = 0.0
+        self._task: Optional[asyncio.Task] = None
+        _syncs.add(self)
+
+    def schedule(self) -> None:
+        """Syncs the changed commands once no command was added or removed for :attr:`delay` seconds."""
+
+        if not self.enabled:
+            return
+
+        loop = asyncio.get_running_loop()
+        self._last_change = loop.time()
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._debounce())
+
+    async def _debounce(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            remaining = self._last_change + self.delay - loop.time()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+
+            started = loop.time()
+            try:
+                await self.flush()
+            except Exception:
+                _log.exception("Failed to re-register changed commands")
+
+            if self._last_change <= started:
+                return  # nothing changed while syncing
+
+    def _local_payloads(self) -> Dict[CommandKey, Dict[str, Any]]:
+        payloads: Dict[CommandKey, Dict[str, Any]] = {}
+        type_counts: Counter[int] = Counter()
+        for command in sorted(self.bot.commands, key=lambda c: c.name):
+            if command.hidden:
+                continue
+
+            try:
+                payload = get_application_command(command)
+            except Exception as error:
+                _log.warning("Skipping command %s that failed to convert: %s", command.qualified_name, error)
+                continue
+
+            violations = validate_command(command, payload)
+            for violation in violations:
+                _log.warning("Skipping invalid command %s", violation)
+
+            if violations:
+                continue
+
+            key = _command_key(payload)
+            if key in payloads:
+                _log.warning("Skipping command %s, another command is named %r", command.qualified_name, key[1])
+                continue
+
+            limit = MAX_COMMANDS if key[0] == CHAT_INPUT else MAX_CONTEXT_MENUS
+            type_counts[key[0]] += 1
+            if type_counts[key[0]] > limit:
+                _log.warning("Skipping command %s, it is over the limit of %s commands", command.qualified_name, limit)
+            else:
+                payloads[key] = payload
+
+        return payloads
+
+    async def flush(self) -> None:
+        """Syncs the changed commands of every scope now."""
+
+        bot = self.bot
+        application_id = bot.application_id or (await bot.application_info()).id
+        local = self._local_payloads()
+
+        # Guild mode never touches the global commands, so only the guilds have to be kept up to date
+        guild_ids: List[Optional[int]] = [None] if bot.slash_command_guilds is None else [*bot.slash_command_guilds]
+        semaphore = asyncio.Semaphore(bot.upload_concurrency)
+
+        async def sync_scope(guild_id: Optional[int]) -> None:
+            async with semaphore:
+                try:
+                    await self._sync_scope(application_id, guild_id, local)
+                except Exception:
+                    # What is registered is unknown after a partial sync, so it is fetched again next time
+                    self._registered.pop(guild_id, None)
+                    raise
+
+        outcomes = await asyncio.gather(*(sync_scope(guild_id) for guild_id in guild_ids), return_exceptions=True)
+
+        synced = []
+        for guild_id, outcome in zip(guild_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                scope = "global" if guild_id is None else f"guild {guild_id}"
+                _log.error("Failed to re-register commands for %s", scope, exc_info=outcome)
+            else:
+                synced.append(guild_id)
+
+        if bot.sync == "manifest" and synced:
+            # Keep the manifest in step, so the next startup does not upload the same commands again
+            hashes = load_manifest(bot.manifest_path)
+            scope_hash = payload_hash(local.values())
+            hashes.update({scope_key(application_id, guild_id): scope_hash for guild_id in synced})
+            save_manifest(bot.manifest_path, hashes)
+
+    async def _fetch_registered(self, application_id: int, guild_id: Optional[int]) -> Dict[CommandKey, Dict[str, Any]]:
+        registered = self._registered.get(guild_id)
+        if registered is None:
+            http = self.bot.http
+            if guild_id is None:
+                fetched = await http.get_global_commands(application_id)
+            else:
+                fetched = await http.get_guild_commands(application_id, guild_id)
+
+            registered = self._registered[guild_id] = {_command_key(c): c for c in fetched}  # type: ignore
+
+        return registered
+
+    async def _sync_scope(
+        self, application_id: int, guild_id: Optional[int], local: Dict[CommandKey, Dict[str, Any]]
+    ) -> None:
+        http = self.bot.http
+        registered = await self._fetch_registered(application_id, guild_id)
+
+        deleted = [key for key in registered if key not in local]
+        created = [key for key in local if key not in registered]
+        edited = [
+            key for key in local if key in registered and payload_hash([local[key]]) != payload_hash([registered[key]])
+        ]
+
+        changes = len(deleted) + len(created) + len(edited)
+        if changes == 0:
+            return
+
+        scope = "global" if guild_id is None else f"guild {guild_id}"
+        if changes > self.max_single_requests:
+            payload = list(local.values())
+            if guild_id is None:
+                data = await http.bulk_upsert_global_commands(application_id, payload=payload)
+            else:
+                data = await http.bulk_upsert_guild_commands(application_id, guild_id, payload=payload)
+
+            self._registered[guild_id] = {_command_key(c): c for c in data}  # type: ignore
+            _log.info("Uploaded %s commands for %s after %s changes", len(payload), scope, changes)
+            return
+
+        # Deleted first, to stay under the command limit when one is replaced
+        for key in deleted:
+            command_id = registered[key]["id"]
+            if guild_id is None:
+                await http.delete_global_command(application_id, command_id)
+            else:
+                await http.delete_guild_command(application_id, guild_id, command_id)
+            del registered[key]
+
+        for key in created:
+            if guild_id is None:
+                data = await http.upsert_global_command(application_id, local[key])  # type: ignore
+            else:
+                data = await http.upsert_guild_command(application_id, guild_id, local[key])
+            registered[key] = data  # type: ignore
+
+        for key in edited:
+            command_id = registered[key]["id"]
+            if guild_id is None:
+                data = await http.edit_global_command(application_id, command_id, local[key])
+            else:
+                data = await http.edit_guild_command(application_id, guild_id, command_id, local[key])
+            registered[key] = data  # type: ignore
+
+        _log.info(
+            "Re-registered commands for %s: %s created, %s edited, %s deleted",
+            scope,
+            len(created),
+            len(edited),
+            len(deleted),
+        )
+
+
+def schedule_changed(group: commands.GroupMixin) -> None:
+    """Schedules the sync of each bot ``group`` is part of, after a command was added to or removed from it,
+    or its callback was replaced.
+    """
+
+    if not _syncs:
+        return
+
+    root = (group.root_parent or group) if isinstance(group, commands.Command) else None
+    for sync in _syncs:
+        bot = sync.bot
+        if group is bot or (root is not None and bot.all_commands.get(root.name) is root):
+            sync.schedule()
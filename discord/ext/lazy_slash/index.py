@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+from discord.ext import commands
+
+from .context_menus import CHAT_INPUT, get_context_menu
+
+# Bumped by patches.py whenever a command is added to or removed from any bot or group
+_generation = 0
+
+
+def invalidate() -> None:
+    global _generation
+    _generation += 1
+
+
+class CommandIndex:
+    """Maps the (name, subgroup, subcommand) path sent in an interaction to the command it invokes.
+
+    Rebuilt on the next lookup after any command is added or removed, so dispatch
+    is a single dict lookup instead of joining and re-splitting the name.
+    """
+
+    __slots__ = ("generation", "commands", "context_menus")
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.generation = _generation
+        self.commands: Dict[Tuple[str, ...], commands.Command] = {}
+        self.context_menus: Dict[Tuple[int, str], commands.Command] = {}
+
+        for command in bot.walk_commands():
+            context_menu = get_context_menu(command)
+            if context_menu is None:
+                self.commands[tuple(command.qualified_name.split(" "))] = command
+            else:
+                self.context_menus[context_menu] = command
+
+
+def get_slash_command(bot: Any, path: Tuple[str, ...], command_type: int = CHAT_INPUT) -> Optional[commands.Command]:
+    """Returns the command invoked by the slash command ``path``, or the context menu ``path[0]``, or ``None``."""
+
+    index: Optional[CommandIndex] = getattr(bot, "_slash_index", None)
+    if index is None or index.generation != _generation:
+        index = bot._slash_index = CommandIndex(bot)
+
+    if command_type == CHAT_INPUT:
+        return index.commands.get(path)
+
+    return index.context_menus.get((command_type, path[0]))
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import discord
+from discord.ext import commands
+
+from .autocomplete import _to_choice
+
+
+class Option:  # type: ignore
+    """A special 'converter' to apply a description to slash command options.
+
+    For example in the following code:
+
+    .. code-block:: python3
+
+        @bot.command()
+        async def ban(ctx,
+            member: discord.Member, *,
+            reason: str = commands.Option('no reason', description='the reason to ban this member')
+        ):
+            await member.ban(reason=reason)
+
+    The description would be ``the reason to ban this member`` and the default would be ``no reason``
+
+    Attributes
+    ------------
+    default: Optional[Any]
+        The default for this option, overwrites Option during parsing.
+    description: Optional[:class:`str`]
+        The description for this option, is unpacked to :attr:`.Command.option_descriptions`
+    name: Optional[:class:`str`]
+        The name of the slash command option, if it should differ from the parameter name.
+    autocomplete: Optional[Callable[[:class:`discord.Interaction`, :class:`str`], Awaitable[List[Any]]]]
+        Called with the interaction and the current input to suggest choices as the user types,
+        is unpacked to :attr:`.Command.option_autocomplete`. The choices can be
+        :class:`discord.app_commands.Choice`, ``(name, value)`` tuples or plain values.
+    min_value: Optional[Union[:class:`int`, :class:`float`]]
+        The minimum value to allow, for number options.
+    max_value: Optional[Union[:class:`int`, :class:`float`]]
+        The maximum value to allow, for number options.
+    choices: Optional[List[Any]]
+        The only values to allow, in the same forms as autocomplete choices.
+    """
+
+    __slots__ = (
+        "default",
+        "description",
+        "name",
+        "autocomplete",
+        "min_value",
+        "max_value",
+        "choices",
+    )
+
+    def __init__(
+        self,
+        default: Any = inspect.Parameter.empty,
+        *,
+        description: Optional[str] = None,
+        name: Optional[str] = None,
+        autocomplete: Optional[Callable[[discord.Interaction, str], Awaitable[List[Any]]]] = None,
+        min_value: Optional[Union[int, float]] = None,
+        max_value: Optional[Union[int, float]] = None,
+        choices: Optional[List[Any]] = None,
+    ) -> None:
+        self.description = description
+        self.default = default
+        self.name = name
+        self.autocomplete = autocomplete
+        self.min_value = min_value
+        self.max_value = max_value
+        self.choices = choices
+
+    def __repr__(self) -> str:
+        # Snapshots fingerprint the callback's defaults, so this has to be stable between processes
+        return (
+            f"Option({self.default!r}, description={self.description!r}, name={self.name!r}, "
+            f"autocomplete={getattr(self.autocomplete, '__qualname__', None)!r}, "
+            f"min_value={self.min_value!r}, max_value={self.max_value!r}, choices={self.choices!r})"
+        )
+
+
+Option: Any
+
+
+class CommandOptions:
+    """The slash command metadata of a command's parameters, unpacked from their :class:`Option` defaults.
+
+    Built from the parameters ext.commands already parsed from the signature, the first time
+    the payload, invocation plan or parameters are needed, which also replaces each
+    :class:`Option` default with the default it wraps.
+
+    Attributes
+    -----------
+    names: Dict[:class:`str`, :class:`str`]
+        The option name of each renamed parameter.
+    descriptions: Dict[:class:`str`, :class:`str`]
+        The description of each option, by option name.
+    autocomplete: Dict[:class:`str`, Callable[[:class:`discord.Interaction`, :class:`str`], Awaitable[List[Any]]]]
+        The autocomplete provider of each option, by option name.
+    fields: Dict[:class:`str`, Dict[:class:`str`, Any]]
+        The ``min_value``, ``max_value`` and ``choices`` payload fields of each option, by option name.
+    """
+
+    __slots__ = ("names", "descriptions", "autocomplete", "fields")
+
+    def __init__(self, command: commands.Command) -> None:
+        self.names: Dict[str, str] = {}
+        self.descriptions: Dict[str, str] = {}
+        self.autocomplete: Dict[str, Callable[[discord.Interaction, str], Awaitable[List[Any]]]] = {}
+        self.fields: Dict[str, Dict[str, Any]] = {}
+
+        params = command.params
+        for name, param in list(params.items()):
+            option = param.default
+            # Set by commands.parameter(description=...) on newer versions of ext.commands
+            description = getattr(param, "description", None)
+
+            if isinstance(option, Option):  # type: ignore
+                params[name] = param.replace(default=option.default)
+                if option.name is not None:
+                    self.names[name] = option.name
+                    name = option.name
+
+                description = option.description or description
+                if option.autocomplete is not None:
+                    self.autocomplete[name] = option.autocomplete
+
+                fields: Dict[str, Any] = {}
+                if option.min_value is not None:
+                    fields["min_value"] = option.min_value
+                if option.max_value is not None:
+                    fields["max_value"] = option.max_value
+                if option.choices is not None:
+                    fields["choices"] = [_to_choice(choice).to_dict() for choice in option.choices]
+                if fields:
+                    self.fields[name] = fields
+
+            if description:
+                self.descriptions[name] = description
+
+    def option_name(self, name: str) -> str:
+        """Returns the slash command option name of the parameter ``name``."""
+        return self.names.get(name, name)
+
+
+def get_command_options(command: commands.Command) -> CommandOptions:
+    """Returns the cached :class:`CommandOptions` for ``command``, unpacking them on first use.
+
+    The cache is cleared whenever the command's callback is reassigned.
+    """
+
+    options: Optional[CommandOptions] = getattr(command, "_slash_metadata", None)
+    if options is None:
+        options = command._slash_metadata = CommandOptions(command)  # type: ignore
+
+    return options
@@ -1,88 +1,147 @@
 from __future__ import annotations
 
 import inspect
-from collections import defaultdict
-from typing import Any
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 import discord
 from discord.ext import commands
-from discord.utils import MISSING
 
+from . import hot_reload, index
+from .context import SlashContext
+from .from_slash import _unwrap_slash_options, bind_arguments, bind_target
+from .options import Option, get_command_options
+from .routing import routes_to_tree
+from .tracing import NULL_TRACE
 
-class Option:  # type: ignore
-    """A special 'converter' to apply a description to slash command options.
 
-    For example in the following code:
+original_callback = commands.Command.callback
 
-    .. code-block:: python3
 
-        @bot.command()
-        async def ban(ctx,
-            member: discord.Member, *,
-            reason: str = commands.Option('no reason', description='the reason to ban this member')
-        ):
-            await member.ban(reason=reason)
+@original_callback.setter
+def callback(self, function):
+    original_callback.fset(self, function)
 
-    The description would be ``the reason to ban this member`` and the default would be ``no reason``
+    # Parameters may have changed, so the payload, invocation plan and option metadata have to be rebuilt.
+    # The metadata is only unpacked once needed, most commands are never uploaded or invoked.
+    self._slash_plan = None
+    self._slash_plan_data = None
+    self._slash_metadata = None
+    self._slash_invocation = None
+    _clear_payloads(self)
+    if hasattr(self, "parent"):  # not set yet while the command is being created
+        hot_reload.schedule_changed(self)
 
-    Attributes
-    ------------
-    default: Optional[Any]
-        The default for this option, overwrites Option during parsing.
-    description: :class:`str`
-        The description for this option, is unpacked to :attr:`.Command.option_descriptions`
-    """
 
-    __slots__ = (
-        "default",
-        "description",
-    )
+original_clean_params = commands.Command.clean_params
 
-    def __init__(self, default: Any = inspect.Parameter.empty, *, description: str) -> None:
-        self.description = description
-        self.default = default
 
+@property  # type: ignore
+def clean_params(self):
+    get_command_options(self)  # replaces Option defaults before anything reads them
+    return original_clean_params.fget(self)
 
-Option: Any
 
+@property  # type: ignore
+def option_descriptions(self) -> Dict[str, str]:
+    """Dict[:class:`str`, :class:`str`]: The description of each slash command option, by option name."""
+    return get_command_options(self).descriptions
+
+
+@property  # type: ignore
+def option_autocomplete(self) -> Dict[str, Callable[[discord.Interaction, str], Awaitable[List[Any]]]]:
+    """The autocomplete provider of each slash command option, by option name."""
+    return get_command_options(self).autocomplete
+
+
+def _clear_payloads(command: commands.Command) -> None:
+    # Subcommands are part of their parents' payloads
+    while command is not None:
+        command._slash_payload = None  # type: ignore
+        command = getattr(command, "parent", None)  # not set yet while the command is being created
+
+
+original_add_command = commands.GroupMixin.add_command
+original_remove_command = commands.GroupMixin.remove_command
 
-@commands.Command.callback.setter
-def callback(self, function):
-    super(self).callback = function
 
-    signature = inspect.signature(function)
-    self.option_descriptions = defaultdict(lambda: "no description")
+def add_command(self, command: commands.Command, /) -> None:
+    original_add_command(self, command)
+    index.invalidate()
+    command._slash_invocation = None  # type: ignore # its qualified name depends on the parent
+    if isinstance(self, commands.Command):
+        _clear_payloads(self)
+    hot_reload.schedule_changed(self)
 
-    for name, parameter in signature.parameters.items():
-        if isinstance(parameter.default, Option):  # type: ignore
-            option = parameter.default
-            parameter = parameter.replace(default=option.default)
-            if option.name is not MISSING:
-                name = option.name
-                parameter.replace(name=name)
 
-            self.option_descriptions[name] = option.description
+def remove_command(self, name: str, /) -> Optional[commands.Command]:
+    command = original_remove_command(self, name)
+    if command is not None:
+        index.invalidate()
+        if isinstance(self, commands.Command):
+            _clear_payloads(self)
+        hot_reload.schedule_changed(self)
 
+    return command
 
-# Need to ignore CommandNotFound because otherwise on_interaction is never called
+
+original_invoke = commands.bot.BotBase.invoke
 original_transform = commands.Command.transform
+original_parse_arguments = commands.Command._parse_arguments
 original_call = discord.app_commands.CommandTree.call
 
 
+async def invoke(self, ctx: commands.Context) -> None:
+    try:
+        await original_invoke(self, ctx)
+    finally:
+        # Patched on every bot, not only SlashBot, as commands that defer may never send
+        if isinstance(ctx, SlashContext):
+            ctx.release_typing()
+
+
 async def transform(self, ctx: commands.Context, param: inspect.Parameter):
-    if hasattr(ctx, "_ignored_params") and param in ctx._ignored_params:  # type: ignore
+    ignored_params = getattr(ctx, "_ignored_params", None)
+    if ignored_params and param.name in ignored_params:
         # in a slash command, we need a way to mark a param as default so ctx._ignored_params is used
         return param.default if param.default is not param.empty else None
 
     return await original_transform(self, ctx, param)
 
 
-async def call(*args, **kwargs):
-    try:
-        return await original_call(*args, **kwargs)
-    except discord.app_commands.CommandNotFound:
-        pass
-
-
+async def parse_arguments(self, ctx: commands.Context):
+    trace = getattr(ctx, "_slash_trace", NULL_TRACE)
+    trace.mark("checks")
+    get_command_options(self)
+
+    message = ctx.message
+    targets = getattr(ctx, "_slash_targets", None)
+    command_options = getattr(message, "_slash_options", None)
+    if targets is not None:
+        await bind_target(self, ctx, targets)
+    elif command_options is None:
+        await original_parse_arguments(self, ctx)
+    else:
+        # Parent groups of a slash subcommand never receive options
+        command_options = command_options if message._slash_command is self else ()
+        await bind_arguments(self, ctx, command_options, message._resolved)
+
+    trace.mark("convert")
+
+
+async def call(self, interaction: discord.Interaction, *args, **kwargs):
+    # Only genuine app_commands reach the tree, everything else is for on_interaction
+    command_path, _ = _unwrap_slash_options(interaction.data)  # type: ignore
+    if routes_to_tree(self, interaction, command_path):
+        return await original_call(self, interaction, *args, **kwargs)
+
+
+commands.Command.callback = callback
+commands.Command.clean_params = clean_params
+commands.Command.option_descriptions = option_descriptions
+commands.Command.option_autocomplete = option_autocomplete
+commands.GroupMixin.add_command = add_command
+commands.GroupMixin.remove_command = remove_command
+commands.bot.BotBase.invoke = invoke
 commands.Command.transform = transform
+commands.Command._parse_arguments = parse_arguments
 discord.app_commands.CommandTree.call = call
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import inspect
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+import discord
+from discord.ext import commands
+
+from .options import get_command_options
+from .to_slash import REVERSED_CONVERTER_MAPPING, resolve_option_type
+
+# Option values that Discord has already typed for us, these can be passed straight through
+NATIVE_OPTION_TYPES = {str: 3, int: 4, bool: 5, float: 10}
+NATIVE_TYPES = {option_type: native_type for native_type, option_type in NATIVE_OPTION_TYPES.items()}
+
+# Classes that can be taken straight from interaction.data["resolved"]
+ENTITY_CLASSES = (discord.Member, discord.User, discord.Role, discord.abc.GuildChannel, discord.Thread)
+
+# How a parameter is filled from the slash command options
+BIND_VALUE = 0  # A single option, passed through or ran through the converters
+BIND_VIEW = 1  # A single option that ext.commands has to split into words first, Greedy and *args
+BIND_FLAGS = 2  # A FlagConverter, each flag is a separate option
+
+
+class FlagPlan:
+    __slots__ = ("option_name", "flag", "native_type", "option_type")
+
+    def __init__(self, option_name: str, flag: commands.Flag, option_type: Any = inspect.Parameter.empty) -> None:
+        self.option_name = option_name
+        self.flag = flag
+        if option_type is inspect.Parameter.empty:
+            self.native_type, self.option_type = _native_type(flag.annotation)
+        else:
+            # Loaded from a snapshot, see snapshot.py
+            self.native_type, self.option_type = NATIVE_TYPES.get(option_type), option_type
+
+    def to_list(self) -> List[Any]:
+        return [self.option_name, self.option_type]
+
+
+class ParameterPlan:
+    __slots__ = (
+        "name",
+        "option_name",
+        "param",
+        "strategy",
+        "required",
+        "default",
+        "keyword",
+        "variadic",
+        "native_type",
+        "option_type",
+        "entity_types",
+        "transform",
+        "transform_type",
+        "flags",
+    )
+
+    def __init__(
+        self,
+        command: commands.Command,
+        name: str,
+        param: inspect.Parameter,
+        metadata: Optional[List[Any]] = None,
+    ) -> None:
+        annotation = param.annotation
+
+        self.name = name
+        self.param = param
+        self.default = param.default if param.default is not param.empty else None
+        self.keyword = param.kind == param.KEYWORD_ONLY
+        self.variadic = param.kind == param.VAR_POSITIONAL
+        self.flags: List[FlagPlan] = []
+
+        if metadata is not None:
+            # Loaded from a snapshot, see snapshot.py, the annotation is only looked at again when it has to be
+            _, self.option_name, self.required, self.strategy, self.option_type, entity, transform, flags = metadata
+            self.native_type = NATIVE_TYPES.get(self.option_type)
+            self.entity_types = _entity_types(annotation) if entity else ()
+            self.transform, self.transform_type = _registered_transform(annotation) if transform else (None, None)
+            if self.strategy == BIND_FLAGS:
+                flag_objects = annotation.get_flags()
+                self.flags = [FlagPlan(name, flag_objects[name], option_type) for (name, option_type) in flags]
+            return
+
+        self.native_type, self.option_type = _native_type(annotation if annotation is not param.empty else str)
+        self.entity_types = _entity_types(annotation)
+        self.transform, self.transform_type = _registered_transform(annotation)
+        self.option_name = get_command_options(command).option_name(name)
+        if param.kind == param.VAR_POSITIONAL:
+            self.required = command.require_var_positional
+        else:
+            self.required = param.default is param.empty and not command._is_typing_optional(annotation)
+
+        if inspect.isclass(annotation) and issubclass(annotation, commands.FlagConverter):
+            self.strategy = BIND_FLAGS
+            self.flags = [FlagPlan(flag_name, flag) for flag_name, flag in annotation.get_flags().items()]
+        elif self.variadic or isinstance(annotation, commands.Greedy):
+            self.strategy = BIND_VIEW
+        else:
+            self.strategy = BIND_VALUE
+
+    def to_list(self) -> List[Any]:
+        # A list rather than a dict, as a snapshot holds one for every parameter of every command
+        return [
+            self.name,
+            self.option_name,
+            self.required,
+            self.strategy,
+            self.option_type,
+            bool(self.entity_types),
+            self.transform is not None,
+            [flag.to_list() for flag in self.flags],
+        ]
+
+
+class InvocationPlan:
+    """The precompiled steps to bind slash command options to a command's parameters.
+
+    Compiled once per callback by :func:`get_plan`, so the per-invoke work is
+    just walking :attr:`parameters` in order.
+    """
+
+    __slots__ = ("parameters",)
+
+    def __init__(self, command: commands.Command, metadata: Optional[List[List[Any]]] = None) -> None:
+        self.parameters: List[ParameterPlan] = []
+
+        params = command.clean_params
+        if metadata is not None:
+            self.parameters = [ParameterPlan(command, data[0], params[data[0]], data) for data in metadata]
+            return
+
+        for name, param in params.items():
+            if param.kind == param.VAR_KEYWORD:
+                continue
+
+            self.parameters.append(ParameterPlan(command, name, param))
+            if param.kind == param.KEYWORD_ONLY:
+                break  # ext.commands only ever fills the first keyword only parameter
+
+    def to_list(self) -> List[List[Any]]:
+        return [parameter.to_list() for parameter in self.parameters]
+
+
+def _native_type(annotation: Any) -> Tuple[Optional[type], Optional[int]]:
+    origin = getattr(annotation, "__origin__", None)
+    args = getattr(annotation, "__args__", ())
+    if origin is Union and len(args) == 2 and args[-1] is type(None):
+        # Unpack Optional[T] (Union[T, None]) into just T
+        annotation = args[0]
+
+    option_type = NATIVE_OPTION_TYPES.get(annotation) if inspect.isclass(annotation) else None
+    if option_type is None:
+        return None, None
+
+    return annotation, option_type
+
+
+def _registered_transform(annotation: Any) -> Tuple[Optional[Callable[[Any], Any]], Optional[int]]:
+    args = getattr(annotation, "__args__", ())
+    if getattr(annotation, "__origin__", None) is Union and len(args) == 2 and args[-1] is type(None):
+        annotation = args[0]
+
+    if getattr(annotation, "__origin__", None) is not None or isinstance(annotation, commands.Greedy):
+        return None, None
+
+    option_type = resolve_option_type(annotation)
+    if option_type is None or option_type.transform is None:
+        return None, None
+
+    return option_type.transform, option_type.type
+
+
+def _entity_types(annotation: Any) -> Tuple[type, ...]:
+    args = annotation.__args__ if getattr(annotation, "__origin__", None) is Union else (annotation,)
+
+    entity_types = []
+    for arg in args:
+        if arg is type(None):
+            continue
+
+        arg = REVERSED_CONVERTER_MAPPING.get(arg, arg) if inspect.isclass(arg) else arg
+        if not (inspect.isclass(arg) and issubclass(arg, ENTITY_CLASSES)):
+            return ()
+
+        entity_types.append(arg)
+
+    return tuple(entity_types)
+
+
+def get_plan(command: commands.Command) -> InvocationPlan:
+    """Returns the cached :class:`InvocationPlan` for ``command``, compiling it on first use.
+
+    Commands loaded from a snapshot restore the stored plan instead of compiling it.
+    The cache is cleared whenever the command's callback is reassigned.
+    """
+
+    plan: Optional[InvocationPlan] = getattr(command, "_slash_plan", None)
+    if plan is None:
+        metadata = getattr(command, "_slash_plan_data", None)
+        plan = command._slash_plan = InvocationPlan(command, metadata)  # type: ignore
+
+    return plan
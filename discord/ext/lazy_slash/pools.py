@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import importlib
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Coroutine, Dict, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+from .errors import PoolSaturated
+
+# Offloaded functions by "module:qualname", so process pools can look them up after unpickling the key
+_OFFLOADED: Dict[str, Callable[..., Any]] = {}
+
+
+class WorkerPool:
+    """Runs CPU heavy command callbacks on an executor, off the event loop.
+
+    At most ``max_pending`` calls are submitted to the executor at once, up to ``max_queued``
+    more wait for a slot, and any others are rejected with :exc:`PoolSaturated`.
+
+    Attributes
+    -----------
+    submitted: :class:`int`
+        Calls that were given a slot in the executor.
+    completed: :class:`int`
+        Calls that returned.
+    failed: :class:`int`
+        Calls that raised.
+    rejected: :class:`int`
+        Calls rejected as the pool was full.
+    wait_time: :class:`float`
+        Total seconds calls spent waiting for a slot.
+    run_time: :class:`float`
+        Total seconds calls spent in the executor.
+    """
+
+    def __init__(self, executor: Executor, *, max_pending: int = 32, max_queued: int = 0, name: str = "default"):
+        self.executor = executor
+        self.max_pending = max_pending
+        self.max_queued = max_queued
+        self.name = name
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.wait_time = 0.0
+        self.run_time = 0.0
+
+        self._pending = 0
+        self._queued = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def __repr__(self) -> str:
+        return f"<WorkerPool name={self.name!r} pending={self._pending} queued={self._queued}>"
+
+    @property
+    def pending(self) -> int:
+        """:class:`int`: Calls currently submitted to the executor."""
+        return self._pending
+
+    @property
+    def queued(self) -> int:
+        """:class:`int`: Calls currently waiting for a slot."""
+        return self._queued
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the current and total counters of this pool, as a JSON serializable dict."""
+
+        return {
+            "pending": self._pending,
+            "queued": self._queued,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "wait_time": self.wait_time,
+            "run_time": self.run_time,
+        }
+
+    def check(self) -> None:
+        """Raises :exc:`PoolSaturated` if a call made now would be rejected."""
+
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+
+        if self._slots.locked() and self._queued >= self.max_queued:
+            self.rejected += 1
+            raise PoolSaturated(self)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Calls ``func(*args)`` in the executor, waiting for a slot if the queue has room.
+
+        Raises
+        -------
+        PoolSaturated
+            Every slot is taken and the queue is full.
+        """
+
+        self.check()
+        assert self._slots is not None
+
+        queued_at = time.perf_counter()
+        self._queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+
+        started = time.perf_counter()
+        self.wait_time += started - queued_at
+        self.submitted += 1
+        self._pending += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+            return result
+        finally:
+            self._pending -= 1
+            self.run_time += time.perf_counter() - started
+            self._slots.release()
+
+
+def _call_offloaded(key: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+    func = _OFFLOADED.get(key)
+    if func is None:
+        # A fresh worker process, importing the module registers the function again
+        importlib.import_module(key.partition(":")[0])
+        func = _OFFLOADED[key]
+
+    return func(*args, **kwargs)
+
+
+async def _send_result(ctx: commands.Context, result: Any) -> None:
+    if isinstance(result, discord.File):
+        await ctx.send(file=result)
+    elif isinstance(result, dict):
+        await ctx.send(**result)
+    else:
+        await ctx.send(str(result))
+
+
+def offload(pool: str = "default") -> Callable[[Callable[..., Any]], Callable[..., Coroutine[Any, Any, None]]]:
+    """Marks a synchronous command callback to run in one of ``bot.worker_pools``.
+
+    The interaction is deferred on the event loop first, then the callback is called in the pool
+    with the converted arguments, and ``None`` instead of the context as that has to stay on the loop.
+    Its return value is sent with ``ctx.send``, a :class:`discord.File`, a dict of ``send`` keyword
+    arguments, or anything else as text.
+
+    For process pools the function and arguments are pickled, so the command's module has to be importable.
+
+    .. code-block:: python3
+
+        @bot.command()
+        @lazy_slash.offload("images")
+        def blur(_, radius: int):
+            return discord.File(render_blur(radius), "blur.png")
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Coroutine[Any, Any, None]]:
+        key = f"{func.__module__}:{func.__qualname__}"
+        _OFFLOADED[key] = func
+
+        @functools.wraps(func)
+        async def callback(*args: Any, **kwargs: Any) -> None:
+            ctx_index = next(index for index, arg in enumerate(args) if isinstance(arg, commands.Context))
+            ctx: commands.Context = args[ctx_index]
+            worker_pool: WorkerPool = getattr(ctx.bot, "worker_pools", {})[pool]
+
+            # Reject before acknowledging, so the error can still be sent as the initial response
+            worker_pool.check()
+            await ctx.defer()  # type: ignore
+            call_args = (*args[:ctx_index], None, *args[ctx_index + 1 :])
+            result = await worker_pool.run(_call_offloaded, key, call_args, kwargs)
+            if result is not None:
+                await _send_result(ctx, result)
+
+        return callback
+
+    return decorator
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import discord
+
+if TYPE_CHECKING:
+    from discord.state import ConnectionState
+
+# Option types which are sent as IDs, with the objects in interaction.data["resolved"]
+USER = 6
+CHANNEL = 7
+ROLE = 8
+MENTIONABLE = 9
+ENTITY_OPTION_TYPES = frozenset({USER, CHANNEL, ROLE, MENTIONABLE})
+_RESOLVED_KEYS = {USER: "users", CHANNEL: "channels", ROLE: "roles"}
+_EMPTY: Dict[str, Any] = {}
+
+
+class ResolvedData:
+    """Lazily builds the users, members, roles, channels and messages sent with an interaction.
+
+    Objects are taken from the cache if possible, otherwise built from the payload,
+    so converters never have to fall back to an API request for them.
+    """
+
+    __slots__ = ("_data", "_state", "_guild", "_objects")
+
+    def __init__(self, interaction: discord.Interaction) -> None:
+        self._data: Dict[str, Dict[str, Any]] = (interaction.data or _EMPTY).get("resolved") or _EMPTY  # type: ignore
+        self._state: ConnectionState = interaction._state
+        self._guild: Optional[discord.Guild] = interaction.guild
+        self._objects: Optional[Dict[Tuple[str, int], Any]] = None  # most invokes never need it
+
+    def _get(self, kind: str, id: int) -> Any:
+        if self._objects is None:
+            self._objects = {}
+
+        key = (kind, id)
+        try:
+            return self._objects[key]
+        except KeyError:
+            obj = self._objects[key] = getattr(self, f"_build_{kind}")(id)
+            return obj
+
+    def _build_user(self, id: int) -> Optional[discord.User]:
+        user = self._state.get_user(id)
+        if user is not None:
+            return user
+
+        data = self._data.get("users", {}).get(str(id))
+        if data is None:
+            return None
+
+        return discord.User(state=self._state, data=data)  # type: ignore
+
+    def _build_member(self, id: int) -> Optional[discord.Member]:
+        if self._guild is None:
+            return None
+
+        member = self._guild.get_member(id)
+        if member is not None:
+            return member
+
+        data = self._data.get("members", {}).get(str(id))
+        user_data = self._data.get("users", {}).get(str(id))
+        if data is None or user_data is None:
+            return None
+
+        return discord.Member(data={**data, "user": user_data}, guild=self._guild, state=self._state)  # type: ignore
+
+    def _build_role(self, id: int) -> Optional[discord.Role]:
+        if self._guild is None:
+            return None
+
+        role = self._guild.get_role(id)
+        if role is not None:
+            return role
+
+        data = self._data.get("roles", {}).get(str(id))
+        if data is None:
+            return None
+
+        return discord.Role(guild=self._guild, state=self._state, data=data)  # type: ignore
+
+    def _build_channel(self, id: int) -> Any:
+        # Partial channel payloads are missing too much to build a real channel from
+        if self._guild is None:
+            return None
+
+        return self._guild.get_channel_or_thread(id)
+
+    def message(self, id: int, channel: Any) -> Optional[discord.Message]:
+        """Returns the message with ``id`` sent in ``channel``, the target of a message context menu."""
+
+        message = self._state._get_message(id)
+        if message is not None:
+            return message
+
+        data = self._data.get("messages", {}).get(str(id))
+        if data is None:
+            return None
+
+        return discord.Message(state=self._state, channel=channel, data=data)  # type: ignore
+
+    def get(self, option_type: int, id: int) -> Tuple[Any, ...]:
+        """Returns the objects that the ID given for an option of ``option_type`` may refer to."""
+
+        if option_type == USER:
+            kinds: Tuple[str, ...] = ("member", "user")
+        elif option_type == ROLE:
+            kinds = ("role",)
+        elif option_type == CHANNEL:
+            kinds = ("channel",)
+        elif option_type == MENTIONABLE:
+            kinds = ("member", "user", "role")
+        else:
+            return ()
+
+        return tuple(obj for obj in (self._get(kind, id) for kind in kinds) if obj is not None)
+
+    def all(self, option_type: int) -> List[Any]:
+        """Returns every resolved object of ``option_type``, members are preferred over users."""
+
+        key = _RESOLVED_KEYS.get(option_type)
+        if key is None or key not in self._data:
+            return []
+
+        objects = (self.get(option_type, int(id)) for id in self._data[key])
+        return [candidates[0] for candidates in objects if candidates]
+
+    def find(self, option_type: int, value: Any, types: Tuple[type, ...]) -> Any:
+        """Returns the first resolved object for ``value`` that is an instance of ``types``, or ``None``."""
+
+        try:
+            id = int(value)
+        except (TypeError, ValueError):
+            return None
+
+        for obj in self.get(option_type, id):
+            if isinstance(obj, types):
+                return obj
+
+        return None
+
+
+class InteractionChannel(discord.PartialMessageable):
+    """A stand-in for an uncached interaction channel, built from the interaction payload.
+
+    This is used instead of fetching the channel, ``permissions_for`` answers
+    with the permissions Discord sent with the interaction.
+    """
+
+    def __init__(self, interaction: discord.Interaction, type: Optional[discord.ChannelType] = None) -> None:
+        assert interaction.channel_id is not None
+        super().__init__(state=interaction._state, id=interaction.channel_id, type=type)  # type: ignore
+
+        self._guild = interaction.guild
+        self._interaction = interaction
+
+    @property
+    def guild(self) -> Optional[discord.Guild]:  # type: ignore
+        return self._guild
+
+    def permissions_for(self, obj: Any = None, /) -> discord.Permissions:
+        interaction = self._interaction
+        if obj is None or obj.id == getattr(interaction.user, "id", None):
+            return interaction.permissions
+
+        app_permissions = getattr(interaction, "app_permissions", None)
+        if app_permissions is not None and obj.id == self._state.self_id:
+            return app_permissions
+
+        if isinstance(obj, discord.Member):
+            return obj.guild_permissions
+
+        return discord.Permissions.none()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import discord
+from discord.ext import commands
+
+from .index import get_slash_command
+
+if TYPE_CHECKING:
+    from discord.types.interactions import ApplicationCommandInteractionData
+
+_log = logging.getLogger(__name__)
+
+# Sent ephemerally for these trace outcomes, so the user is not left with "The application did not respond"
+DEFAULT_ERROR_MESSAGES = {
+    "not_found": "This command is not available anymore.",
+    "no_channel": "This command cannot be used here.",
+    "error": "Something went wrong while running this command.",
+    "cooldown": "This command is on cooldown, try again in {retry_after:.1f}s.",
+    "max_concurrency": "This command is already being used too many times, try again later.",
+    "overloaded": "Too many commands are being run right now, try again later.",
+}
+
+
+def tree_has_command(tree: discord.app_commands.CommandTree, data: ApplicationCommandInteractionData) -> bool:
+    """Returns whether the app_commands ``tree`` has the command invoked by ``data``, without raising."""
+
+    command_type = discord.AppCommandType(data.get("type", 1))
+    guild_id = data.get("guild_id")
+    if guild_id is not None:
+        guild = discord.Object(int(guild_id))
+        if tree.get_command(data["name"], guild=guild, type=command_type) is not None:
+            return True
+        if not tree.fallback_to_global:
+            return False
+
+    return tree.get_command(data["name"], type=command_type) is not None
+
+
+def routes_to_tree(
+    tree: discord.app_commands.CommandTree, interaction: discord.Interaction, command_path: Tuple[str, ...]
+) -> bool:
+    """Returns whether the app_commands ``tree`` should process ``interaction``.
+
+    Commands of the bot are processed by ``on_interaction``, as are commands neither
+    knows about, which are reported there instead of raising :exc:`~discord.app_commands.CommandNotFound`.
+    """
+
+    bot: Any = tree.client
+    if not isinstance(bot, commands.Bot):
+        return True
+
+    if get_slash_command(bot, command_path, interaction.data.get("type", 1)) is not None:  # type: ignore
+        return False
+
+    return tree_has_command(tree, interaction.data)  # type: ignore
+
+
+async def reply_error(bot: commands.Bot, interaction: discord.Interaction, outcome: str, **details: Any) -> None:
+    """Tells the user ephemerally that their command could not be run, if the interaction was not responded to.
+
+    The message for ``outcome`` is formatted with ``details``, if any are given.
+    """
+
+    messages: Dict[str, str] = getattr(bot, "error_messages", DEFAULT_ERROR_MESSAGES)
+    message: Optional[str] = messages.get(outcome)
+    if message is None or interaction.response.is_done():
+        return
+
+    if details:
+        message = message.format(**details)
+
+    try:
+        await interaction.response.send_message(message, ephemeral=True)
+    except discord.HTTPException as error:
+        _log.debug("Failed to reply to %s interaction %s: %s", outcome, interaction.id, error)
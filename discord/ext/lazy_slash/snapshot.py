@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, List, Tuple
+
+from discord.ext import commands
+
+from .context_menus import get_context_menu
+from .plans import get_plan
+from .to_slash import OPTION_TYPES, get_application_command
+
+_log = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 3
+
+
+def _registry_fingerprint() -> str:
+    registered = sorted(
+        (
+            f"{annotation.__module__}.{annotation.__qualname__}",
+            option_type.type,
+            option_type.channel_types,
+            option_type.min_value,
+            option_type.max_value,
+            option_type.choices,
+        )
+        for annotation, option_type in OPTION_TYPES.items()
+    )
+    return hashlib.sha256(repr(registered).encode()).hexdigest()
+
+
+def _flags_fingerprint(command: commands.Command) -> List[Any]:
+    # Each flag is an option of its own, bound by its name
+    return [
+        (flag.name, flag.annotation, flag.default, flag.required, getattr(flag, "description", None))
+        for param in command.params.values()
+        if inspect.isclass(param.annotation) and issubclass(param.annotation, commands.FlagConverter)
+        for flag in param.annotation.get_flags().values()
+    ]
+
+
+def command_fingerprint(command: commands.Command) -> str:
+    """Returns a hash of everything a command's payload and invocation plan are generated from.
+
+    This is only the callback's code object and defaults and the parameters ext.commands already parsed,
+    so checking a command is far cheaper than generating its payload and plan.
+    """
+
+    # Wrappers such as offload() take *args and **kwargs, the function they wrap has the real signature
+    callback = inspect.unwrap(command.callback)
+    code = callback.__code__
+    fingerprint = (
+        command.qualified_name,
+        f"{callback.__module__}.{callback.__qualname__}",
+        # The argument names and kinds
+        code.co_varnames[: code.co_argcount + code.co_kwonlyargcount],
+        code.co_argcount,
+        code.co_flags,
+        # The defaults as written, so each Option's fields are included without unpacking them
+        callback.__defaults__,
+        callback.__kwdefaults__,
+        # The repr of a class includes its module, so this is stable between processes
+        [(name, param.annotation, getattr(param, "description", None)) for (name, param) in command.params.items()],
+        _flags_fingerprint(command),
+        get_context_menu(command),
+        command.short_doc,
+        command.require_var_positional,
+    )
+    if isinstance(command, commands.Group):
+        # Subcommands are part of the group's payload
+        fingerprint += tuple(sorted(command_fingerprint(subcommand) for subcommand in command.commands))
+
+    return hashlib.sha256(repr(fingerprint).encode()).hexdigest()
+
+
+def export_snapshot(ext_commands: Iterable[commands.Command], path: str) -> int:
+    """Writes the payloads and invocation plans of ``ext_commands`` to ``path``.
+
+    This is meant to be ran once per build, such as with ``export_snapshot(bot.walk_commands(), path)``,
+    so every process can skip generating them with :func:`load_snapshot`.
+
+    Returns
+    --------
+    :class:`int`
+        The number of commands written.
+    """
+
+    snapshot: Dict[str, Any] = {"version": SNAPSHOT_VERSION, "registry": _registry_fingerprint(), "commands": {}}
+    for command in ext_commands:
+        snapshot["commands"][command.qualified_name] = {
+            "fingerprint": command_fingerprint(command),
+            "payload": get_application_command(command),
+            "plan": get_plan(command).to_list(),
+        }
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as snapshot_file:
+        json.dump(snapshot, snapshot_file, separators=(",", ":"))
+
+    os.replace(temp_path, path)
+    return len(snapshot["commands"])
+
+
+def load_snapshot(ext_commands: Iterable[commands.Command], path: str) -> Tuple[int, int]:
+    """Primes the payload and invocation plan caches of ``ext_commands`` from a file written by :func:`export_snapshot`.
+
+    Commands which changed since the snapshot was taken are left to be generated as normal.
+
+    Returns
+    --------
+    Tuple[:class:`int`, :class:`int`]
+        The number of commands loaded and the number of commands that were stale or missing.
+    """
+
+    try:
+        with open(path) as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except (OSError, ValueError) as error:
+        _log.warning("Could not read command snapshot at %s: %s", path, error)
+        snapshot = {}
+
+    ext_commands = list(ext_commands)
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("registry") != _registry_fingerprint():
+        return 0, len(ext_commands)
+
+    loaded = stale = 0
+    for command in ext_commands:
+        entry = snapshot["commands"].get(command.qualified_name)
+        if entry is None or entry["fingerprint"] != command_fingerprint(command):
+            stale += 1
+            continue
+
+        # The plan is restored from its stored fields on first use, the same as it is compiled without a snapshot
+        command._slash_payload = entry["payload"]  # type: ignore
+        command._slash_plan_data = entry["plan"]  # type: ignore
+        loaded += 1
+
+    _log.info("Loaded %s commands from snapshot, %s stale or missing", loaded, stale)
+    return loaded, stale
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from discord.http import HTTPClient
+
+_log = logging.getLogger(__name__)
+
+# Keys of a command payload that Discord gives back to us, and the value used when they are missing
+COMMAND_DEFAULTS: Dict[str, Any] = {"name": None, "description": None, "type": 1, "options": []}
+OPTION_DEFAULTS: Dict[str, Any] = {
+    "type": None,
+    "name": None,
+    "description": None,
+    "required": False,
+    "choices": [],
+    "channel_types": [],
+    "min_value": None,
+    "max_value": None,
+    "autocomplete": False,
+    "options": [],
+}
+
+
+class SyncResult(NamedTuple):
+    """The outcome of syncing the commands of one scope, returned by :func:`.create_slash_commands`."""
+
+    guild_id: Optional[int]
+    payload_hash: str
+    uploaded: bool
+
+
+def _normalize_option(option: Dict[str, Any]) -> Dict[str, Any]:
+    normalized = {}
+    for key, default in OPTION_DEFAULTS.items():
+        value = option.get(key, default)
+        if value is None or value == default:
+            continue
+
+        if key == "options":
+            value = [_normalize_option(o) for o in value]
+        elif key == "channel_types":
+            value = sorted(value)
+        elif key == "choices":
+            value = [{"name": c["name"], "value": c["value"]} for c in value]
+
+        normalized[key] = value
+
+    return normalized
+
+
+def normalize_payload(payload: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Strips a list of command payloads down to what we send, so local and remote payloads compare equal."""
+
+    normalized = []
+    for command in payload:
+        normalized_command = {}
+        for key, default in COMMAND_DEFAULTS.items():
+            value = command.get(key, default)
+            # Discord gives context menus an empty description, they are sent without one
+            if value is None or value == default or (key == "description" and value == ""):
+                continue
+
+            if key == "options":
+                value = [_normalize_option(o) for o in value]
+
+            normalized_command[key] = value
+
+        normalized.append(normalized_command)
+
+    return sorted(normalized, key=lambda c: (c.get("type", 1), c["name"]))
+
+
+def payload_hash(payload: Iterable[Dict[str, Any]]) -> str:
+    """Returns a stable hash of a list of command payloads."""
+
+    dumped = json.dumps(normalize_payload(payload), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(dumped.encode()).hexdigest()
+
+
+def scope_key(application_id: int, guild_id: Optional[int]) -> str:
+    return f"{application_id}:{'global' if guild_id is None else guild_id}"
+
+
+async def fetch_hash(http: HTTPClient, application_id: int, guild_id: Optional[int]) -> str:
+    """Fetches the currently registered commands of a scope and hashes them."""
+
+    if guild_id is None:
+        registered = await http.get_global_commands(application_id)
+    else:
+        registered = await http.get_guild_commands(application_id, guild_id)
+
+    return payload_hash(registered)  # type: ignore
+
+
+def load_manifest(path: str) -> Dict[str, str]:
+    try:
+        with open(path) as manifest:
+            return json.load(manifest)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        _log.warning("Ignoring corrupt command manifest at %s", path)
+        return {}
+
+
+def save_manifest(path: str, hashes: Dict[str, str]) -> None:
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as manifest:
+        json.dump(hashes, manifest, indent=4, sort_keys=True)
+
+    os.replace(temp_path, path)
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import asyncio
 import inspect
-from collections import defaultdict
+import logging
+from collections import Counter, defaultdict
 from operator import itemgetter
-from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Optional, Union, cast
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Literal, Optional, Tuple, Union, cast
 
 import discord
 from discord.ext import commands
 
 from . import errors
+from .context_menus import CHAT_INPUT, to_context_menu
+from .options import get_command_options
+from .sync import SyncResult, fetch_hash, load_manifest, payload_hash, save_manifest, scope_key
+from .validation import COMMAND_TYPE_NAMES, MAX_COMMANDS, MAX_CONTEXT_MENUS, Violation, validate_command
 
 if TYPE_CHECKING:
     from discord.types.interactions import ApplicationCommandInteractionDataOption
 
+_log = logging.getLogger(__name__)
 
 REVERSED_CONVERTER_MAPPING = {v: k for k, v in commands.converter.CONVERTER_MAPPING.items()}
 APPLICATION_OPTION_TYPE_LOOKUP = {
@@ -36,6 +43,191 @@ APPLICATION_OPTION_CHANNEL_TYPES = {
 }
 
 
+class OptionType:
+    """How values of an annotation are represented as a slash command option.
+
+    Attributes
+    ------------
+    type: :class:`int`
+        The Discord application command option type.
+    channel_types: Optional[List[:class:`int`]]
+        The channel types to allow, for channel options.
+    min_value: Optional[Union[:class:`int`, :class:`float`]]
+        The minimum value to allow, for number options.
+    max_value: Optional[Union[:class:`int`, :class:`float`]]
+        The maximum value to allow, for number options.
+    choices: Optional[List[Any]]
+        The only values to allow.
+    transform: Optional[Callable[[Any], Any]]
+        Builds the parameter value straight from the option value, instead of running
+        the parameter's converter on slash command input that is already typed.
+    """
+
+    __slots__ = ("type", "channel_types", "min_value", "max_value", "choices", "transform")
+
+    def __init__(
+        self,
+        type: int,
+        *,
+        channel_types: Optional[List[int]] = None,
+        min_value: Optional[Union[int, float]] = None,
+        max_value: Optional[Union[int, float]] = None,
+        choices: Optional[List[Any]] = None,
+        transform: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self.type = type
+        self.channel_types = channel_types
+        self.min_value = min_value
+        self.max_value = max_value
+        self.choices = choices
+        self.transform = transform
+
+    def to_dict(self) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {"type": self.type}
+        if self.channel_types is not None:
+            fields["channel_types"] = self.channel_types
+        if self.min_value is not None:
+            fields["min_value"] = self.min_value
+        if self.max_value is not None:
+            fields["max_value"] = self.max_value
+        if self.choices is not None:
+            fields["choices"] = [{"name": str(choice), "value": choice} for choice in self.choices]
+
+        return fields
+
+
+# Looked up along the annotation's MRO, so subclasses get the closest registered type
+OPTION_TYPES: Dict[type, OptionType] = {
+    python_type: OptionType(discord_type)
+    for python_types, discord_type in APPLICATION_OPTION_TYPE_LOOKUP.items()
+    for python_type in (python_types if isinstance(python_types, tuple) else (python_types,))
+}
+OPTION_TYPES.update(
+    {
+        channel: OptionType(7, channel_types=channel_types)
+        for channel, channel_types in APPLICATION_OPTION_CHANNEL_TYPES.items()
+    }
+)
+
+_option_fields_cache: Dict[Any, Dict[str, Any]] = {}
+
+
+def register_option_type(
+    annotation: type,
+    type: int,
+    *,
+    channel_types: Optional[List[int]] = None,
+    min_value: Optional[Union[int, float]] = None,
+    max_value: Optional[Union[int, float]] = None,
+    choices: Optional[List[Any]] = None,
+    transform: Optional[Callable[[Any], Any]] = None,
+) -> None:
+    """Registers the slash command option type of a custom type or converter.
+
+    Without this, parameters annotated with types lazy_slash doesn't know about
+    become string options and have their converter ran on the input.
+
+    .. code-block:: python3
+
+        register_option_type(DurationConverter, 4, min_value=0, transform=datetime.timedelta)
+
+    Parameters
+    ------------
+    annotation: :class:`type`
+        The type or converter class, this also applies to subclasses of it.
+    type: :class:`int`
+        The Discord application command option type.
+
+    The keyword arguments are the same as the attributes of :class:`OptionType`.
+    """
+
+    OPTION_TYPES[annotation] = OptionType(
+        type,
+        channel_types=channel_types,
+        min_value=min_value,
+        max_value=max_value,
+        choices=choices,
+        transform=transform,
+    )
+    _option_fields_cache.clear()
+
+
+def resolve_option_type(annotation: Any) -> Optional[OptionType]:
+    """Returns the registered :class:`OptionType` for a class annotation, if any."""
+
+    if not inspect.isclass(annotation):
+        annotation = type(annotation)
+
+    for cls in annotation.__mro__:
+        option_type = OPTION_TYPES.get(cls)
+        if option_type is not None:
+            return option_type
+
+    if issubclass(annotation, commands.Converter):
+        # If this is a converter, we want to check if it is a native
+        # one, in which we can get the original type, eg, (MemberConverter -> Member)
+        original = REVERSED_CONVERTER_MAPPING.get(annotation)
+        if original is not None:
+            return resolve_option_type(original)
+
+    return None
+
+
+def _option_fields(annotation: Any) -> Dict[str, Any]:
+    origin = getattr(annotation, "__origin__", None)
+
+    if origin is None:
+        option_type = resolve_option_type(annotation)
+        if option_type is not None:
+            return option_type.to_dict()
+
+    elif origin is Union:
+        option_types = [resolve_option_type(arg) for arg in annotation.__args__]
+        discord_types = {option_type.type if option_type else 3 for option_type in option_types}
+
+        if len(discord_types) == 1 and discord_types != {3}:
+            # All the same type, eg. Union[TextChannel, VoiceChannel]
+            fields: Dict[str, Any] = {"type": discord_types.pop()}
+            channel_types = [option_type.channel_types for option_type in option_types]  # type: ignore
+            if all(channel_types):
+                fields["channel_types"] = [channel_type for types in channel_types for channel_type in types]  # type: ignore
+            return fields
+
+        if discord_types <= {6, 8, 9}:
+            return {"type": 9}
+
+    elif origin is Literal:
+        literal_values = annotation.__args__
+        python_type = type(literal_values[0])
+        if (
+            all(type(value) == python_type for value in literal_values)
+            and python_type in APPLICATION_OPTION_TYPE_LOOKUP.keys()
+        ):
+
+            return {
+                "type": APPLICATION_OPTION_TYPE_LOOKUP[python_type],
+                "choices": [{"name": str(literal_value), "value": literal_value} for literal_value in literal_values],
+            }
+
+    return {}
+
+
+def option_fields(annotation: Any) -> Dict[str, Any]:
+    """Returns the type related fields of the option for ``annotation``, cached per annotation.
+
+    The returned dict is shared, so should not be mutated.
+    """
+
+    try:
+        return _option_fields_cache[annotation]
+    except KeyError:
+        fields = _option_fields_cache[annotation] = _option_fields(annotation)
+        return fields
+    except TypeError:
+        # Unhashable annotation, such as a Greedy instance
+        return _option_fields(annotation)
+
+
 def _param_to_options(
     command: commands.Command,
     name: str,
@@ -44,7 +236,8 @@ def _param_to_options(
     varadic: bool,
 ) -> List[Optional[ApplicationCommandInteractionDataOption]]:
 
-    description = getattr(command, "option_descriptions", {}).get(name) or "no description"
+    metadata = get_command_options(command)
+    description = metadata.descriptions.get(name) or "no description"
     origin = getattr(annotation, "__origin__", None)
 
     if inspect.isclass(annotation) and issubclass(annotation, commands.FlagConverter):
@@ -68,7 +261,6 @@ def _param_to_options(
     if not required and origin is Union and annotation.__args__[-1] is type(None):
         # Unpack Optional[T] (Union[T, None]) into just T
         annotation = annotation.__args__[0]
-        origin = getattr(annotation, "__origin__", None)
 
     option: Dict[str, Any] = {
         "type": 3,
@@ -76,46 +268,13 @@ def _param_to_options(
         "required": required,
         "description": description,
     }
+    option.update(option_fields(annotation))
+    option.update(metadata.fields.get(name, ()))
 
-    if origin is None:
-        if not inspect.isclass(annotation):
-            annotation = type(annotation)
-
-        if issubclass(annotation, commands.Converter):
-            # If this is a converter, we want to check if it is a native
-            # one, in which we can get the original type, eg, (MemberConverter -> Member)
-            annotation = REVERSED_CONVERTER_MAPPING.get(annotation, annotation)
-
-        for python_type, discord_type in APPLICATION_OPTION_TYPE_LOOKUP.items():
-            if issubclass(annotation, python_type):
-                option["type"] = discord_type
-                # Set channel types
-                if discord_type == 7:
-                    option["channel_types"] = APPLICATION_OPTION_CHANNEL_TYPES[annotation]  # type: ignore
-                break
-
-    elif origin is Union:
-        if annotation in {Union[discord.Member, discord.Role], Union[commands.MemberConverter, commands.RoleConverter]}:
-            option["type"] = 9
-
-        elif all([arg in APPLICATION_OPTION_CHANNEL_TYPES for arg in annotation.__args__]):
-            option["type"] = 7
-            option["channel_types"] = [
-                discord_value for arg in annotation.__args__ for discord_value in APPLICATION_OPTION_CHANNEL_TYPES[arg]
-            ]
-
-    elif origin is Literal:
-        literal_values = annotation.__args__
-        python_type = type(literal_values[0])
-        if (
-            all(type(value) == python_type for value in literal_values)
-            and python_type in APPLICATION_OPTION_TYPE_LOOKUP.keys()
-        ):
-
-            option["type"] = APPLICATION_OPTION_TYPE_LOOKUP[python_type]
-            option["choices"] = [
-                {"name": literal_value, "value": literal_value} for literal_value in annotation.__args__
-            ]
+    if name in metadata.autocomplete:
+        # Discord doesn't allow choices and autocomplete together
+        option.pop("choices", None)
+        option["autocomplete"] = True
 
     return [option]  # type: ignore
 
@@ -129,7 +288,7 @@ def to_application_group(command: commands.Group, nested: int = 0) -> Optional[d
         "type": int(not (nested - 1)) + 1,
         "description": command.short_doc or "no description",
         "options": [
-            to_application_command(command, nested=nested + 1) for cmd in sorted(command.commands, key=lambda x: x.name)
+            to_application_command(cmd, nested=nested + 1) for cmd in sorted(command.commands, key=lambda x: x.name)
         ],
     }
 
@@ -138,14 +297,27 @@ def to_application_command(command: commands.Command, nested: int = 0) -> Option
     if nested == 3:
         raise errors.ApplicationCommandRegistrationError(command, f"{command.qualified_name} is too deeply nested!")
 
+    context_menu = to_context_menu(command)
+    if context_menu is not None:
+        if nested != 0 or isinstance(command, commands.Group):
+            raise errors.ApplicationCommandRegistrationError(
+                command, f"{command.qualified_name} cannot be a context menu, only top level commands can be!"
+            )
+
+        return context_menu
+
+    if isinstance(command, commands.Group):
+        return to_application_group(command, nested)
+
     payload = {"name": command.name, "description": command.short_doc or "no description", "options": []}
     if nested != 0:
         payload["type"] = 1
 
+    metadata = get_command_options(command)
     for name, param in command.clean_params.items():
         options = _param_to_options(
             command,
-            name,
+            metadata.option_name(name),
             param.annotation if param.annotation is not param.empty else str,
             varadic=param.kind == param.KEYWORD_ONLY or isinstance(param.annotation, commands.Greedy),
             required=(param.default is param.empty and not command._is_typing_optional(param.annotation))
@@ -159,42 +331,150 @@ def to_application_command(command: commands.Command, nested: int = 0) -> Option
     return payload
 
 
+def get_application_command(command: commands.Command) -> dict:
+    """Returns the cached top level payload for ``command``, converting it on first use.
+
+    The cache is cleared whenever the command's callback is reassigned, types registered
+    with :func:`register_option_type` afterwards are not picked up by cached payloads.
+    """
+
+    payload = getattr(command, "_slash_payload", None)
+    if payload is None:
+        payload = command._slash_payload = to_application_command(command)  # type: ignore
+
+    return payload  # type: ignore
+
+
 async def create_slash_commands(
     bot: commands.Bot,
     *,
-    upload_as_global: Iterable[commands.Command] = [],
+    upload_as_global: Optional[Iterable[commands.Command]] = None,
     upload_as_guild: Dict[int, List[commands.Command]] = {},
-):
+    sync: Literal["always", "remote", "manifest"] = "always",
+    manifest_path: str = ".lazy_slash_manifest.json",
+    upload_concurrency: int = 8,
+    invalid_commands: Literal["raise", "skip"] = "raise",
+) -> List[SyncResult]:
     ext_commands: defaultdict[Optional[int], List[commands.Command]] = defaultdict(list)
-    ext_commands[None].extend(upload_as_global)
+    if upload_as_global is not None:
+        ext_commands[None].extend(upload_as_global)
     for (g, c) in upload_as_guild.items():
         ext_commands[g].extend(c)
 
-    slash_commands: defaultdict[Optional[int], List[dict]] = defaultdict(list)
-    for guild_id, up_commands in ext_commands.items():
+    # Every command is converted and validated before anything is uploaded, so all violations are reported at once
+    payloads: Dict[commands.Command, dict] = {}
+    violations: List[Violation] = []
+    conversion_error: Optional[Exception] = None
+    for up_commands in ext_commands.values():
         for command in up_commands:
-            if command.hidden:
+            if command.hidden or command in payloads:
                 continue
 
+            # Payloads are cached on the command, so commands shared between scopes are only converted once
             try:
-                if command.hidden:
-                    return None
-
-                slash_commands[guild_id].append(to_application_command(command))
+                payload = get_application_command(command)
             except Exception as error:
-                raise RuntimeError(f"Encountered error while uploading command: {command.qualified_name}") from error
+                conversion_error = conversion_error or error
+                violations.append(Violation(command, "", f"failed to convert: {error}"))
+                continue
+
+            command_violations = validate_command(command, payload)
+            if command_violations:
+                violations.extend(command_violations)
+            else:
+                payloads[command] = payload
+
+    slash_commands: defaultdict[Optional[int], List[dict]] = defaultdict(list)
+    for guild_id, up_commands in ext_commands.items():
+        scope = "global" if guild_id is None else f"guild {guild_id}"
+        # Slash commands and each type of context menu have separate limits and names
+        type_counts: Counter[int] = Counter()
+        names: Dict[Tuple[int, str], commands.Command] = {}
+        for command in dict.fromkeys(up_commands):  # a command listed once per alias is only uploaded once
+            payload = payloads.get(command)
+            if payload is None:
+                continue
+
+            command_type = payload.get("type", CHAT_INPUT)
+            key = (command_type, payload["name"])
+            if key in names:
+                # Discord rejects the whole scope if two commands share a name
+                message = f"{payload['name']!r} is already used by /{names[key].qualified_name} in {scope}"
+                violations.append(Violation(command, "name", message))
+                continue
+
+            limit = MAX_COMMANDS if command_type == CHAT_INPUT else MAX_CONTEXT_MENUS
+            type_counts[command_type] += 1
+            if type_counts[command_type] > limit:
+                kind = COMMAND_TYPE_NAMES[command_type]
+                violations.append(Violation(command, "", f"is over the limit of {limit} {scope} {kind} commands"))
+            else:
+                names[key] = command
+                slash_commands[guild_id].append(payload)
+
+    if violations:
+        if invalid_commands == "raise":
+            raise errors.CommandValidationError(violations) from conversion_error
+
+        for violation in violations:
+            _log.warning("Skipping invalid command %s", violation)
+
+    # The global scope is only synced when it was given, so an empty list clears it but a guild only sync leaves it
+    if upload_as_global is not None:
+        slash_commands.setdefault(None, [])
 
     application_id = bot.application_id or (await bot.application_info()).id
-    await bot.http.bulk_upsert_global_commands(
-        payload=slash_commands.pop(None, None),
-        application_id=application_id,
+    current_hashes = load_manifest(manifest_path) if sync == "manifest" else {}
+
+    # Each scope is a separate rate limit bucket, so they can be uploaded side by side.
+    # HTTPClient still handles the per bucket and global rate limits for us.
+    semaphore = asyncio.Semaphore(upload_concurrency)
+
+    async def sync_scope(guild_id: Optional[int], payload: List[dict]) -> SyncResult:
+        key = scope_key(application_id, guild_id)
+        new_hash = payload_hash(payload)
+
+        async with semaphore:
+            if sync == "remote":
+                current_hashes[key] = await fetch_hash(bot.http, application_id, guild_id)
+
+            uploaded = current_hashes.get(key) != new_hash
+            if uploaded:
+                if guild_id is None:
+                    await bot.http.bulk_upsert_global_commands(payload=payload, application_id=application_id)
+                else:
+                    await bot.http.bulk_upsert_guild_commands(
+                        guild_id=guild_id,
+                        payload=payload,
+                        application_id=application_id,
+                    )
+
+        current_hashes[key] = new_hash
+        _log.info(
+            "%s %s commands for %s",
+            "Uploaded" if uploaded else "Skipped unchanged",
+            len(payload),
+            "global" if guild_id is None else f"guild {guild_id}",
+        )
+        return SyncResult(guild_id, new_hash, uploaded)
+
+    outcomes = await asyncio.gather(
+        *(sync_scope(guild_id, payload) for guild_id, payload in slash_commands.items()), return_exceptions=True
     )
 
-    if upload_as_guild:
-        for guild, command in slash_commands.items():
-            assert guild is not None
-            await bot.http.bulk_upsert_guild_commands(
-                guild_id=guild,
-                payload=command,
-                application_id=application_id,
-            )
+    results: List[SyncResult] = []
+    failures: Dict[Optional[int], BaseException] = {}
+    for guild_id, outcome in zip(slash_commands.keys(), outcomes):
+        if isinstance(outcome, BaseException):
+            failures[guild_id] = outcome
+        else:
+            results.append(outcome)
+
+    if sync == "manifest":
+        # Failed scopes keep their old hash, so they are retried next time
+        save_manifest(manifest_path, current_hashes)
+
+    if failures:
+        raise errors.CommandSyncError(results, failures)
+
+    return results
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+_log = logging.getLogger(__name__)
+
+# Discord invalidates the interaction if it has not been responded to in this many seconds
+RESPONSE_DEADLINE = 3.0
+
+
+class Trace:
+    """The timings of one slash command interaction, from arriving to the command finishing.
+
+    Attributes
+    -----------
+    interaction: :class:`discord.Interaction`
+        The interaction being processed.
+    command_path: Optional[Tuple[:class:`str`, ...]]
+        The name, subcommand group and subcommand invoked, once known.
+    stages: List[Tuple[:class:`str`, :class:`float`]]
+        The name and duration in seconds of each finished stage, in order.
+    outcome: Optional[:class:`str`]
+        ``"completed"``, ``"failed"`` if the command raised, ``"not_found"``, ``"no_channel"``,
+        ``"rejected"`` by admission control or ``"error"`` if processing the interaction raised.
+        ``None`` until finished.
+    duration: Optional[:class:`float`]
+        The total seconds spent processing the interaction, once finished.
+    response: Optional[:class:`str`]
+        ``"immediate"`` or ``"deferred"``, for the first response sent.
+    response_latency: Optional[:class:`float`]
+        The seconds from the interaction being created to the first response, including the time
+        spent in the gateway and waiting for the event loop before processing started.
+    """
+
+    __slots__ = (
+        "tracer",
+        "interaction",
+        "command_path",
+        "stages",
+        "outcome",
+        "duration",
+        "response",
+        "response_latency",
+        "_created",
+        "_started",
+        "_last",
+    )
+
+    def __init__(self, tracer: Tracer, interaction: discord.Interaction) -> None:
+        self.tracer = tracer
+        self.interaction = interaction
+        self.command_path: Optional[Tuple[str, ...]] = None
+        self.stages: List[Tuple[str, float]] = []
+        self.outcome: Optional[str] = None
+        self.duration: Optional[float] = None
+        self.response: Optional[str] = None
+        self.response_latency: Optional[float] = None
+        self._started = self._last = time.perf_counter()
+        # Discord's deadline runs from the interaction's creation, not from when it was dispatched
+        self._created = discord.utils.snowflake_time(interaction.id).timestamp()
+
+    @property
+    def command_name(self) -> Optional[str]:
+        """Optional[:class:`str`]: The qualified name of the command invoked, once known."""
+        return " ".join(self.command_path) if self.command_path is not None else None
+
+    @property
+    def deadline_missed(self) -> bool:
+        return self.response_latency is not None and self.response_latency > RESPONSE_DEADLINE
+
+    def mark(self, stage: str) -> None:
+        """Ends ``stage``, which started when the previous stage ended."""
+
+        now = time.perf_counter()
+        self.stages.append((stage, now - self._last))
+        self._last = now
+
+    def respond(self, deferred: bool) -> None:
+        if self.response is not None:
+            return  # only the initial response counts against the deadline
+
+        self.response = "deferred" if deferred else "immediate"
+        self.response_latency = time.time() - self._created
+        try:
+            self.tracer.record_response(self)
+        except Exception:
+            _log.exception("Ignoring exception in %r", self.tracer)
+
+    def finish(self, outcome: str) -> None:
+        self.outcome = outcome
+        self.duration = time.perf_counter() - self._started
+        try:
+            self.tracer.record(self)
+        except Exception:
+            _log.exception("Ignoring exception in %r", self.tracer)
+
+
+class _NullTrace:
+    # Used when no tracer is set, so the dispatch path never has to check
+    __slots__ = ()
+
+    @property
+    def command_path(self) -> None:
+        return None
+
+    @command_path.setter
+    def command_path(self, value: Optional[Tuple[str, ...]]) -> None:
+        pass
+
+    def mark(self, stage: str) -> None:
+        pass
+
+    def respond(self, deferred: bool) -> None:
+        pass
+
+    def finish(self, outcome: str) -> None:
+        pass
+
+
+NULL_TRACE: Any = _NullTrace()
+
+
+class Tracer:
+    """The base class of the tracers given to ``SlashBot(tracer=...)``, which does nothing.
+
+    Both methods are called synchronously inside interaction processing, so should be fast.
+    """
+
+    def record(self, trace: Trace) -> None:
+        """Called once processing of the interaction finished, with every stage timed."""
+
+    def record_response(self, trace: Trace) -> None:
+        """Called when the first response to the interaction is sent, possibly before :meth:`record`."""
+
+
+class LogTracer(Tracer):
+    """Logs the stage timings of every interaction, and a warning whenever a response misses the deadline."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG) -> None:
+        self.logger = logger or _log
+        self.level = level
+
+    def record(self, trace: Trace) -> None:
+        if not self.logger.isEnabledFor(self.level):
+            return
+
+        stages = " ".join(f"{stage}={duration * 1000:.2f}ms" for stage, duration in trace.stages)
+        self.logger.log(
+            self.level,
+            "/%s %s in %.2fms: %s",
+            trace.command_name,
+            trace.outcome,
+            trace.duration * 1000,  # type: ignore
+            stages,
+        )
+
+    def record_response(self, trace: Trace) -> None:
+        if trace.deadline_missed:
+            self.logger.warning(
+                "/%s sent a %s response after %.2fs, missing the %ss deadline",
+                trace.command_name,
+                trace.response,
+                trace.response_latency,
+                RESPONSE_DEADLINE,
+            )
+
+
+class Histogram:
+    """A fixed bucket histogram of durations in seconds."""
+
+    # Upper bounds of each bucket in seconds, the last bucket is everything above
+    BOUNDS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Returns the upper bound of the bucket containing the ``q`` quantile, or :attr:`max` for the last bucket."""
+
+        if not self.count:
+            return 0.0
+
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= target and count:
+                return self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+
+        return self.max
+
+
+class HistogramTracer(Tracer):
+    """Aggregates stage timings into in-memory :class:`Histogram`, and counts outcomes and responses.
+
+    Attributes
+    -----------
+    stages: Dict[:class:`str`, :class:`Histogram`]
+        The duration of each stage, plus ``"total"`` for the whole interaction.
+    outcomes: :class:`collections.Counter`
+        How many interactions finished with each :attr:`Trace.outcome`.
+    responses: :class:`collections.Counter`
+        How many ``"immediate"`` and ``"deferred"`` initial responses were sent, and ``"deadline_missed"``.
+    """
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, Histogram] = {}
+        self.outcomes: Counter[str] = Counter()
+        self.responses: Counter[str] = Counter()
+
+    def _histogram(self, name: str) -> Histogram:
+        histogram = self.stages.get(name)
+        if histogram is None:
+            histogram = self.stages[name] = Histogram()
+
+        return histogram
+
+    def record(self, trace: Trace) -> None:
+        for stage, duration in trace.stages:
+            self._histogram(stage).add(duration)
+
+        self._histogram("total").add(trace.duration)  # type: ignore
+        self.outcomes[trace.outcome] += 1  # type: ignore
+
+    def record_response(self, trace: Trace) -> None:
+        self.responses[trace.response] += 1  # type: ignore
+        if trace.deadline_missed:
+            self.responses["deadline_missed"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the aggregated timings in milliseconds and counters, as a JSON serializable dict."""
+
+        return {
+            "stages": {
+                name: {
+                    "count": histogram.count,
+                    "mean": histogram.mean * 1000,
+                    "p50": histogram.quantile(0.5) * 1000,
+                    "p99": histogram.quantile(0.99) * 1000,
+                    "max": histogram.max * 1000,
+                }
+                for name, histogram in self.stages.items()
+            },
+            "outcomes": dict(self.outcomes),
+            "responses": dict(self.responses),
+        }
+
+
+def get_trace(bot: Any, interaction: discord.Interaction) -> Any:
+    tracer: Optional[Tracer] = getattr(bot, "tracer", None)
+    return NULL_TRACE if tracer is None else Trace(tracer, interaction)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+import discord
+
+if TYPE_CHECKING:
+    from discord.http import HTTPClient
+
+_log = logging.getLogger(__name__)
+
+
+class _TypingChannel:
+    __slots__ = ("refcount", "next_due")
+
+    def __init__(self) -> None:
+        self.refcount = 0
+        self.next_due = 0.0
+
+
+class TypingScheduler:
+    """Keeps ``Bot is typing`` shown in channels, from a single timer loop.
+
+    Channels are refcounted, so any number of commands deferring in the same channel
+    only send one typing request per ``interval``. The loop stops once every channel
+    has been released.
+    """
+
+    def __init__(self, http: HTTPClient, *, interval: float = 10.0) -> None:
+        self.http = http
+        self.interval = interval
+        self._channels: Dict[int, _TypingChannel] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def __contains__(self, channel_id: int) -> bool:
+        return channel_id in self._channels
+
+    def acquire(self, channel_id: int) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run(self._wakeup))
+
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            channel = self._channels[channel_id] = _TypingChannel()
+            self._wakeup.set()  # type: ignore # start typing now, instead of on the next tick
+
+        channel.refcount += 1
+
+    def release(self, channel_id: int) -> None:
+        channel = self._channels.get(channel_id)
+        if channel is None:
+            return
+
+        channel.refcount -= 1
+        if channel.refcount <= 0:
+            del self._channels[channel_id]
+
+    async def _send_typing(self, channel_id: int) -> None:
+        try:
+            await self.http.send_typing(channel_id)
+        except discord.HTTPException as error:
+            _log.debug("Failed to trigger typing in %s: %s", channel_id, error)
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        while self._channels:
+            now = time.monotonic()
+            due: List[Any] = []
+            for channel_id, channel in self._channels.items():
+                if channel.next_due <= now:
+                    channel.next_due = now + self.interval
+                    due.append(self._send_typing(channel_id))
+
+            if due:
+                await asyncio.gather(*due)
+
+            if not self._channels:
+                break
+
+            wakeup.clear()
+            timeout = min(channel.next_due for channel in self._channels.values()) - time.monotonic()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+
+
+def get_typing_scheduler(bot: Any) -> TypingScheduler:
+    scheduler = getattr(bot, "typing_scheduler", None)
+    if scheduler is None:
+        scheduler = bot.typing_scheduler = TypingScheduler(bot.http)
+
+    return scheduler
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Optional
+
+from discord.ext import commands
+
+from .context_menus import CHAT_INPUT, MESSAGE_COMMAND, USER_COMMAND
+
+# Discord's limits for chat input commands
+MAX_COMMANDS = 100  # per scope
+MAX_CONTEXT_MENUS = 5  # per scope, of each type
+MAX_OPTIONS = 25
+MAX_CHOICES = 25
+MAX_NAME_LENGTH = 32
+MAX_DESCRIPTION_LENGTH = 100
+MAX_CHOICE_LENGTH = 100
+MAX_COMMAND_LENGTH = 4000  # names, descriptions and choices of a command and all its options combined
+
+# Discord allows any unicode letter or number, re has no \p{L} but \w is close
+NAME_PATTERN = re.compile(r"^[-_'\w\u0900-\u097f\u0e00-\u0e7f]{1,32}$")
+NUMBER_OPTION_TYPES = {4, 10}
+COMMAND_TYPE_NAMES = {CHAT_INPUT: "slash", USER_COMMAND: "user context menu", MESSAGE_COMMAND: "message context menu"}
+
+
+class Violation:
+    """A Discord limit broken by the payload of a command.
+
+    Attributes
+    -----------
+    command: :class:`commands.Command`
+        The command or subcommand the invalid part of the payload was generated from.
+    field: :class:`str`
+        Where in the command's payload the violation is, such as ``options.reason.description``,
+        or an empty string for the whole command.
+    message: :class:`str`
+        What is wrong.
+    """
+
+    __slots__ = ("command", "field", "message")
+
+    def __init__(self, command: commands.Command, field: str, message: str) -> None:
+        self.command = command
+        self.field = field
+        self.message = message
+
+    def __repr__(self) -> str:
+        return f"<Violation command={self.command.qualified_name!r} field={self.field!r} message={self.message!r}>"
+
+    def __str__(self) -> str:
+        location = f"/{self.command.qualified_name}"
+        if self.field:
+            location += f" {self.field}"
+
+        return f"{location}: {self.message}"
+
+
+def _check_name(command: commands.Command, field: str, name: Any, violations: List[Violation]) -> None:
+    if not isinstance(name, str) or not NAME_PATTERN.match(name):
+        violations.append(
+            Violation(command, field, f"{name!r} must be 1 to {MAX_NAME_LENGTH} letters, numbers, - or _")
+        )
+    elif name != name.lower():
+        violations.append(Violation(command, field, f"{name!r} must be lowercase"))
+
+
+def _check_description(command: commands.Command, field: str, description: Any, violations: List[Violation]) -> None:
+    if not isinstance(description, str) or not 1 <= len(description) <= MAX_DESCRIPTION_LENGTH:
+        length = len(description) if isinstance(description, str) else 0
+        violations.append(Violation(command, field, f"must be 1 to {MAX_DESCRIPTION_LENGTH} characters, not {length}"))
+
+
+def _check_option(command: commands.Command, option: Dict[str, Any], violations: List[Violation]) -> None:
+    prefix = f"options.{option.get('name')}"
+    _check_name(command, f"{prefix}.name", option.get("name"), violations)
+    _check_description(command, f"{prefix}.description", option.get("description"), violations)
+
+    choices: Optional[List[Dict[str, Any]]] = option.get("choices")
+    if choices is not None:
+        if len(choices) > MAX_CHOICES:
+            violations.append(
+                Violation(command, f"{prefix}.choices", f"has {len(choices)}, the limit is {MAX_CHOICES}")
+            )
+
+        for choice in choices:
+            name, value = choice.get("name"), choice.get("value")
+            if not isinstance(name, str) or not 1 <= len(name) <= MAX_CHOICE_LENGTH:
+                violations.append(
+                    Violation(command, f"{prefix}.choices", f"{name!r} must be 1 to {MAX_CHOICE_LENGTH} characters")
+                )
+            if isinstance(value, str) and len(value) > MAX_CHOICE_LENGTH:
+                violations.append(
+                    Violation(command, f"{prefix}.choices", f"value of {name!r} is over {MAX_CHOICE_LENGTH} characters")
+                )
+
+    min_value, max_value = option.get("min_value"), option.get("max_value")
+    if (min_value is not None or max_value is not None) and option.get("type") not in NUMBER_OPTION_TYPES:
+        violations.append(Violation(command, prefix, "min_value and max_value are only allowed on number options"))
+    elif min_value is not None and max_value is not None and min_value > max_value:
+        violations.append(Violation(command, prefix, f"min_value {min_value} is over max_value {max_value}"))
+
+
+def _check_payload(command: commands.Command, payload: Dict[str, Any], violations: List[Violation]) -> None:
+    _check_name(command, "name", payload.get("name"), violations)
+    _check_description(command, "description", payload.get("description"), violations)
+
+    options: List[Dict[str, Any]] = payload.get("options") or []
+    if len(options) > MAX_OPTIONS:
+        violations.append(Violation(command, "options", f"has {len(options)}, the limit is {MAX_OPTIONS}"))
+
+    seen = set()
+    for option in options:
+        name = option.get("name")
+        if name in seen:
+            violations.append(Violation(command, f"options.{name}", "is a duplicate option name"))
+        seen.add(name)
+
+        if option.get("type") in (1, 2):
+            # Subcommands point to their own command, so the violation can be traced back to it
+            subcommand = command.get_command(name) if isinstance(command, commands.Group) else None
+            _check_payload(subcommand or command, option, violations)
+        else:
+            _check_option(command, option, violations)
+
+
+def payload_length(payload: Dict[str, Any]) -> int:
+    """Returns the characters of ``payload`` counted against :data:`MAX_COMMAND_LENGTH`."""
+
+    length = len(payload.get("name") or "") + len(payload.get("description") or "")
+    for choice in payload.get("choices") or ():
+        length += len(str(choice.get("name", ""))) + len(str(choice.get("value", "")))
+
+    return length + sum(payload_length(option) for option in payload.get("options") or ())
+
+
+def validate_command(command: commands.Command, payload: Dict[str, Any]) -> List[Violation]:
+    """Returns every Discord limit broken by ``payload``, the top level payload of ``command``."""
+
+    violations: List[Violation] = []
+    if payload.get("type", CHAT_INPUT) != CHAT_INPUT:
+        # Context menu names may have spaces and capitals, and they have no description or options
+        name = payload.get("name")
+        if not isinstance(name, str) or not 1 <= len(name) <= MAX_NAME_LENGTH:
+            violations.append(Violation(command, "name", f"{name!r} must be 1 to {MAX_NAME_LENGTH} characters"))
+        return violations
+
+    _check_payload(command, payload, violations)
+
+    length = payload_length(payload)
+    if length > MAX_COMMAND_LENGTH:
+        violations.append(Violation(command, "", f"is {length} characters combined, the limit is {MAX_COMMAND_LENGTH}"))
+
+    return violations
@@ -0,0 +1,168 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash import errors, from_slash
+
+from _fakes import make_bot, make_interaction
+
+
+@pytest.fixture
+def contexts(monkeypatch) -> List[Any]:
+    """Every context built for a slash command."""
+
+    built: List[Any] = []
+    original_build = from_slash._build_context
+    original_get = lazy_slash.SlashBot.get_context
+
+    def build_context(*args, **kwargs):
+        built.append(original_build(*args, **kwargs))
+        return built[-1]
+
+    async def get_context(self, *args, **kwargs):
+        built.append(await original_get(self, *args, **kwargs))
+        return built[-1]
+
+    get_context.__lazy_slash_direct__ = getattr(original_get, "__lazy_slash_direct__", False)  # type: ignore
+    monkeypatch.setattr(from_slash, "_build_context", build_context)
+    monkeypatch.setattr(lazy_slash.SlashBot, "get_context", get_context)
+    return built
+
+
+async def start(**kwargs: Any):
+    bot = make_bot(**kwargs)
+    await bot._async_setup_hook()  # events are dispatched on the bot's loop
+    rejected: List[Any] = []
+
+    async def on_slash_command_rejected(interaction, command, error):
+        rejected.append((command, error))
+
+    bot.on_slash_command_rejected = on_slash_command_rejected  # type: ignore
+    return bot, rejected
+
+
+def interaction_for(bot, name: str):
+    interaction = make_interaction(bot._connection, name, [])
+    replies: List[Any] = []
+
+    async def send_message(content=None, **kwargs):
+        replies.append((content, kwargs))
+        interaction.response.done = True
+
+    interaction.response.send_message = send_message
+    return interaction, replies
+
+
+def test_cooldown_rejected_before_the_context(contexts):
+    async def main():
+        bot, rejected = await start(early_admission=True)
+        calls = []
+
+        @bot.command()
+        @commands.cooldown(1, 60, commands.BucketType.user)
+        async def limited(ctx):
+            calls.append(ctx)
+
+        await lazy_slash.process_slash_commands(bot, interaction_for(bot, "limited")[0])
+        assert len(calls) == len(contexts) == 1
+
+        interaction, replies = interaction_for(bot, "limited")
+        await lazy_slash.process_slash_commands(bot, interaction)
+        await asyncio.sleep(0)  # listeners run in tasks of their own
+
+        assert len(calls) == len(contexts) == 1
+        ((content, kwargs),) = replies
+        assert content.startswith("This command is on cooldown, try again in ")
+        assert kwargs == {"ephemeral": True}
+        ((command, error),) = rejected
+        assert command is limited
+        assert isinstance(error, commands.CommandOnCooldown)
+
+    asyncio.run(main())
+
+
+def test_max_concurrency_rejected_before_the_context(contexts):
+    async def main():
+        bot, rejected = await start(early_admission=True)
+        release = asyncio.Event()
+
+        @bot.command()
+        @commands.max_concurrency(1, commands.BucketType.user)
+        async def single(ctx):
+            await release.wait()
+
+        running = asyncio.create_task(lazy_slash.process_slash_commands(bot, interaction_for(bot, "single")[0]))
+        await asyncio.sleep(0)
+        assert len(contexts) == 1
+
+        interaction, replies = interaction_for(bot, "single")
+        await lazy_slash.process_slash_commands(bot, interaction)
+        await asyncio.sleep(0)
+
+        assert len(contexts) == 1
+        assert replies == [(lazy_slash.DEFAULT_ERROR_MESSAGES["max_concurrency"], {"ephemeral": True})]
+        ((command, error),) = rejected
+        assert command is single
+        assert isinstance(error, commands.MaxConcurrencyReached)
+
+        release.set()
+        await running
+
+    asyncio.run(main())
+
+
+def test_in_flight_limit_rejected_before_the_context(contexts):
+    async def main():
+        bot, rejected = await start(max_in_flight=1)
+        release = asyncio.Event()
+
+        @bot.command()
+        async def slow(ctx):
+            await release.wait()
+
+        running = asyncio.create_task(lazy_slash.process_slash_commands(bot, interaction_for(bot, "slow")[0]))
+        await asyncio.sleep(0)
+
+        interaction, replies = interaction_for(bot, "slow")
+        await lazy_slash.process_slash_commands(bot, interaction)
+        await asyncio.sleep(0)
+
+        assert len(contexts) == 1
+        assert replies == [(lazy_slash.DEFAULT_ERROR_MESSAGES["overloaded"], {"ephemeral": True})]
+        ((command, error),) = rejected
+        assert command is None
+        assert isinstance(error, errors.InFlightLimitReached)
+
+        release.set()
+        await running
+
+    asyncio.run(main())
+
+
+def test_admission_is_opt_in(contexts):
+    async def main():
+        bot, rejected = await start()
+        errors_seen = []
+
+        @bot.command()
+        @commands.cooldown(1, 60, commands.BucketType.user)
+        async def limited(ctx):
+            pass
+
+        async def on_command_error(ctx, error):
+            errors_seen.append(error)
+
+        bot.on_command_error = on_command_error  # type: ignore
+        for _ in range(2):
+            await lazy_slash.process_slash_commands(bot, interaction_for(bot, "limited")[0])
+        await asyncio.sleep(0)
+
+        # Without early admission the cooldown is enforced by ext.commands, after the context is built
+        assert len(contexts) == 2
+        assert not rejected
+        assert [type(error) for error in errors_seen] == [commands.CommandOnCooldown]
+
+    asyncio.run(main())
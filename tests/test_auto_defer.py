@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+from discord.ext.commands.view import StringView
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash.context import AutoDefer
+from discord.ext.lazy_slash.from_slash import _FakeSlashMessage
+from discord.ext.lazy_slash.resolved import ResolvedData
+
+from _fakes import FakeResponse, interactions, make_bot, make_interaction
+
+
+class FakeSleep:
+    """Stands in for asyncio.sleep, the delay only passes once :meth:`elapse` is called."""
+
+    def __init__(self) -> None:
+        self.delays: List[float] = []
+        self._waiters: List[asyncio.Future] = []
+
+    async def __call__(self, delay: float) -> None:
+        self.delays.append(delay)
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        await waiter
+
+    def elapse(self) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+
+class HeldResponse(FakeResponse):
+    """A fake InteractionResponse that records each defer, which can be held in flight with ``hold``."""
+
+    def __init__(self) -> None:
+        super().__init__(Counter())
+        self.deferred: List[Dict[str, Any]] = []
+        self.hold: Optional[asyncio.Event] = None
+
+    async def defer(self, *args: Any, **kwargs: Any) -> None:
+        self.deferred.append(kwargs)
+        if self.hold is not None:
+            await self.hold.wait()
+        await super().defer(*args, **kwargs)
+
+
+class FakeTrace:
+    def __init__(self) -> None:
+        self.responses: List[Dict[str, Any]] = []
+
+    def respond(self, **kwargs: Any) -> None:
+        self.responses.append(kwargs)
+
+
+def make_auto_defer(**kwargs: Any) -> AutoDefer:
+    interaction = SimpleNamespace(id=1, response=HeldResponse())
+    return AutoDefer(interaction, 3.0, trace=FakeTrace(), sleep=FakeSleep(), **kwargs)  # type: ignore
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def assert_no_tasks_left() -> None:
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+def test_defers_after_delay():
+    async def main():
+        auto_defer = make_auto_defer(ephemeral=True)
+        auto_defer.start()
+        await settle()
+        assert auto_defer._sleep.delays == [3.0]
+        assert auto_defer.interaction.response.deferred == []
+
+        auto_defer._sleep.elapse()
+        await settle()
+        assert auto_defer.interaction.response.deferred == [{"ephemeral": True}]
+        assert auto_defer.trace.responses == [{"deferred": True}]
+        assert_no_tasks_left()
+
+    asyncio.run(main())
+
+
+def test_no_defer_after_response():
+    async def main():
+        auto_defer = make_auto_defer()
+        auto_defer.start()
+        await settle()
+
+        auto_defer.interaction.response.done = True  # responded before the delay passed
+        auto_defer._sleep.elapse()
+        await settle()
+        assert auto_defer.interaction.response.deferred == []
+        assert auto_defer.trace.responses == []
+        assert_no_tasks_left()
+
+    asyncio.run(main())
+
+
+def test_cancel_and_stop_before_delay():
+    async def main():
+        for stop in (False, True):
+            auto_defer = make_auto_defer()
+            auto_defer.start()
+            await settle()
+
+            if stop:
+                await auto_defer.stop()
+            else:
+                auto_defer.cancel()
+            await settle()
+
+            assert auto_defer._task.cancelled()
+            auto_defer._sleep.elapse()
+            await settle()
+            assert auto_defer.interaction.response.deferred == []
+            assert_no_tasks_left()
+
+    asyncio.run(main())
+
+
+def test_stop_waits_for_defer_in_flight():
+    async def main():
+        auto_defer = make_auto_defer()
+        response = auto_defer.interaction.response
+        response.hold = asyncio.Event()
+        auto_defer.start()
+        await settle()
+
+        auto_defer._sleep.elapse()
+        await settle()
+        assert response.deferred == [{"ephemeral": False}]
+
+        # The defer is already being sent, so it is never cancelled halfway
+        auto_defer.cancel()
+        stop = asyncio.ensure_future(auto_defer.stop())
+        await settle()
+        assert not stop.done() and not auto_defer._task.done()
+
+        response.hold.set()
+        await stop
+        assert response.is_done()
+        await settle()
+        assert_no_tasks_left()
+
+    asyncio.run(main())
+
+
+def test_dispatch_leaves_no_timer_behind():
+    async def main():
+        bot = make_bot(auto_defer=60.0)
+        interaction = interactions(bot._connection)["echo"]
+        await lazy_slash.process_slash_commands(bot, interaction)
+        await settle()
+
+        assert interaction.requests["POST callback"] == 0
+        assert_no_tasks_left()
+
+    asyncio.run(main())
+
+
+def test_warns_when_an_automatic_defer_overrides_ephemeral(caplog):
+    async def main(defer_ephemeral: bool, send_ephemeral: bool) -> int:
+        bot = make_bot()
+        interaction = make_interaction(bot._connection, "echo", [])
+        message = _FakeSlashMessage.from_interaction(
+            interaction, interaction.channel, ResolvedData(interaction)  # type: ignore
+        )
+        ctx = lazy_slash.SlashContext(message=message, bot=bot, view=StringView(""), prefix="/")
+        ctx.interaction = interaction  # type: ignore
+        ctx.command = bot.get_command("echo")
+
+        auto_defer = ctx._auto_defer = AutoDefer(interaction, 3.0, ephemeral=defer_ephemeral, sleep=FakeSleep())
+        auto_defer.start()
+        await settle()
+        auto_defer._sleep.elapse()
+        await settle()
+
+        caplog.clear()
+        await ctx.send("secret", ephemeral=send_ephemeral, return_message=False)
+        await ctx.send("more", ephemeral=send_ephemeral, return_message=False)
+        assert interaction.requests["POST followup"] == 2
+        return len([record for record in caplog.records if record.levelno == logging.WARNING])
+
+    with caplog.at_level(logging.WARNING, logger="discord.ext.lazy_slash.context"):
+        assert asyncio.run(main(False, True)) == 1  # only the first followup takes the defer's visibility
+        assert "echo" in caplog.text and "ephemeral=True" in caplog.text
+        assert asyncio.run(main(True, False)) == 1
+        assert asyncio.run(main(False, False)) == 0
+        assert asyncio.run(main(True, True)) == 0
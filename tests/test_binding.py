@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import pytest
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+
+from _fakes import Flags, make_bot, make_interaction
+
+
+def add_commands(bot: lazy_slash.SlashBot, calls: List[Any]) -> None:
+    @bot.command()
+    async def say(ctx, first: str, second: str):
+        calls.append((first, second))
+
+    @bot.command()
+    async def greedy(ctx, numbers: commands.Greedy[int], rest: str):
+        calls.append((numbers, rest))
+
+    @bot.command()
+    async def words(ctx, *words: str):
+        calls.append(words)
+
+    @bot.command()
+    async def note(ctx, count: int, *, text: str):
+        calls.append((count, text))
+
+    @bot.command()
+    async def flags(ctx, *, flags: Flags):
+        calls.append((flags.count, flags.label))
+
+    @bot.command()
+    async def renamed(ctx, value: int = lazy_slash.Option(1, name="amount")):
+        calls.append(value)
+
+    @bot.command()
+    async def maybe(ctx, number: Optional[int] = None, ratio: float = 0.5):
+        calls.append((number, ratio))
+
+
+def invoke(direct_binding: bool, name: str, options: List[Dict[str, Any]]) -> List[Any]:
+    async def main():
+        bot = make_bot(direct_binding=direct_binding)
+        await bot._async_setup_hook()  # errors are dispatched on the bot's loop
+        calls: List[Any] = []
+        add_commands(bot, calls)
+
+        async def on_command_error(ctx, error):
+            calls.append(type(error))
+
+        bot.on_command_error = on_command_error  # type: ignore
+        try:
+            await lazy_slash.process_slash_commands(bot, make_interaction(bot._connection, name, options))
+        except commands.CommandError as error:
+            # The string path fails while building the content, before there is a context to dispatch with
+            calls.append(type(error))
+        await asyncio.sleep(0)  # on_command_error runs in a task of its own
+        return calls
+
+    return asyncio.run(main())
+
+
+def string(name: str, value: str) -> Dict[str, Any]:
+    return {"name": name, "type": 3, "value": value}
+
+
+def integer(name: str, value: int) -> Dict[str, Any]:
+    return {"name": name, "type": 4, "value": value}
+
+
+CASES = {
+    "quoted and spaced strings": ("say", [string("first", '"quoted" text'), string("second", "two  spaces ")]),
+    "plain strings": ("say", [string("first", "one"), string("second", "two")]),
+    "greedy": ("greedy", [string("numbers", "1 2 3"), string("rest", "end")]),
+    "var positional": ("words", [string("words", "a b c")]),
+    "keyword only rest": ("note", [integer("count", 2), string("text", "the rest, with spaces")]),
+    "flag converter": ("flags", [integer("count", 5), string("label", "hello")]),
+    "flag converter default": ("flags", [string("label", "hi")]),
+    "renamed option": ("renamed", [integer("amount", 7)]),
+    "renamed option default": ("renamed", []),
+    "optional given": ("maybe", [integer("number", 3), {"name": "ratio", "type": 10, "value": 1.5}]),
+    "optional missing": ("maybe", []),
+    "missing required": ("say", [string("first", "one")]),
+}
+
+
+@pytest.mark.parametrize("case", list(CASES))
+def test_direct_binding_matches_string_path(case):
+    name, options = CASES[case]
+    direct = invoke(True, name, options)
+    assert len(direct) == 1
+    assert direct == invoke(False, name, options)
+
+
+def test_missing_required_option():
+    assert invoke(True, "say", [string("first", "one")]) == [commands.MissingRequiredArgument]
@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List, Union
+
+import discord
+import pytest
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash.context_menus import MESSAGE_COMMAND, USER_COMMAND
+from discord.ext.lazy_slash.from_slash import bind_target
+from discord.ext.lazy_slash.index import get_slash_command
+
+from _fakes import make_bot, make_interaction
+
+USER = {"id": "77", "username": "someone", "discriminator": "0001", "avatar": None}
+MESSAGE = {
+    "id": "88",
+    "type": 0,
+    "channel_id": "3",
+    "author": USER,
+    "content": "hello",
+    "timestamp": "2022-01-01T00:00:00+00:00",
+    "edited_timestamp": None,
+    "tts": False,
+    "mention_everyone": False,
+    "mentions": [],
+    "mention_roles": [],
+    "attachments": [],
+    "embeds": [],
+    "pinned": False,
+}
+
+
+def menu_interaction(bot, name: str, command_type: int, target_id: str, resolved: Dict[str, Any]):
+    interaction = make_interaction(bot._connection, name, [], resolved=resolved)
+    interaction.data.update(type=command_type, target_id=target_id)
+    del interaction.data["options"]  # context menus are sent without any
+    return interaction
+
+
+def test_user_context_menu():
+    async def main():
+        bot = make_bot()
+        calls: List[Any] = []
+
+        @bot.command()
+        @lazy_slash.context_menu("user", name="Show Avatar")
+        async def avatar(ctx, user: discord.User, size: int = 128):
+            calls.append((user, size))
+
+        interaction = menu_interaction(bot, "Show Avatar", USER_COMMAND, "77", {"users": {"77": USER}})
+        await lazy_slash.process_slash_commands(bot, interaction)
+
+        ((user, size),) = calls
+        assert isinstance(user, discord.User)
+        assert (user.id, user.name) == (77, "someone")
+        assert size == 128
+
+    asyncio.run(main())
+
+
+def test_message_context_menu():
+    async def main():
+        bot = make_bot()
+        calls: List[Any] = []
+
+        @bot.command()
+        @lazy_slash.context_menu("message", name="Quote")
+        async def quote(ctx, message: discord.Message):
+            calls.append(message)
+
+        interaction = menu_interaction(bot, "Quote", MESSAGE_COMMAND, "88", {"messages": {"88": MESSAGE}})
+        await lazy_slash.process_slash_commands(bot, interaction)
+
+        (message,) = calls
+        assert isinstance(message, discord.Message)
+        assert (message.id, message.content, message.author.id) == (88, "hello", 77)
+
+    asyncio.run(main())
+
+
+def test_decorating_an_added_command_updates_the_index():
+    bot = make_bot()
+
+    @lazy_slash.context_menu("user", name="Show Avatar")
+    @bot.command()
+    async def avatar(ctx, user: discord.User):
+        pass
+
+    assert get_slash_command(bot, ("avatar",)) is None
+    assert get_slash_command(bot, ("Show Avatar",), USER_COMMAND) is avatar
+
+    @bot.command()
+    async def quote(ctx, message: discord.Message):
+        pass
+
+    # The index was built while it was a slash command
+    assert get_slash_command(bot, ("quote",)) is quote
+    lazy_slash.context_menu("message", name="Quote")(quote)
+    assert get_slash_command(bot, ("quote",)) is None
+    assert get_slash_command(bot, ("Quote",), MESSAGE_COMMAND) is quote
+
+
+def bound(command: commands.Command, targets: tuple):
+    ctx = SimpleNamespace()
+    asyncio.run(bind_target(command, ctx, targets))  # type: ignore
+    return ctx.args[1:], ctx.kwargs
+
+
+def test_bind_target():
+    bot = make_bot()
+    user = discord.User(state=bot._connection, data=USER)  # type: ignore
+    other = discord.Object(id=5)
+
+    @bot.command()
+    async def first(ctx, user: discord.User, size: int = 128, *, note: str = "none"):
+        pass
+
+    @bot.command()
+    async def keyword(ctx, *, target: Union[discord.Member, discord.User]):
+        pass
+
+    @bot.command()
+    async def variadic(ctx, *users: discord.User):
+        pass
+
+    @bot.command()
+    async def required(ctx, user: discord.User, size: int):
+        pass
+
+    # The target matching the annotation is preferred, the other parameters get their defaults
+    assert bound(first, (other, user)) == ([user, 128], {"note": "none"})
+    assert bound(first, (other,)) == ([other, 128], {"note": "none"})
+    assert bound(keyword, (user,)) == ([], {"target": user})
+    assert bound(variadic, (user,)) == ([user], {})
+
+    with pytest.raises(commands.MissingRequiredArgument):
+        bound(required, (user,))
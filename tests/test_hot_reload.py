@@ -0,0 +1,109 @@
+import asyncio
+from typing import Any, Dict
+
+from discord.ext import commands
+
+from _mock_discord import MockDiscord, make_load_bot
+
+
+async def start(mock: MockDiscord):
+    bot = make_load_bot(auto_upload=True, hot_reload_delay=0)
+    mock.install(bot)
+    await bot._async_setup_hook()
+    await bot.setup_hook()
+
+    # Fetch what is registered, so only the requests made for each change are counted
+    await bot.delta_sync.flush()
+    mock.requests.clear()
+    return bot
+
+
+async def synced(bot) -> None:
+    task = bot.delta_sync._task
+    assert task is not None
+    await task
+
+
+def registered(mock: MockDiscord) -> Dict[str, Dict[str, Any]]:
+    (scope,) = mock.registered.values()
+    return {command["name"]: command for command in scope.values()}
+
+
+def test_added_command_is_created():
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = await start(mock)
+
+        @bot.command()
+        async def ping(ctx):
+            pass
+
+        await synced(bot)
+        assert mock.requests == {"POST /applications/{application_id}/commands": 1}
+        assert "ping" in registered(mock)
+
+    asyncio.run(main())
+
+
+def test_removed_command_is_deleted():
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = await start(mock)
+
+        bot.remove_command("greet")
+        await synced(bot)
+        assert mock.requests == {"DELETE /applications/{application_id}/commands/{command_id}": 1}
+        assert "greet" not in registered(mock)
+
+    asyncio.run(main())
+
+
+def test_added_subcommand_edits_the_parent():
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = await start(mock)
+        config_id = registered(mock)["config"]["id"]
+
+        @bot.get_command("config set").command()
+        async def suffix(ctx, new_suffix: str):
+            pass
+
+        await synced(bot)
+        assert mock.requests == {"PATCH /applications/{application_id}/commands/{command_id}": 1}
+        config = registered(mock)["config"]
+        assert config["id"] == config_id
+        assert [o["name"] for o in config["options"][0]["options"]] == ["prefix", "suffix"]
+
+    asyncio.run(main())
+
+
+def test_replaced_callback_edits_the_parent():
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = await start(mock)
+
+        async def prefix(ctx, new_prefix: str, permanent: bool = False):
+            pass
+
+        bot.get_command("config set prefix").callback = prefix
+        await synced(bot)
+        assert mock.requests == {"PATCH /applications/{application_id}/commands/{command_id}": 1}
+        (set_prefix,) = registered(mock)["config"]["options"][0]["options"]
+        assert [o["name"] for o in set_prefix["options"]] == ["new_prefix", "permanent"]
+
+    asyncio.run(main())
+
+
+def test_unchanged_commands_make_no_request():
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = await start(mock)
+
+        # Reloading a cog removes and adds back the same commands
+        echo = bot.remove_command("echo")
+        assert isinstance(echo, commands.Command)
+        bot.add_command(echo)
+        await synced(bot)
+        assert not mock.requests
+
+    asyncio.run(main())
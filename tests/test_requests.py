@@ -0,0 +1,61 @@
+import asyncio
+
+import discord
+import pytest
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash.context import MAX_CONTENT_LENGTH, MAX_EMBEDS, _SendBatch
+
+from _fakes import make_bot, make_interaction
+from bench_requests import LINES, add_commands
+
+
+@pytest.mark.parametrize(
+    "name, requests",
+    [("reply", 2), ("reply_quiet", 1), ("deferred", 2), ("lines", LINES), ("lines_batched", 1)],
+)
+def test_requests_per_command(name, requests):
+    async def main():
+        bot = make_bot()
+        add_commands(bot)
+        interaction = make_interaction(bot._connection, name, [])
+        await lazy_slash.process_slash_commands(bot, interaction)  # type: ignore
+        return interaction.requests
+
+    counted = asyncio.run(main())
+    assert sum(counted.values()) == requests, counted
+
+
+def batch_of(*items):
+    batch = _SendBatch()
+    for content, embeds in items:
+        assert batch.add(content, False, {"embeds": embeds} if embeds else {})
+    return batch
+
+
+def test_merge_joins_lines_into_one_message():
+    assert batch_of(("a", []), ("b", []), ("c", [])).merge() == [("a\nb\nc", [])]
+
+
+def test_merge_splits_past_the_content_limit():
+    half = "x" * (MAX_CONTENT_LENGTH // 2)
+    messages = batch_of((half, []), (half, []), ("end", [])).merge()
+
+    # Two halves and the newline joining them would be one character over the limit
+    assert messages == [(half, []), (f"{half}\nend", [])]
+    assert all(len(content) <= MAX_CONTENT_LENGTH for content, _ in messages)
+
+
+def test_merge_splits_past_the_embed_limit():
+    embeds = [discord.Embed(title=str(index)) for index in range(MAX_EMBEDS + 2)]
+    messages = batch_of(("first", embeds[:6]), (None, embeds[6:10]), ("last", embeds[10:])).merge()
+
+    assert messages == [("first", embeds[:10]), ("last", embeds[10:])]
+
+
+def test_batch_only_takes_text_and_embeds_with_one_visibility():
+    batch = _SendBatch()
+    assert batch.add("a", True, {})
+    assert not batch.add("b", False, {})
+    assert not batch.add("c", True, {"view": None})
+    assert batch.merge() == [("a", [])] and batch.items == []
@@ -0,0 +1,118 @@
+import asyncio
+
+from discord.ext import commands
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash import plans, to_slash
+from discord.ext.lazy_slash.plans import get_plan
+from discord.ext.lazy_slash.snapshot import command_fingerprint
+from discord.ext.lazy_slash.to_slash import get_application_command
+
+from _fakes import make_bot
+from bench_snapshot import make_synthetic_bot
+
+PLAN_FIELDS = ("option_name", "required", "strategy", "native_type", "option_type", "entity_types", "transform")
+
+
+def test_load_restores_payloads_and_plans(tmp_path):
+    path = str(tmp_path / "commands.snapshot.json")
+    commands = sorted(make_bot().walk_commands(), key=lambda c: c.qualified_name)
+    lazy_slash.export_snapshot(commands, path)
+
+    loaded_commands = sorted(make_bot().walk_commands(), key=lambda c: c.qualified_name)
+    assert lazy_slash.load_snapshot(loaded_commands, path) == (len(commands), 0)
+
+    for command, loaded in zip(commands, loaded_commands):
+        assert loaded._slash_payload == get_application_command(command)
+        for parameter, loaded_parameter in zip(get_plan(command).parameters, get_plan(loaded).parameters):
+            for field in PLAN_FIELDS:
+                assert getattr(loaded_parameter, field) == getattr(parameter, field), (command, field)
+
+            flags = [(flag.option_name, flag.flag, flag.native_type) for flag in parameter.flags]
+            assert [(flag.option_name, flag.flag, flag.native_type) for flag in loaded_parameter.flags] == flags
+
+
+def test_changed_command_is_stale(tmp_path):
+    path = str(tmp_path / "commands.snapshot.json")
+    lazy_slash.export_snapshot(make_bot().walk_commands(), path)
+
+    bot = make_bot()
+    bot.remove_command("greet")
+
+    @bot.command()
+    async def greet(ctx, user: str):
+        pass
+
+    loaded, stale = lazy_slash.load_snapshot(bot.walk_commands(), path)
+    assert stale == 1
+    assert getattr(greet, "_slash_payload", None) is None
+    assert getattr(greet, "_slash_plan_data", None) is None
+
+
+def test_load_builds_no_payloads_or_plans(tmp_path, monkeypatch):
+    path = str(tmp_path / "commands.snapshot.json")
+    lazy_slash.export_snapshot(asyncio.run(make_synthetic_bot(2, 5)).walk_commands(), path)
+
+    calls = {"payload": 0, "plan": 0}
+
+    def counted(name, func):
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    monkeypatch.setattr(to_slash, "to_application_command", counted("payload", to_slash.to_application_command))
+    monkeypatch.setattr(plans, "_native_type", counted("plan", plans._native_type))  # only used when compiling
+
+    ext_commands = list(asyncio.run(make_synthetic_bot(2, 5)).walk_commands())
+    assert lazy_slash.load_snapshot(ext_commands, path)[1] == 0
+    for command in ext_commands:
+        get_application_command(command)
+        get_plan(command)
+    assert calls == {"payload": 0, "plan": 0}
+
+    # Without the snapshot both are built, so the counters do see them
+    for command in asyncio.run(make_synthetic_bot(1, 1)).walk_commands():
+        get_application_command(command)
+        get_plan(command)
+    assert calls["payload"] > 0 and calls["plan"] > 0
+
+
+def _stale_after(tmp_path, change) -> int:
+    path = str(tmp_path / "commands.snapshot.json")
+    lazy_slash.export_snapshot(make_bot().walk_commands(), path)
+
+    bot = make_bot()
+    change(bot)
+    return lazy_slash.load_snapshot(bot.walk_commands(), path)[1]
+
+
+def test_renamed_flag_is_stale():
+    def make_command(flag_name):
+        # The same source with one flag renamed, as if the module was edited
+        namespace = {"commands": commands, "__name__": "flag_module"}
+        source = (
+            f"class Flags(commands.FlagConverter):\n    {flag_name}: str\n\n"
+            "async def flagged(ctx, *, flags: Flags):\n    pass\n"
+        )
+        exec(source, namespace)
+        return commands.Command(namespace["flagged"])
+
+    assert command_fingerprint(make_command("label")) == command_fingerprint(make_command("label"))
+    assert command_fingerprint(make_command("label")) != command_fingerprint(make_command("title"))
+
+
+def test_new_context_menu_is_stale(tmp_path):
+    assert _stale_after(tmp_path, lambda bot: lazy_slash.context_menu("user")(bot.get_command("greet"))) == 1
+
+
+def test_offloaded_defaults_are_fingerprinted():
+    def make_command(default):
+        def render(_, size: int = default):
+            pass
+
+        return commands.Command(lazy_slash.offload()(render), name="render")
+
+    assert command_fingerprint(make_command(1)) == command_fingerprint(make_command(1))
+    assert command_fingerprint(make_command(1)) != command_fingerprint(make_command(2))
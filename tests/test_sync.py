@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+
+import discord
+import pytest
+
+from discord.ext import lazy_slash
+
+from _mock_discord import MockDiscord, make_load_bot
+from sync_processes import process_main
+
+
+def puts(mock: MockDiscord) -> int:
+    return sum(count for route, count in mock.requests.items() if route.startswith("PUT"))
+
+
+def make_bot(mock: MockDiscord, **kwargs):
+    bot = make_load_bot(**kwargs)
+    mock.install(bot)
+
+    @bot.command()
+    @lazy_slash.context_menu("user", name="Show Avatar")
+    async def avatar(ctx, user: discord.User):
+        pass
+
+    return bot
+
+
+@pytest.mark.parametrize("sync", ["manifest", "remote"])
+def test_one_put_per_changed_scope(tmp_path, sync):
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = make_bot(mock)
+        echo, greet = bot.get_command("echo"), bot.get_command("greet")
+        kwargs = {"sync": sync, "manifest_path": str(tmp_path / "manifest.json")}
+
+        upload_as_guild = {1: [echo], 2: [greet], 3: [echo, greet]}
+        results = await lazy_slash.create_slash_commands(bot, upload_as_guild=upload_as_guild, **kwargs)
+        assert sorted(result.guild_id for result in results if result.uploaded) == [1, 2, 3]
+        assert puts(mock) == 3
+
+        # Only guild 2 changes, and the global commands are never touched in guild mode
+        mock.requests.clear()
+        upload_as_guild[2] = [greet, bot.get_command("avatar")]
+        results = await lazy_slash.create_slash_commands(bot, upload_as_guild=upload_as_guild, **kwargs)
+        assert [result.guild_id for result in results if result.uploaded] == [2]
+        assert puts(mock) == 1
+        assert not any("/guilds/" not in route for route in mock.requests)
+
+    asyncio.run(main())
+
+
+def test_no_put_when_remote_commands_match(tmp_path):
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = make_bot(mock, slash_command_guilds=[1, 2], sync="remote")
+        await bot.sync_slash_commands()
+        assert puts(mock) == 2
+
+        # A new process, with the commands Discord gave back, including the context menu's empty description
+        mock.requests.clear()
+        bot = make_bot(mock, slash_command_guilds=[1, 2], sync="remote")
+        results = await bot.sync_slash_commands()
+        assert not any(result.uploaded for result in results)
+        assert puts(mock) == 0
+        assert sum(mock.requests.values()) == 2  # one GET per guild
+
+    asyncio.run(main())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.parametrize("coordinator", ["file", "socket"])
+def test_single_uploader_across_processes(tmp_path, coordinator):
+    args = argparse.Namespace(
+        coordinator=coordinator,
+        guilds=3,
+        latency=0.05,
+        stagger=0.02,
+        port=_free_port(),
+        sync="manifest",
+        fail_leader=False,
+    )
+
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = [context.Process(target=process_main, args=(index, args, str(tmp_path), queue)) for index in range(4)]
+    for process in processes:
+        process.start()
+
+    reports = [queue.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join()
+
+    assert [report["error"] for report in reports] == [None] * 4
+    assert sorted(report["uploads"] for report in reports) == [0, 0, 0, args.guilds]
+    assert not os.path.exists(tmp_path / "sync.lock")
@@ -0,0 +1,56 @@
+import asyncio
+from collections import Counter
+from types import SimpleNamespace
+
+import discord
+import pytest
+from discord.ext import commands
+from discord.ext.commands.view import StringView
+
+from discord.ext import lazy_slash
+
+
+def message_context(bot: commands.Bot, name: str) -> lazy_slash.SlashContext:
+    channel = SimpleNamespace(id=3, guild=None)
+    author = SimpleNamespace(id=2, bot=False)
+    message = SimpleNamespace(
+        channel=channel, author=author, guild=None, content=f"!{name}", attachments=[], _state=bot._connection
+    )
+    command = bot.get_command(name)
+    return lazy_slash.SlashContext(
+        message=message, bot=bot, view=StringView(""), prefix="!", command=command, invoked_with=name  # type: ignore
+    )
+
+
+@pytest.mark.parametrize("bot_class, kwargs", [(commands.Bot, {}), (lazy_slash.SlashBot, {"auto_upload": False})])
+def test_typing_released_once_the_command_finishes(bot_class, kwargs):
+    async def main():
+        bot = bot_class(command_prefix="!", intents=discord.Intents.none(), **kwargs)
+        await bot._async_setup_hook()  # command events are dispatched on the bot's loop
+        typing: Counter = Counter()
+
+        async def send_typing(channel_id):
+            typing[channel_id] += 1
+
+        bot.http.send_typing = send_typing  # type: ignore
+
+        @bot.command()
+        async def quiet(ctx):
+            await ctx.defer()
+            assert ctx.channel.id in bot.typing_scheduler
+
+        @bot.command()
+        async def broken(ctx):
+            await ctx.defer()
+            raise RuntimeError
+
+        # Neither command sends, so only the end of the invoke can release the channel
+        for name in ("quiet", "broken"):
+            await bot.invoke(message_context(bot, name))
+            assert 3 not in bot.typing_scheduler
+
+        # The typing loop stops once every channel is released
+        await asyncio.sleep(0)
+        assert bot.typing_scheduler._task.done()
+
+    asyncio.run(main())
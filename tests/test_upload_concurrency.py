@@ -0,0 +1,31 @@
+import asyncio
+import time
+
+from _mock_discord import MockDiscord, make_load_bot
+
+GUILDS = 16
+LATENCY = 0.05
+
+
+def upload(concurrency: int) -> float:
+    async def main():
+        bot = make_load_bot(slash_command_guilds=list(range(1, GUILDS + 1)), upload_concurrency=concurrency)
+        mock = MockDiscord(latency=LATENCY, jitter=0)
+        mock.install(bot)
+
+        start = time.perf_counter()
+        await bot.sync_slash_commands()
+        elapsed = time.perf_counter() - start
+
+        assert sum(count for route, count in mock.requests.items() if route.startswith("PUT")) == GUILDS
+        return elapsed
+
+    return asyncio.run(main())
+
+
+def test_scopes_upload_concurrently():
+    serial = GUILDS * LATENCY
+    assert upload(1) >= serial
+
+    # 8 at a time is 2 rounds of requests, leave plenty of room for a slow machine
+    assert upload(8) < serial / 2
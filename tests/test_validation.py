@@ -0,0 +1,156 @@
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+from discord.ext import lazy_slash
+from discord.ext.lazy_slash.errors import CommandValidationError
+from discord.ext.lazy_slash.validation import validate_command
+
+from _mock_discord import MockDiscord, make_load_bot
+
+
+def string(name: str, **kwargs: Any) -> Dict[str, Any]:
+    return {"name": name, "description": "an option", "type": 3, **kwargs}
+
+
+def choices(count: int, length: int = 4) -> Dict[str, Any]:
+    return {"choices": [{"name": f"{i}".rjust(length, "c"), "value": i} for i in range(count)]}
+
+
+def slash(name: str = "echo", description: str = "a command", **kwargs: Any) -> Dict[str, Any]:
+    return {"name": name, "description": description, "options": [], **kwargs}
+
+
+# Each payload breaks one limit: (payload, field, part of the message)
+REJECTED = {
+    "uppercase name": (slash("Echo"), "name", "'Echo' must be lowercase"),
+    "name with spaces": (slash("echo it"), "name", "must be 1 to 32 letters, numbers, - or _"),
+    "long name": (slash("e" * 33), "name", "must be 1 to 32 letters"),
+    "empty description": (slash(description=""), "description", "must be 1 to 100 characters, not 0"),
+    "long description": (slash(description="d" * 101), "description", "not 101"),
+    "too many options": (
+        slash(options=[string(f"o{i}") for i in range(26)]),
+        "options",
+        "has 26, the limit is 25",
+    ),
+    "duplicate options": (slash(options=[string("text"), string("text")]), "options.text", "duplicate option name"),
+    "uppercase option": (slash(options=[string("Text")]), "options.Text.name", "'Text' must be lowercase"),
+    "option description": (
+        slash(options=[{**string("text"), "description": "d" * 101}]),
+        "options.text.description",
+        "not 101",
+    ),
+    "too many choices": (slash(options=[string("text", **choices(26))]), "options.text.choices", "has 26"),
+    "long choice name": (
+        slash(options=[string("text", **choices(1, length=101))]),
+        "options.text.choices",
+        "must be 1 to 100 characters",
+    ),
+    "long choice value": (
+        slash(options=[string("text", choices=[{"name": "long", "value": "v" * 101}])]),
+        "options.text.choices",
+        "value of 'long' is over 100 characters",
+    ),
+    "min_value on a string": (
+        slash(options=[string("text", min_value=1)]),
+        "options.text",
+        "only allowed on number options",
+    ),
+    "min_value over max_value": (
+        slash(options=[{**string("amount"), "type": 4, "min_value": 5, "max_value": 1}]),
+        "options.amount",
+        "min_value 5 is over max_value 1",
+    ),
+    "combined length": (
+        slash(options=[string(f"o{i}", **choices(25, length=90)) for i in range(2)]),
+        "",
+        "characters combined, the limit is 4000",
+    ),
+    "long context menu name": (
+        {"name": "Show " + "a" * 28, "type": 2},
+        "name",
+        "must be 1 to 32 characters",
+    ),
+}
+
+
+@pytest.mark.parametrize("case", list(REJECTED))
+def test_rejected_payload(case):
+    bot = make_load_bot()
+    payload, field, message = REJECTED[case]
+    (violation,) = validate_command(bot.get_command("echo"), payload)
+    assert violation.command is bot.get_command("echo")
+    assert violation.field == field
+    assert message in violation.message
+
+
+def test_valid_payloads():
+    bot = make_load_bot()
+    echo = bot.get_command("echo")
+    assert validate_command(echo, slash(options=[string("text", **choices(25))])) == []
+    assert validate_command(echo, {"name": "Show Avatar", "type": 2}) == []
+
+
+def test_subcommand_violation_names_the_subcommand():
+    bot = make_load_bot()
+    prefix = slash("prefix", type=1, options=[string("New_Prefix")])
+    payload = slash("config", options=[slash("set", type=2, options=[prefix])])
+
+    (violation,) = validate_command(bot.get_command("config"), payload)
+    assert violation.command is bot.get_command("config set prefix")
+    assert str(violation) == "/config set prefix options.New_Prefix.name: 'New_Prefix' must be lowercase"
+
+
+def test_error_names_every_command_and_option():
+    async def main():
+        mock = MockDiscord(latency=0, jitter=0)
+        bot = make_load_bot()
+        mock.install(bot)
+
+        @bot.command()
+        async def note(ctx, text: str = lazy_slash.Option("", description="d" * 101)):
+            pass
+
+        @bot.command(name="Shout")
+        async def shout(ctx):
+            pass
+
+        with pytest.raises(CommandValidationError) as info:
+            await lazy_slash.create_slash_commands(bot, upload_as_global=bot.commands)
+
+        assert sorted(str(violation) for violation in info.value.violations) == [
+            "/Shout name: 'Shout' must be lowercase",
+            "/note options.text.description: must be 1 to 100 characters, not 101",
+        ]
+        assert "2 command validation error(s)" in str(info.value)
+        assert "/note options.text.description" in str(info.value)
+        assert not mock.requests  # nothing is uploaded
+
+        # Skipping them uploads the rest
+        await lazy_slash.create_slash_commands(bot, upload_as_global=bot.commands, invalid_commands="skip")
+        (scope,) = mock.registered.values()
+        names = sorted(command["name"] for command in scope.values())
+        assert names == ["config", "echo", "flagged", "greet", "help", "role"]
+
+    asyncio.run(main())
+
+
+def test_scope_limits():
+    async def main():
+        bot = make_load_bot()
+        echo = bot.get_command("echo")
+
+        @bot.command(name="echo2")
+        async def other_echo(ctx):
+            pass
+
+        other_echo.name = "echo"  # renamed after it was added, so the bot does not catch the clash
+        with pytest.raises(CommandValidationError) as info:
+            await lazy_slash.create_slash_commands(bot, upload_as_guild={1: [echo, other_echo]})
+
+        (violation,) = info.value.violations
+        assert str(violation) == "/echo name: 'echo' is already used by /echo in guild 1"
+        assert violation.command is other_echo
+
+    asyncio.run(main())